@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_is_verified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='home_location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, help_text='Home location, used to target area alerts', null=True, srid=4326),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # accounts/models.py
 from django.contrib.auth.models import AbstractUser, BaseUserManager, Group, Permission
 from django.db import models
+from django.contrib.gis.db import models as gis_models
 from django.utils import timezone
 from django.db.models.signals import post_migrate
 from django.dispatch import receiver
@@ -343,6 +344,12 @@ class User(AbstractUser):
     # Contact and location information
     phone_number = models.CharField(max_length=15, blank=True)
     address = models.TextField(blank=True)
+    home_location = gis_models.PointField(
+        srid=4326,
+        null=True,
+        blank=True,
+        help_text="Home location, used to target area alerts",
+    )
 
     # Professional identification
     first_responder_id = models.CharField(
@@ -10,6 +10,7 @@ between complex types and Python native datatypes.
 """
 
 from rest_framework import serializers
+from rest_framework_gis.fields import GeometryField
 from .models import User
 
 
@@ -30,6 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
     - role: User's role in the system
     - phone_number: User's contact number
     - address: User's address
+    - home_location: GeoJSON point of the user's home, for area alerts
     - first_responder_id: First responder identification
     - medical_license_id: Medical license number
     - department: User's department
@@ -40,6 +42,8 @@ class UserSerializer(serializers.ModelSerializer):
     - is_verified: User's verification status
     """
 
+    home_location = GeometryField(required=False, allow_null=True)
+
     class Meta:
         model = User
         fields = (
@@ -50,6 +54,7 @@ class UserSerializer(serializers.ModelSerializer):
             "role",
             "phone_number",
             "address",
+            "home_location",
             "first_responder_id",
             "medical_license_id",
             "department",
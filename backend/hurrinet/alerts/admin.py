@@ -1,10 +1,10 @@
 """
-Django admin configuration for the Alert model.
+Django admin configuration for the Alert, AlertRule and AlertDeliveryStats models.
 This module customizes how Alert objects are displayed and managed in the Django admin interface.
 """
 
 from django.contrib import admin
-from .models import Alert
+from .models import Alert, AlertDeliveryStats, AlertRule
 
 
 @admin.register(Alert)
@@ -41,3 +41,42 @@ class AlertAdmin(admin.ModelAdmin):
 
     # Use a search interface for selecting the alert creator
     raw_id_fields = ["created_by"]
+
+
+@admin.register(AlertRule)
+class AlertRuleAdmin(admin.ModelAdmin):
+    """Admin interface for the weather alert rules evaluated by the alert service."""
+
+    list_display = [
+        "name",
+        "metric",
+        "comparator",
+        "threshold",
+        "duration_minutes",
+        "severity",
+        "is_active",
+    ]
+    list_filter = ["metric", "severity", "is_active"]
+    list_editable = ["threshold", "duration_minutes", "is_active"]
+    search_fields = ["name", "title"]
+
+
+@admin.register(AlertDeliveryStats)
+class AlertDeliveryStatsAdmin(admin.ModelAdmin):
+    """Read-only admin view of alert delivery totals, maintained by receipt flushes."""
+
+    list_display = [
+        "alert",
+        "recipients",
+        "received",
+        "websocket",
+        "rest",
+        "last_received_at",
+    ]
+    raw_id_fields = ["alert"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -20,3 +20,7 @@ class AlertsConfig(AppConfig):
 
     # Python dotted path to this application
     name = "alerts"
+
+    def ready(self):
+        # Publish alert changes to WebSocket clients
+        import alerts.signals  # noqa
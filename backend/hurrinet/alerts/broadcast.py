@@ -0,0 +1,87 @@
+"""
+Real-time alert fan-out for HurriNet.
+
+Alerts are pushed to WebSocket clients through one Channels group per
+audience and district, e.g. ``alerts.public.gros-islet``. Every client is in
+the "All" group of its audience and in the groups of the districts it
+subscribed to; staff are in both the public and staff groups, and non-public
+alerts only go to staff groups.
+
+Each change is serialized to JSON once and sent to the one group it
+concerns; consumers forward the text as-is, so serialization cost doesn't
+grow with the number of connected sockets.
+"""
+
+import json
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.utils.text import slugify
+from .models import Alert
+from .serializers import AlertSerializer
+
+logger = logging.getLogger(__name__)
+
+DISTRICTS = [district for district, _ in Alert.DISTRICT_CHOICES]
+
+
+def group_name(audience, district):
+    """Get the Channels group for an audience ("public" or "staff") and district."""
+    return f"alerts.{audience}.{slugify(district)}"
+
+
+def get_audiences(user):
+    """Get the audiences whose alerts a user receives."""
+    return ["public", "staff"] if user.is_staff else ["public"]
+
+
+def get_group(district, is_public):
+    """Get the group an alert with this district and visibility is sent to."""
+    return group_name("public" if is_public else "staff", district)
+
+
+def build_message(event, alert=None, alert_id=None):
+    """Serialize a change to an alert as the text sent to clients."""
+    message = {"type": f"alert_{event}"}
+    if alert is not None:
+        message["district"] = alert.district
+        message["alert"] = AlertSerializer(alert).data
+    else:
+        message["id"] = alert_id
+    return json.dumps(message)
+
+
+def send(group, text):
+    """
+    Send a message to a group, logging failures.
+
+    Runs in on_commit callbacks after the alert is saved, so a channel layer
+    outage must not surface as an error of the request that saved it.
+    """
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            group, {"type": "alert.message", "text": text}
+        )
+    except Exception as e:
+        logger.error(f"Error broadcasting alert to {group}: {str(e)}")
+
+
+def publish_alert(alert, created, previous=None):
+    """
+    Push a saved alert to the clients that can see it.
+
+    Args:
+        alert: The saved Alert
+        created: Whether the alert is new
+        previous: ``(district, is_public)`` before the save; if the alert
+            moved to another group, the old group is told it was removed
+    """
+    group = get_group(alert.district, alert.is_public)
+    if previous is not None and get_group(*previous) != group:
+        send(get_group(*previous), build_message("removed", alert_id=alert.pk))
+    send(group, build_message("created" if created else "updated", alert))
+
+
+def publish_removal(alert_id, district, is_public):
+    """Tell the clients that could see a deleted alert that it is gone."""
+    send(get_group(district, is_public), build_message("removed", alert_id=alert_id))
@@ -0,0 +1,90 @@
+"""
+Cached snapshots of the active alerts for HurriNet.
+
+``AlertViewSet.current`` is polled by every device for the alert banner. The
+active alerts for each (audience, district) pair are rendered to JSON once,
+together with an ETag, and cached. Every alert change bumps a version number
+that is part of the cache keys, so all snapshots are invalidated at once and
+rebuilt on the next request; serving the banner is a cache read, or a 304
+when the client already has the current snapshot.
+"""
+
+import hashlib
+import json
+import logging
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from rest_framework.utils.encoders import JSONEncoder
+from utils.cache import get_cache_key
+from .models import Alert
+from .serializers import AlertSerializer
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = get_cache_key("alerts", "version")
+
+
+def get_audience(user):
+    """Get the audience whose alerts a user sees."""
+    return "staff" if user.is_staff else "public"
+
+
+def get_version():
+    """Get the current version of the alert snapshots."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate():
+    """
+    Invalidate every snapshot by bumping the version.
+
+    Runs after the alert change has committed, so a cache outage is logged
+    rather than raised; snapshots then expire with ALERT_SNAPSHOT_TTL.
+    """
+    try:
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            # No version yet, so nothing has been cached under the old one
+            cache.add(VERSION_KEY, 1, None)
+    except Exception as e:
+        logger.error(f"Error invalidating alert snapshots: {str(e)}")
+
+
+def get_snapshot_key(version, audience, district):
+    return get_cache_key("alerts", f"current:{version}:{audience}:{district or '*'}")
+
+
+def build_snapshot(audience, district=None):
+    """
+    Render the active alerts an audience sees in a district.
+
+    Island-wide ("All") alerts are included for every district; without a
+    district, all active alerts are included.
+
+    Returns:
+        dict: ``content`` (the JSON response body) and its ``etag``
+    """
+    alerts = Alert.objects.filter(is_active=True).select_related("created_by")
+    if audience != "staff":
+        alerts = alerts.filter(is_public=True)
+    if district:
+        alerts = alerts.filter(Q(district=district) | Q(district="All"))
+    data = AlertSerializer(alerts.order_by("-created_at"), many=True).data
+    content = json.dumps(data, cls=JSONEncoder).encode()
+    return {"content": content, "etag": f'"{hashlib.md5(content).hexdigest()}"'}
+
+
+def get_snapshot(audience, district=None):
+    """Get the cached snapshot for an audience and district, building it if needed."""
+    key = get_snapshot_key(get_version(), audience, district)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(audience, district)
+        cache.set(key, snapshot, settings.ALERT_SNAPSHOT_TTL)
+    return snapshot
@@ -0,0 +1,95 @@
+"""
+WebSocket consumer for real-time alerts in HurriNet.
+
+Clients connect to ``ws/alerts/?token=<jwt>&districts=Castries,Gros Islet``
+and receive every alert for the districts they subscribed to, plus
+island-wide ("All") alerts. Subscriptions can be changed on an open socket
+by sending ``{"type": "subscribe", "districts": [...]}`` or
+``{"type": "unsubscribe", "districts": [...]}``; the current subscriptions
+are sent back after connecting and after every change.
+
+Clients acknowledge an alert with ``{"type": "ack", "alert": <id>}``. Acks
+are buffered by ``alerts.receipts`` and get no reply.
+"""
+
+import json
+import logging
+from urllib.parse import parse_qs
+from channels.generic.websocket import AsyncWebsocketConsumer
+from . import receipts
+from .broadcast import DISTRICTS, get_audiences, group_name
+
+logger = logging.getLogger(__name__)
+
+
+class AlertConsumer(AsyncWebsocketConsumer):
+    """Streams alert changes for the subscribed districts."""
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close()
+            return
+
+        self.audiences = get_audiences(user)
+        self.districts = set()
+        await self.accept()
+
+        query_params = parse_qs(self.scope.get("query_string", b"").decode())
+        districts = query_params.get("districts", [""])[0].split(",")
+        await self.subscribe(["All"] + districts)
+        await self.send_subscriptions()
+
+    async def disconnect(self, close_code):
+        await self.unsubscribe(getattr(self, "districts", set()), keep_all=False)
+
+    async def subscribe(self, districts):
+        """Join the groups of the given districts, ignoring unknown ones."""
+        for district in set(districts) & set(DISTRICTS) - self.districts:
+            for audience in self.audiences:
+                await self.channel_layer.group_add(
+                    group_name(audience, district), self.channel_name
+                )
+            self.districts.add(district)
+
+    async def unsubscribe(self, districts, keep_all=True):
+        """Leave the groups of the given districts."""
+        for district in set(districts) & self.districts:
+            if keep_all and district == "All":
+                continue
+            for audience in self.audiences:
+                await self.channel_layer.group_discard(
+                    group_name(audience, district), self.channel_name
+                )
+            self.districts.discard(district)
+
+    async def receive(self, text_data):
+        try:
+            data = json.loads(text_data)
+            if data.get("type") == "ack":
+                receipts.buffer.add(
+                    int(data["alert"]), self.scope["user"].pk, "websocket"
+                )
+                return
+            districts = data.get("districts") or []
+            if data.get("type") == "subscribe":
+                await self.subscribe(districts)
+            elif data.get("type") == "unsubscribe":
+                await self.unsubscribe(districts)
+            else:
+                return
+        except (ValueError, AttributeError, TypeError, KeyError) as e:
+            logger.warning(f"Invalid alert message: {str(e)}")
+            return
+        await self.send_subscriptions()
+
+    async def send_subscriptions(self):
+        await self.send(
+            text_data=json.dumps(
+                {"type": "subscriptions", "districts": sorted(self.districts)}
+            )
+        )
+
+    async def alert_message(self, event):
+        # Already serialized once for the whole group
+        await self.send(text_data=event["text"])
@@ -0,0 +1,148 @@
+"""
+Django management command to measure alert fan-out latency.
+
+Opens --sockets AlertConsumer instances on the configured channel layer,
+each subscribed to one random district plus "All", then saves alerts one at
+a time and records the time from each save to its delivery on every
+subscribed socket. Sockets are driven in-process through the ASGI interface,
+so the numbers cover the database write, the on-commit publish, the channel
+layer and the consumers, but not the network.
+"""
+
+import asyncio
+import random
+import time
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from alerts.broadcast import DISTRICTS
+from alerts.consumers import AlertConsumer
+from alerts.models import Alert
+
+User = get_user_model()
+
+BENCH_USER_EMAIL = "alert-bench@hurrinet.local"
+BENCH_TITLE = "Fan-out benchmark"
+
+
+class Socket:
+    """A WebSocket connection to AlertConsumer without the network."""
+
+    def __init__(self, app, user, district, deliveries):
+        self.queue = asyncio.Queue()
+        self.subscribed = asyncio.Event()
+        self.deliveries = deliveries
+        self.task = asyncio.create_task(
+            app(
+                {
+                    "type": "websocket",
+                    "path": "/ws/alerts/",
+                    "query_string": f"districts={district}".encode(),
+                    "headers": [],
+                    "subprotocols": [],
+                    "user": user,
+                },
+                self.queue.get,
+                self.send,
+            )
+        )
+        self.queue.put_nowait({"type": "websocket.connect"})
+
+    async def send(self, message):
+        if message["type"] != "websocket.send":
+            return
+        if not self.subscribed.is_set():
+            # The first message lists the subscriptions
+            self.subscribed.set()
+            return
+        self.deliveries.append(time.perf_counter())
+
+    async def close(self):
+        await self.queue.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+class Command(BaseCommand):
+    help = "Measures the time from saving an alert to its delivery on every socket"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sockets", type=int, default=50000)
+        parser.add_argument("--alerts", type=int, default=10)
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait for an alert to reach every socket",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(
+            email=BENCH_USER_EMAIL, defaults={"role": "CITIZEN"}
+        )
+        try:
+            asyncio.run(self.bench(user, options))
+        finally:
+            Alert.objects.filter(title=BENCH_TITLE, created_by=user).delete()
+
+    async def bench(self, user, options):
+        rng = random.Random(options["seed"])
+        districts = [district for district in DISTRICTS if district != "All"]
+        app = AlertConsumer.as_asgi()
+        deliveries = []
+
+        started = time.perf_counter()
+        subscriptions = [rng.choice(districts) for _ in range(options["sockets"])]
+        sockets = [
+            Socket(app, user, district, deliveries) for district in subscriptions
+        ]
+        await asyncio.gather(*(socket.subscribed.wait() for socket in sockets))
+        self.stdout.write(
+            f"Connected {len(sockets)} sockets in {time.perf_counter() - started:.1f}s"
+        )
+
+        self.stdout.write(
+            f"{'district':<14} {'sockets':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        try:
+            for _ in range(options["alerts"]):
+                district = rng.choice(districts + ["All"])
+                expected = (
+                    len(sockets) if district == "All" else subscriptions.count(district)
+                )
+                deliveries.clear()
+                saved = time.perf_counter()
+                await sync_to_async(self.save_alert)(user, district)
+
+                deadline = saved + options["timeout"]
+                while len(deliveries) < expected and time.perf_counter() < deadline:
+                    await asyncio.sleep(0.001)
+
+                latencies = (np.array(deliveries[:expected]) - saved) * 1000
+                if len(latencies) < expected:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"{district}: only {len(latencies)} of {expected} "
+                            "sockets received the alert"
+                        )
+                    )
+                    continue
+                p50, p99 = np.percentile(latencies, [50, 99])
+                self.stdout.write(
+                    f"{district:<14} {expected:>8} {p50:>8.1f} {p99:>8.1f} "
+                    f"{latencies.max():>8.1f}"
+                )
+        finally:
+            await asyncio.gather(*(socket.close() for socket in sockets))
+
+    def save_alert(self, user, district):
+        with transaction.atomic():
+            Alert.objects.create(
+                title=BENCH_TITLE,
+                description="Alert created by bench_alert_fanout",
+                severity="LOW",
+                district=district,
+                created_by=user,
+            )
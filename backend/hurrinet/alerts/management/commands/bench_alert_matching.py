@@ -0,0 +1,81 @@
+"""
+Django management command to time matching users against an alert area.
+
+Inserts --users users with random home locations across Saint Lucia inside
+a transaction, matches them against a polygon covering part of the island
+--runs times, and rolls everything back.
+"""
+
+import random
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from alerts.matching import get_user_ids_in_area
+
+User = get_user_model()
+
+
+def build_area(bounds, vertices):
+    """Build a jagged, coastline-like polygon over the north of the island."""
+    rng = random.Random(0)
+    south = (bounds["south"] + bounds["north"]) / 2
+    points = []
+    for i in range(vertices):
+        fraction = i / (vertices - 1)
+        lng = bounds["west"] + (bounds["east"] - bounds["west"]) * fraction
+        points.append((lng, south + rng.uniform(-0.01, 0.01)))
+    points += [(bounds["east"], bounds["north"]), (bounds["west"], bounds["north"])]
+    points.append(points[0])
+    return MultiPolygon(Polygon(points), srid=4326)
+
+
+class Command(BaseCommand):
+    help = "Times matching user home locations against an alert area"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100000)
+        parser.add_argument(
+            "--vertices", type=int, default=2000, help="Vertices in the alert area"
+        )
+        parser.add_argument("--runs", type=int, default=5)
+
+    def handle(self, *args, **options):
+        bounds = settings.WEATHER_GRID_BOUNDS
+        area = build_area(bounds, options["vertices"])
+        rng = random.Random(1)
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            User.objects.bulk_create(
+                (
+                    User(
+                        email=f"bench-{i}@hurrinet.local",
+                        username=f"bench-{i}",
+                        home_location=Point(
+                            rng.uniform(bounds["west"], bounds["east"]),
+                            rng.uniform(bounds["south"], bounds["north"]),
+                            srid=4326,
+                        ),
+                    )
+                    for i in range(options["users"])
+                ),
+                batch_size=5000,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {User._meta.db_table}")
+            self.stdout.write(
+                f"Inserted {options['users']} users in "
+                f"{time.perf_counter() - started:.1f}s"
+            )
+
+            for run in range(options["runs"]):
+                started = time.perf_counter()
+                matched = len(get_user_ids_in_area(area))
+                self.stdout.write(
+                    f"Run {run + 1}: matched {matched} users in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,54 @@
+"""
+Django management command to evaluate weather alert rules.
+
+Polls every district in ALERT_DISTRICTS, evaluates all active AlertRule rows
+against the recent observations and raises WeatherAlerts for the rules that
+fire. Run with --loop so "sustained for N minutes" rules have a history to
+look back on.
+"""
+
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from alerts.services import WeatherAlertService
+
+
+class Command(BaseCommand):
+    help = "Evaluates weather alert rules against current district weather"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep evaluating every ALERT_RULE_STEP_MINUTES",
+        )
+
+    def handle(self, *args, **options):
+        service = WeatherAlertService()
+        interval = service.step_minutes * 60
+        while True:
+            started = time.monotonic()
+            self.evaluate(service)
+            if not options["loop"]:
+                return
+            time.sleep(max(interval - (time.monotonic() - started), 0))
+
+    def evaluate(self, service):
+        try:
+            created = service.tick()
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f"Error evaluating alerts: {str(e)}"))
+            return
+
+        for district, error in service.failures.items():
+            self.stdout.write(
+                self.style.WARNING(f"Failed to fetch weather for {district}: {error}")
+            )
+        for alert in created:
+            self.stdout.write(f"Raised {alert.title} for {alert.area_affected}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Evaluated {len(service.compiled.rules)} rules for "
+                f"{len(service.locations)} districts"
+            )
+        )
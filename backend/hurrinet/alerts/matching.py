@@ -0,0 +1,106 @@
+"""
+Spatial matching of alerts for HurriNet.
+
+Alerts may carry an ``area`` geometry (e.g. a storm-surge zone) on top of
+their district. This module answers which active alerts cover a point, and
+which users, shelters and resources fall inside an alert's area.
+
+Alert areas and user home locations are spatially indexed. Matching users
+splits the alert area into small pieces with ``ST_Subdivide`` first, so each
+index probe has a tight bounding box and each point-in-polygon test only
+sees a few vertices, even for detailed coastline polygons.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.db.models import PointField
+from django.db import connection
+from django.db.models import F, Func, Q, Value
+from resource_management.models import Resource
+from shelters.models import Shelter
+from .models import Alert
+
+User = get_user_model()
+
+# Maximum vertices per piece when subdividing an alert area
+SUBDIVIDE_MAX_VERTICES = 256
+
+MATCH_USERS_SQL = """
+SELECT DISTINCT u.id
+FROM {table} u
+JOIN (SELECT ST_Subdivide(ST_GeomFromEWKB(%s), %s) AS geom) AS parts
+    ON ST_Intersects(u.home_location, parts.geom)
+WHERE u.is_active
+"""
+
+
+def get_alerts_covering(point, audience="public"):
+    """
+    Get the active alerts that cover a point.
+
+    Alerts with an area cover the points inside it; island-wide ("All")
+    alerts without an area cover every point. District alerts without an
+    area are not matched, since districts have no geometry.
+
+    Args:
+        point: GEOS Point in SRID 4326
+        audience: "public" or "staff"
+    """
+    alerts = Alert.objects.filter(is_active=True).filter(
+        Q(area__intersects=point) | Q(area__isnull=True, district="All")
+    )
+    if audience != "staff":
+        alerts = alerts.filter(is_public=True)
+    return alerts
+
+
+def get_user_ids_in_area(area):
+    """Get the ids of active users whose home location is inside an area."""
+    sql = MATCH_USERS_SQL.format(table=connection.ops.quote_name(User._meta.db_table))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [bytes(area.ewkb), SUBDIVIDE_MAX_VERTICES])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def get_shelters_in_area(area):
+    """Get the shelters inside an area."""
+    # Shelters store plain coordinates, so narrow down by bounding box first
+    xmin, ymin, xmax, ymax = area.extent
+    location = Func(
+        Func(F("longitude"), F("latitude"), function="ST_MakePoint"),
+        Value(4326),
+        function="ST_SetSRID",
+        output_field=PointField(srid=4326),
+    )
+    return (
+        Shelter.objects.filter(
+            longitude__range=(xmin, xmax), latitude__range=(ymin, ymax)
+        )
+        .annotate(location=location)
+        .filter(location__intersects=area)
+    )
+
+
+def get_resources_in_area(area):
+    """Get the resources located inside an area."""
+    return Resource.objects.filter(location__intersects=area)
+
+
+def get_alert_recipients(alert):
+    """
+    Get who and what falls inside an alert's area.
+
+    Returns:
+        dict: ``user_ids``, ``shelters`` and ``resources`` inside the area,
+        all empty if the alert has no area
+    """
+    if alert.area is None:
+        return {
+            "user_ids": [],
+            "shelters": Shelter.objects.none(),
+            "resources": Resource.objects.none(),
+        }
+    return {
+        "user_ids": get_user_ids_in_area(alert.area),
+        "shelters": get_shelters_in_area(alert.area),
+        "resources": get_resources_in_area(alert.area),
+    }
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.4 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+# The thresholds WeatherAlertService used to hardcode
+DEFAULT_RULES = [
+    {
+        "name": "High wind",
+        "metric": "windSpeed",
+        "comparator": "gt",
+        "threshold": 15,
+        "severity": "HIGH",
+        "alert_type": "SEVERE_WEATHER",
+        "title": "High Wind Alert",
+        "description": "Sustained winds above 15 m/s.",
+    },
+    {
+        "name": "Heavy rain",
+        "metric": "precipitationIntensity",
+        "comparator": "gt",
+        "threshold": 7.6,
+        "severity": "MODERATE",
+        "alert_type": "FLOOD_WATCH",
+        "title": "Heavy Rain Alert",
+        "description": "Rainfall above 7.6 mm/hr.",
+    },
+    {
+        "name": "High temperature",
+        "metric": "temperature",
+        "comparator": "gt",
+        "threshold": 32,
+        "severity": "LOW",
+        "alert_type": "SEVERE_WEATHER",
+        "title": "High Temperature Alert",
+        "description": "Temperature above 32°C.",
+    },
+]
+
+
+def create_default_rules(apps, schema_editor):
+    AlertRule = apps.get_model("alerts", "AlertRule")
+    AlertRule.objects.bulk_create(AlertRule(**rule) for rule in DEFAULT_RULES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0004_rename_active_alert_is_active_remove_alert_type_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('metric', models.CharField(choices=[('windSpeed', 'Wind speed (m/s)'), ('windGust', 'Wind gust (m/s)'), ('precipitationIntensity', 'Precipitation intensity (mm/hr)'), ('temperature', 'Temperature (°C)'), ('temperatureApparent', 'Feels-like temperature (°C)'), ('humidity', 'Humidity (%)'), ('pressureSurfaceLevel', 'Surface pressure (hPa)'), ('visibility', 'Visibility (km)')], max_length=50)),
+                ('comparator', models.CharField(choices=[('gt', '>'), ('gte', '>='), ('lt', '<'), ('lte', '<=')], max_length=3)),
+                ('threshold', models.FloatField()),
+                ('duration_minutes', models.PositiveIntegerField(default=0, help_text='How long the condition must hold before firing')),
+                ('severity', models.CharField(choices=[('LOW', 'Low'), ('MODERATE', 'Moderate'), ('HIGH', 'High'), ('EXTREME', 'Extreme')], max_length=10)),
+                ('alert_type', models.CharField(help_text='WeatherAlert type raised when the rule fires', max_length=20)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(create_default_rules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-19 10:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0005_alertrule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alert',
+            name='area',
+            field=django.contrib.gis.db.models.fields.MultiPolygonField(blank=True, help_text='Exact area covered, e.g. a storm-surge zone', null=True, srid=4326),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-19 11:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_alert_area'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertDeliveryStats',
+            fields=[
+                ('alert', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='delivery_stats', serialize=False, to='alerts.alert')),
+                ('recipients', models.PositiveIntegerField(default=0)),
+                ('received', models.PositiveIntegerField(default=0)),
+                ('websocket', models.PositiveIntegerField(default=0)),
+                ('rest', models.PositiveIntegerField(default=0)),
+                ('first_received_at', models.DateTimeField(null=True)),
+                ('last_received_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'alert delivery stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='AlertReceipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('websocket', 'WebSocket'), ('rest', 'REST')], max_length=10)),
+                ('received_at', models.DateTimeField()),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='alerts.alert')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_receipts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('alert', 'user'), name='unique_alert_receipt')],
+            },
+        ),
+    ]
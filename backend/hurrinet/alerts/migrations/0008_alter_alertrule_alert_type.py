@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0007_alertreceipt_alertdeliverystats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='alertrule',
+            name='alert_type',
+            field=models.CharField(choices=[('HURRICANE_WATCH', 'Hurricane Watch'), ('HURRICANE_WARNING', 'Hurricane Warning'), ('FLOOD_WATCH', 'Flood Watch'), ('FLOOD_WARNING', 'Flood Warning'), ('SEVERE_WEATHER', 'Severe Weather'), ('TORNADO_WATCH', 'Tornado Watch'), ('TORNADO_WARNING', 'Tornado Warning')], help_text='WeatherAlert type raised when the rule fires', max_length=20),
+        ),
+    ]
@@ -5,6 +5,8 @@ This module defines the data structure for emergency alerts and notifications.
 
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.gis.db import models as gis_models
+from weather.models import WeatherAlert
 
 # Get the active User model as defined in settings
 User = get_user_model()
@@ -72,6 +74,12 @@ class Alert(models.Model):
     affected_areas = models.TextField(
         blank=True
     )  # Specific areas affected within the district
+    area = gis_models.MultiPolygonField(
+        srid=4326,
+        null=True,
+        blank=True,
+        help_text="Exact area covered, e.g. a storm-surge zone",
+    )  # Spatially indexed for point-in-polygon matching
     instructions = models.TextField(blank=True)  # Safety instructions and guidance
 
     def __str__(self):
@@ -87,3 +95,125 @@ class Alert(models.Model):
         """
 
         ordering = ["-created_at"]  # Sort alerts by creation date, newest first
+
+
+class AlertRule(models.Model):
+    """
+    Threshold rule evaluated against district weather observations.
+
+    A rule fires for a district when ``metric`` compared to ``threshold``
+    has held for at least ``duration_minutes`` (0 means the latest
+    observation alone is enough). Firing rules raise a ``WeatherAlert``.
+    """
+
+    COMPARATOR_CHOICES = [
+        ("gt", ">"),
+        ("gte", ">="),
+        ("lt", "<"),
+        ("lte", "<="),
+    ]
+
+    # Tomorrow.io realtime fields rules can watch
+    METRIC_CHOICES = [
+        ("windSpeed", "Wind speed (m/s)"),
+        ("windGust", "Wind gust (m/s)"),
+        ("precipitationIntensity", "Precipitation intensity (mm/hr)"),
+        ("temperature", "Temperature (°C)"),
+        ("temperatureApparent", "Feels-like temperature (°C)"),
+        ("humidity", "Humidity (%)"),
+        ("pressureSurfaceLevel", "Surface pressure (hPa)"),
+        ("visibility", "Visibility (km)"),
+    ]
+
+    name = models.CharField(max_length=255)
+    metric = models.CharField(max_length=50, choices=METRIC_CHOICES)
+    comparator = models.CharField(max_length=3, choices=COMPARATOR_CHOICES)
+    threshold = models.FloatField()
+    duration_minutes = models.PositiveIntegerField(
+        default=0, help_text="How long the condition must hold before firing"
+    )
+    severity = models.CharField(max_length=10, choices=Alert.SEVERITY_CHOICES)
+    alert_type = models.CharField(
+        max_length=20,
+        choices=WeatherAlert.ALERT_TYPES,
+        help_text="WeatherAlert type raised when the rule fires",
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        duration = f" for {self.duration_minutes} min" if self.duration_minutes else ""
+        return (
+            f"{self.name}: {self.metric} {self.get_comparator_display()} "
+            f"{self.threshold}{duration}"
+        )
+
+    class Meta:
+        ordering = ["name"]
+
+
+class AlertReceipt(models.Model):
+    """
+    Record of a user receiving an alert.
+
+    Receipts are buffered in memory and written in batches by
+    ``alerts.receipts``, so acknowledging an alert never waits on the
+    database.
+    """
+
+    CHANNEL_CHOICES = [
+        ("websocket", "WebSocket"),
+        ("rest", "REST"),
+    ]
+
+    alert = models.ForeignKey(Alert, on_delete=models.CASCADE, related_name="receipts")
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="alert_receipts"
+    )
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES)
+    received_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["alert", "user"], name="unique_alert_receipt"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} received {self.alert_id} via {self.channel}"
+
+
+class AlertDeliveryStats(models.Model):
+    """
+    Delivery totals for an alert, kept up to date as receipts are flushed.
+
+    ``recipients`` is the number of users who could receive the alert when
+    its first receipt arrived: the users living in its area, or all active
+    users for alerts without an area.
+    """
+
+    alert = models.OneToOneField(
+        Alert,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="delivery_stats",
+    )
+    recipients = models.PositiveIntegerField(default=0)
+    received = models.PositiveIntegerField(default=0)
+    websocket = models.PositiveIntegerField(default=0)
+    rest = models.PositiveIntegerField(default=0)
+    first_received_at = models.DateTimeField(null=True)
+    last_received_at = models.DateTimeField(null=True)
+
+    class Meta:
+        verbose_name_plural = "alert delivery stats"
+
+    def __str__(self):
+        return f"{self.alert_id}: {self.received}/{self.recipients}"
+
+    @property
+    def delivery_rate(self):
+        """Fraction of recipients that received the alert."""
+        return self.received / self.recipients if self.recipients else None
@@ -0,0 +1,232 @@
+"""
+Buffered alert delivery receipts for HurriNet.
+
+Clients acknowledge alerts over the alerts WebSocket or the REST ``ack``
+endpoint. Acknowledgements are only added to an in-memory buffer on the
+request path; a background thread flushes the buffer every
+``ALERT_RECEIPT_FLUSH_INTERVAL`` seconds, or as soon as it holds
+``ALERT_RECEIPT_BATCH_SIZE`` receipts, with one ``bulk_create``. Each flush
+also refreshes the ``AlertDeliveryStats`` row of the alerts it touched, so
+delivery rates are read from one row instead of counted on demand.
+
+Receipts still in the buffer when a process dies are lost; at most one
+flush interval of acknowledgements is at risk, and clients may ack again.
+Receipts from failed flushes are retried up to ``ALERT_RECEIPT_MAX_ATTEMPTS``
+times, so an outage can't grow the buffer without bound.
+"""
+
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+from .matching import get_user_ids_in_area
+from .models import Alert, AlertDeliveryStats, AlertReceipt
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+STATS_FIELDS = [
+    "received",
+    "websocket",
+    "rest",
+    "first_received_at",
+    "last_received_at",
+]
+
+
+def count_recipients(alert):
+    """Count the users who could receive an alert."""
+    if alert.area is not None:
+        return len(get_user_ids_in_area(alert.area))
+    return User.objects.filter(is_active=True).count()
+
+
+def update_delivery_stats(alert_ids):
+    """
+    Recount the receipts of some alerts into their delivery stats.
+
+    Counting from the receipts table keeps the totals exact even when
+    several processes flush receipts for the same alert.
+    """
+    totals = (
+        AlertReceipt.objects.filter(alert_id__in=alert_ids)
+        .values("alert_id")
+        .annotate(
+            received=Count("id"),
+            websocket=Count("id", filter=Q(channel="websocket")),
+            rest=Count("id", filter=Q(channel="rest")),
+            first_received_at=Min("received_at"),
+            last_received_at=Max("received_at"),
+        )
+    )
+    has_stats = set(
+        AlertDeliveryStats.objects.filter(alert_id__in=alert_ids).values_list(
+            "alert_id", flat=True
+        )
+    )
+    new_alerts = Alert.objects.in_bulk(set(alert_ids) - has_stats)
+
+    stats = []
+    for total in totals:
+        alert = new_alerts.get(total["alert_id"])
+        stats.append(
+            AlertDeliveryStats(
+                alert_id=total["alert_id"],
+                # Only set for new rows, existing rows keep theirs
+                recipients=count_recipients(alert) if alert else 0,
+                **{field: total[field] for field in STATS_FIELDS},
+            )
+        )
+    AlertDeliveryStats.objects.bulk_create(
+        stats,
+        update_conflicts=True,
+        unique_fields=["alert"],
+        update_fields=STATS_FIELDS,
+    )
+
+
+class ReceiptBuffer:
+    """
+    Thread-safe buffer of receipts, flushed in batches.
+
+    Args:
+        interval: Seconds between background flushes; None disables the
+            background thread, so receipts are only written by :meth:`flush`
+        batch_size: Number of buffered receipts that triggers an early flush
+        max_attempts: Failed flushes after which a receipt is dropped
+    """
+
+    def __init__(self, interval=None, batch_size=None, max_attempts=None):
+        self.interval = interval
+        self.batch_size = batch_size or settings.ALERT_RECEIPT_BATCH_SIZE
+        self.max_attempts = max_attempts or settings.ALERT_RECEIPT_MAX_ATTEMPTS
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, alert_id, user_id, channel):
+        """Buffer a receipt; repeated acks of the same alert keep the first."""
+        with self._lock:
+            self._pending.setdefault((alert_id, user_id), (channel, timezone.now(), 0))
+            full = len(self._pending) >= self.batch_size
+            if self.interval is not None and self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Write the buffered receipts.
+
+        Acks aren't checked when they are buffered, so receipts for alerts or
+        users deleted in the meantime, and for staff-only alerts acked by
+        non-staff users, are dropped here. Receipts already recorded are
+        ignored. If the write fails, the receipts are put back for the next
+        flush, until they have failed ``max_attempts`` times.
+
+        Returns:
+            int: Number of receipts sent to the database
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        public = dict(
+            Alert.objects.filter(
+                pk__in={alert_id for alert_id, _ in pending}
+            ).values_list("pk", "is_public")
+        )
+        staff = dict(
+            User.objects.filter(pk__in={user_id for _, user_id in pending}).values_list(
+                "pk", "is_staff"
+            )
+        )
+        pending = {
+            (alert_id, user_id): receipt
+            for (alert_id, user_id), receipt in pending.items()
+            if alert_id in public
+            and user_id in staff
+            and (public[alert_id] or staff[user_id])
+        }
+        try:
+            return self._write(pending)
+        except Exception:
+            self._requeue(pending)
+            raise
+
+    def _write(self, pending):
+        """Write receipts and refresh their alerts' stats in one transaction."""
+        receipts = [
+            AlertReceipt(
+                alert_id=alert_id,
+                user_id=user_id,
+                channel=channel,
+                received_at=received_at,
+            )
+            for (alert_id, user_id), (channel, received_at, _) in pending.items()
+        ]
+        try:
+            with transaction.atomic():
+                AlertReceipt.objects.bulk_create(
+                    receipts, batch_size=self.batch_size, ignore_conflicts=True
+                )
+                update_delivery_stats({alert_id for alert_id, _ in pending})
+        except IntegrityError as e:
+            if len(pending) > 1:
+                # A receipt whose alert or user was deleted after the check
+                # fails the whole batch, so write them one by one to only
+                # drop that one
+                return sum(
+                    self._write({key: receipt}) for key, receipt in pending.items()
+                )
+            logger.warning(f"Alert receipt rejected: {str(e)}")
+            return 0
+        return len(receipts)
+
+    def _requeue(self, pending):
+        """Put receipts back after a failed write, unless out of attempts."""
+        dropped = 0
+        with self._lock:
+            for key, (channel, received_at, attempts) in pending.items():
+                if attempts + 1 >= self.max_attempts:
+                    dropped += 1
+                    continue
+                self._pending.setdefault(key, (channel, received_at, attempts + 1))
+        if dropped:
+            logger.error(
+                f"Dropped {dropped} alert receipts after {self.max_attempts} "
+                "failed flushes"
+            )
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            # The thread's connection lives across flushes
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing alert receipts: {str(e)}")
+
+
+buffer = ReceiptBuffer(interval=settings.ALERT_RECEIPT_FLUSH_INTERVAL)
+
+
+@atexit.register
+def flush_on_exit():
+    try:
+        buffer.flush()
+    except Exception as e:
+        logger.error(f"Error flushing alert receipts on exit: {str(e)}")
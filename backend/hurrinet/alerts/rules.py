@@ -0,0 +1,184 @@
+"""
+Vectorized weather alert rule engine for HurriNet.
+
+Observations for every location and recent time step are held in one
+``(locations, steps, metrics)`` NumPy array. All active ``AlertRule`` rows are
+evaluated against it in a single pass: each rule's metric column is
+compared with its threshold, and "sustained for N minutes" rules fire once
+the trailing run of matching steps started at least N minutes before the
+latest observation, going by the time each step was observed.
+"""
+
+import math
+import numpy as np
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+
+
+class ObservationWindow:
+    """
+    Rolling window of the latest observations for a fixed set of locations.
+
+    Missing values are stored as NaN and never satisfy a rule. ``times``
+    holds when each step was observed, as POSIX timestamps.
+    """
+
+    def __init__(self, locations, metrics, steps, step_minutes):
+        self.locations = list(locations)
+        self.metrics = list(metrics)
+        self.step_minutes = step_minutes
+        self.values = np.full(
+            (len(self.locations), steps, len(self.metrics)), np.nan, dtype=np.float64
+        )
+        self.times = np.full(steps, np.nan, dtype=np.float64)
+
+    def push(self, observations, observed_at=None):
+        """
+        Append one time step.
+
+        Args:
+            observations: Mapping of location to a dict of metric values;
+                locations that are absent (e.g. failed fetches) get NaN
+            observed_at: When the observations were made, defaults to now
+        """
+        self.times = np.roll(self.times, -1)
+        self.times[-1] = (observed_at or timezone.now()).timestamp()
+        self.values = np.roll(self.values, -1, axis=1)
+        latest = np.full((len(self.locations), len(self.metrics)), np.nan)
+        for i, location in enumerate(self.locations):
+            values = observations.get(location)
+            if not values:
+                continue
+            for j, metric in enumerate(self.metrics):
+                value = values.get(metric)
+                if value is not None:
+                    latest[i, j] = value
+        self.values[:, -1, :] = latest
+
+
+class CompiledRules:
+    """
+    Rule parameters laid out as arrays for vectorized evaluation.
+
+    Every comparison is rewritten as ``sign * value >= bound``: "less than"
+    rules flip the sign, and strict comparisons move the bound to the next
+    representable float, so one comparison covers all comparators.
+    """
+
+    def __init__(self, rules, metrics, step_minutes):
+        self.rules = list(rules)
+        metric_index = {metric: i for i, metric in enumerate(metrics)}
+        self.metric = np.array(
+            [metric_index[rule.metric] for rule in self.rules], dtype=np.intp
+        )
+        self.sign = np.array(
+            [-1.0 if rule.comparator in ("lt", "lte") else 1.0 for rule in self.rules]
+        )
+        bound = self.sign * np.array([rule.threshold for rule in self.rules])
+        strict = np.array([rule.comparator in ("gt", "lt") for rule in self.rules])
+        self.bound = np.where(strict, np.nextafter(bound, np.inf), bound)
+        # Seconds the condition must hold
+        self.duration = np.array([rule.duration_minutes * 60.0 for rule in self.rules])
+        # Steps the window must keep to see that far back
+        self.steps = np.array(
+            [get_steps(rule, step_minutes) for rule in self.rules], dtype=np.intp
+        )
+
+
+def get_steps(rule, step_minutes):
+    """Get how many time steps cover a rule's duration, both ends included."""
+    return math.ceil(rule.duration_minutes / step_minutes) + 1
+
+
+def required_steps(rules, step_minutes):
+    """Get how many time steps the window must keep to evaluate the rules."""
+    return max([get_steps(rule, step_minutes) for rule in rules], default=1)
+
+
+def evaluate(values, times, compiled):
+    """
+    Evaluate every rule for every location in one pass.
+
+    Args:
+        values: ``(locations, steps, metrics)`` array of observations
+        times: ``(steps,)`` array of when each step was observed
+        compiled: :class:`CompiledRules`
+
+    Returns:
+        numpy.ndarray: ``(locations, rules)`` boolean matrix of firing rules
+    """
+    if not compiled.rules:
+        return np.zeros((values.shape[0], 0), dtype=bool)
+
+    # Only the longest required tail of the window matters
+    tail = min(int(compiled.steps.max()), values.shape[1])
+    # (locations, tail, rules): each rule's metric over the tail
+    series = values[:, -tail:, :][:, :, compiled.metric] * compiled.sign
+    with np.errstate(invalid="ignore"):
+        matches = series >= compiled.bound
+
+    # Length of the trailing run of matching steps, per location and rule
+    misses = ~matches[:, ::-1, :]
+    run = np.where(misses.any(axis=1), misses.argmax(axis=1), tail)
+    # How long the condition has held, from the first step of the run
+    times = times[-tail:]
+    held = times[-1] - times[(tail - run) % tail]
+    return (run > 0) & (held >= compiled.duration)
+
+
+def sync_weather_alerts(firing):
+    """
+    Raise a WeatherAlert for each firing (rule, location) pair.
+
+    Pairs that already have an active alert of the same type, title and
+    area have it extended instead, so a sustained condition raises one
+    alert rather than one per tick.
+
+    Args:
+        firing: Iterable of (AlertRule, location name) pairs
+
+    Returns:
+        list: The newly created WeatherAlert rows
+    """
+    from weather.models import WeatherAlert
+
+    now = timezone.now()
+    end_time = now + timedelta(minutes=settings.ALERT_RULE_ALERT_MINUTES)
+    firing = list(firing)
+    if not firing:
+        return []
+
+    active = {
+        (alert.alert_type, alert.title, alert.area_affected): alert.pk
+        for alert in WeatherAlert.objects.filter(
+            is_active=True,
+            end_time__gt=now,
+            title__in={rule.title for rule, _ in firing},
+        ).only("id", "alert_type", "title", "area_affected")
+    }
+
+    extend = []
+    new_alerts = []
+    for rule, location in firing:
+        key = (rule.alert_type, rule.title, location)
+        if key in active:
+            extend.append(active[key])
+            continue
+        active[key] = None
+        new_alerts.append(
+            WeatherAlert(
+                alert_type=rule.alert_type,
+                severity=rule.severity,
+                title=rule.title,
+                description=rule.description or str(rule),
+                area_affected=location,
+                start_time=now,
+                end_time=end_time,
+            )
+        )
+
+    extend = [pk for pk in extend if pk is not None]
+    if extend:
+        WeatherAlert.objects.filter(pk__in=extend).update(end_time=end_time)
+    return WeatherAlert.objects.bulk_create(new_alerts)
@@ -4,7 +4,9 @@ This module handles the conversion of Alert and User models to/from JSON
 for the REST API endpoints.
 """
 
+from django.contrib.gis.geos import MultiPolygon, Polygon
 from rest_framework import serializers
+from rest_framework_gis.fields import GeometryField
 from .models import Alert
 from django.contrib.auth import get_user_model
 
@@ -45,6 +47,9 @@ class AlertSerializer(serializers.ModelSerializer):
         source="get_severity_display", read_only=True
     )
 
+    # GeoJSON polygon or multipolygon of the exact area covered
+    area = GeometryField(required=False, allow_null=True)
+
     class Meta:
         model = Alert
         fields = [
@@ -59,11 +64,20 @@ class AlertSerializer(serializers.ModelSerializer):
             "is_active",
             "is_public",
             "affected_areas",
+            "area",
             "instructions",
         ]
         # Protect fields that should not be modified directly by API clients
         read_only_fields = ["created_by", "created_at", "updated_at"]
 
+    def validate_area(self, value):
+        """Accept a single polygon as well as a multipolygon."""
+        if isinstance(value, Polygon):
+            value = MultiPolygon(value, srid=value.srid)
+        if value is not None and not isinstance(value, MultiPolygon):
+            raise serializers.ValidationError("Area must be a Polygon or MultiPolygon")
+        return value
+
     def create(self, validated_data):
         """
         Custom create method to automatically set the alert creator.
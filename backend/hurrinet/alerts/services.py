@@ -4,9 +4,21 @@ This module integrates with the Tomorrow.io API to fetch real-time weather data
 and generate weather alerts for different districts in Saint Lucia.
 """
 
-import requests
-from datetime import datetime
+import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
+from weather import client
+from .models import AlertRule
+from .rules import (
+    CompiledRules,
+    ObservationWindow,
+    evaluate,
+    required_steps,
+    sync_weather_alerts,
+)
+
+logger = logging.getLogger(__name__)
 
 
 class WeatherAlertService:
@@ -15,96 +27,143 @@ class WeatherAlertService:
 
     Integrates with Tomorrow.io's weather API to monitor weather conditions
     across different districts in Saint Lucia and generate appropriate alerts
-    based on predefined thresholds.
+    based on the active ``AlertRule`` rows. Observations are kept in a rolling
+    window so rules can require a condition to be sustained over time.
     """
 
-    def __init__(self):
+    def __init__(self, locations=None, workers=None, step_minutes=None):
         """
         Initialize the weather alert service.
 
-        Sets up API credentials and defines geographical coordinates
-        for major districts in Saint Lucia.
+        Args:
+            locations: Mapping of district name to ``{"lat": ..., "lon": ...}``,
+                defaults to ``ALERT_DISTRICTS``
+            workers: Number of districts fetched concurrently, defaults to
+                ``ALERT_POLL_WORKERS``
+            step_minutes: Minutes between calls to :meth:`get_alerts` or
+                :meth:`tick`, defaults to ``ALERT_RULE_STEP_MINUTES``
+        """
+        self.locations = locations or settings.ALERT_DISTRICTS
+        self.workers = workers or settings.ALERT_POLL_WORKERS
+        self.step_minutes = step_minutes or settings.ALERT_RULE_STEP_MINUTES
+        self.window = None
+        self.compiled = None
+
+        # Districts whose last fetch failed, with the error
+        self.failures = {}
+
+    def fetch_district(self, district):
+        """Fetch the current weather values for one district."""
+        coords = self.locations[district]
+        data = client.get(
+            "/weather/realtime",
+            coords["lat"],
+            coords["lon"],
+            units="metric",  # Use metric system for measurements
+        )
+        return data["data"]["values"]
+
+    def fetch_observations(self):
         """
-        self.api_key = settings.TOMORROW_API_KEY
-        self.base_url = "https://api.tomorrow.io/v4"
+        Fetch current weather for every district in parallel.
+
+        All requests share the weather client's pooled session, with its
+        timeouts and retries, so one slow district doesn't hold up the rest.
 
-        # Geographical coordinates for major districts in Saint Lucia
-        self.locations = {
-            "Castries": {"lat": 14.0101, "lon": -60.9875},  # Capital city
-            "Gros Islet": {"lat": 14.0722, "lon": -60.9498},  # Northern district
-            "Soufriere": {"lat": 13.8566, "lon": -61.0564},  # Western district
-            "Vieux Fort": {"lat": 13.7246, "lon": -60.9490},  # Southern district
-        }
+        Returns:
+            tuple: (dict of district to weather values, dict of district to
+            error message for the districts that failed)
+        """
+
+        def fetch(district):
+            try:
+                return district, self.fetch_district(district), None
+            except Exception as e:
+                return district, None, str(e)
+
+        observations = {}
+        failures = {}
+        workers = min(self.workers, len(self.locations)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for district, values, error in executor.map(fetch, self.locations):
+                if error is None:
+                    observations[district] = values
+                else:
+                    failures[district] = error
+                    logger.error(f"Error fetching weather data for {district}: {error}")
+        return observations, failures
+
+    def load_rules(self):
+        """
+        Load the active alert rules.
+
+        The observation window is kept across reloads unless the rules need
+        different metrics or a longer history.
+        """
+        rules = list(AlertRule.objects.filter(is_active=True))
+        metrics = sorted({rule.metric for rule in rules})
+        steps = required_steps(rules, self.step_minutes)
+
+        window = self.window
+        if (
+            window is None
+            or window.metrics != metrics
+            or window.values.shape[1] < steps
+        ):
+            self.window = ObservationWindow(
+                self.locations, metrics, steps, self.step_minutes
+            )
+        self.compiled = CompiledRules(rules, metrics, self.step_minutes)
+
+    def check(self, observations):
+        """
+        Add a time step of observations and evaluate every rule.
+
+        Returns:
+            list: (AlertRule, district) pairs that fire
+        """
+        self.window.push(observations)
+        firing = evaluate(self.window.values, self.window.times, self.compiled)
+        return [
+            (self.compiled.rules[rule], self.window.locations[location])
+            for location, rule in zip(*np.nonzero(firing))
+        ]
 
     def get_alerts(self):
         """
         Fetch real-time weather data and generate alerts for all monitored districts.
 
-        Makes API calls to Tomorrow.io for each district and processes the weather data
-        against predefined thresholds to generate appropriate alerts.
+        Districts that could not be fetched are skipped and listed in
+        ``self.failures``.
 
         Returns:
-            list: List of dictionaries containing alert information for each detected
-                 weather condition that exceeds defined thresholds.
+            list: List of dictionaries containing alert information for each
+                 rule that fires: its title, WeatherAlert ``type``, watched
+                 ``metric`` and ``severity`` as set on the AlertRule, with the
+                 district.
         """
-        alerts = []
-        for district, coords in self.locations.items():
-            url = f"{self.base_url}/weather/realtime"
-            params = {
-                "location": f"{coords['lat']},{coords['lon']}",
-                "apikey": self.api_key,
-                "units": "metric",  # Use metric system for measurements
+        self.load_rules()
+        observations, self.failures = self.fetch_observations()
+        return [
+            {
+                "title": rule.title,
+                "type": rule.alert_type,
+                "metric": rule.metric,
+                "severity": rule.severity,
+                "district": district,
+                "active": True,
             }
+            for rule, district in self.check(observations)
+        ]
 
-            try:
-                # Fetch weather data from API
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract current weather values from response
-                values = data["data"]["values"]
-
-                # Check weather conditions against thresholds and generate alerts
-
-                # Wind speed threshold: 15 m/s (54 km/h)
-                if values["windSpeed"] > 15:
-                    alerts.append(
-                        {
-                            "title": "High Wind Alert",
-                            "type": "wind",
-                            "severity": "High",
-                            "district": district,
-                            "active": True,
-                        }
-                    )
-
-                # Precipitation intensity threshold: 7.6 mm/hr (heavy rain)
-                if values["precipitationIntensity"] > 7.6:
-                    alerts.append(
-                        {
-                            "title": "Heavy Rain Alert",
-                            "type": "precipitation",
-                            "severity": "Medium",
-                            "district": district,
-                            "active": True,
-                        }
-                    )
-
-                # Temperature threshold: 32°C (89.6°F)
-                if values["temperature"] > 32:
-                    alerts.append(
-                        {
-                            "title": "High Temperature Alert",
-                            "type": "temperature",
-                            "severity": "Low",
-                            "district": district,
-                            "active": True,
-                        }
-                    )
-
-            except Exception as e:
-                # Log any errors encountered during API calls or data processing
-                print(f"Error fetching weather data for {district}: {str(e)}")
+    def tick(self):
+        """
+        Poll every district, evaluate the rules and raise weather alerts.
 
-        return alerts
+        Returns:
+            list: Newly created WeatherAlert rows; rules that keep firing
+            extend their existing alert instead
+        """
+        self.load_rules()
+        observations, self.failures = self.fetch_observations()
+        return sync_weather_alerts(self.check(observations))
@@ -0,0 +1,51 @@
+"""
+Signal handlers for the alerts app.
+
+Pushes alert changes to WebSocket clients and invalidates the cached
+active-alert snapshots once they are committed.
+"""
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from . import cache
+from .broadcast import publish_alert, publish_removal
+from .models import Alert
+
+
+@receiver(post_save, sender=Alert)
+@receiver(post_delete, sender=Alert)
+def invalidate_snapshots(sender, **kwargs):
+    """
+    Invalidate the active-alert snapshots once the change is committed.
+
+    Registered before the publishing handlers, so clients notified of a
+    change never refetch a stale snapshot.
+    """
+    transaction.on_commit(cache.invalidate)
+
+
+@receiver(pre_save, sender=Alert)
+def remember_previous_group(sender, instance, **kwargs):
+    """Store the district and visibility the alert had before this save."""
+    instance._previous_group = None
+    if instance.pk:
+        instance._previous_group = (
+            Alert.objects.filter(pk=instance.pk)
+            .values_list("district", "is_public")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Alert)
+def publish_on_save(sender, instance, created, **kwargs):
+    """Push the saved alert to subscribed clients once committed."""
+    previous = getattr(instance, "_previous_group", None)
+    transaction.on_commit(lambda: publish_alert(instance, created, previous))
+
+
+@receiver(post_delete, sender=Alert)
+def publish_on_delete(sender, instance, **kwargs):
+    """Tell subscribed clients about a deleted alert once committed."""
+    alert_id, district, is_public = instance.pk, instance.district, instance.is_public
+    transaction.on_commit(lambda: publish_removal(alert_id, district, is_public))
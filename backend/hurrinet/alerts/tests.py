@@ -1,3 +1,610 @@
-from django.test import TestCase
+"""
+Tests for the Alerts application in HurriNet.
 
-# Create your tests here.
+This module contains tests for the weather alert service, rule engine,
+real-time alert fan-out, the cached current alerts endpoint, spatial
+alert matching and buffered delivery receipts.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import MultiPolygon, Point, Polygon
+from django.db import IntegrityError
+from django.core.cache import cache
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import reverse
+from unittest.mock import patch
+from rest_framework import status
+from rest_framework.test import APITestCase
+from weather.models import WeatherAlert
+from weather.stub_server import StubTomorrowServer, realtime_response
+from .consumers import AlertConsumer
+from resource_management.models import Resource
+from shelters.models import Shelter
+from .matching import get_alerts_covering, get_user_ids_in_area
+from .models import Alert, AlertDeliveryStats, AlertReceipt, AlertRule
+from .receipts import ReceiptBuffer, update_delivery_stats
+from .rules import CompiledRules, ObservationWindow, evaluate
+from .services import WeatherAlertService
+
+User = get_user_model()
+
+DISTRICTS = {
+    "Castries": {"lat": 14.0101, "lon": -60.9875},
+    "Gros Islet": {"lat": 14.0722, "lon": -60.9498},
+    "Vieux Fort": {"lat": 13.7246, "lon": -60.9490},
+}
+
+
+class StormStubServer(StubTomorrowServer):
+    """Stub reporting a storm over the north and an outage over the south."""
+
+    def respond(self, path, lat, lng):
+        if lat < 13.8:
+            return 401, {"message": "Unauthorized"}
+        body = realtime_response(lat, lng)
+        if lat > 14.05:
+            body["data"]["values"].update(windSpeed=22.0, precipitationIntensity=12.0)
+        return 200, body
+
+
+class WeatherAlertServiceTests(TestCase):
+    """Test cases for concurrent district polling and the default rules."""
+
+    def setUp(self):
+        """Start the stub server."""
+        self.stub = StormStubServer().start()
+        self.addCleanup(self.stub.stop)
+        api_settings = self.settings(TOMORROW_API_BASE_URL=self.stub.base_url)
+        api_settings.enable()
+        self.addCleanup(api_settings.disable)
+
+    def test_polls_every_district_with_partial_failures(self):
+        """Test alerts are raised for healthy districts and failures reported."""
+        service = WeatherAlertService(locations=DISTRICTS)
+        alerts = service.get_alerts()
+
+        self.assertEqual(len(self.stub.requests), 3)
+        self.assertEqual(
+            sorted((alert["district"], alert["metric"]) for alert in alerts),
+            [("Gros Islet", "precipitationIntensity"), ("Gros Islet", "windSpeed")],
+        )
+        self.assertEqual(list(service.failures), ["Vieux Fort"])
+
+    def test_defaults_to_configured_districts(self):
+        """Test every configured district is polled by default."""
+        with self.settings(
+            ALERT_DISTRICTS={
+                f"Community {i}": {"lat": 13.9 + i / 1000, "lon": -60.95}
+                for i in range(40)
+            }
+        ):
+            service = WeatherAlertService()
+            observations, failures = service.fetch_observations()
+        self.assertEqual(len(observations), 40)
+        self.assertEqual(failures, {})
+
+    def test_tick_raises_each_alert_once(self):
+        """Test a condition that keeps firing extends its alert."""
+        service = WeatherAlertService(locations=DISTRICTS)
+        created = service.tick()
+        self.assertEqual(
+            sorted(alert.title for alert in created),
+            ["Heavy Rain Alert", "High Wind Alert"],
+        )
+        end_time = WeatherAlert.objects.get(title="High Wind Alert").end_time
+
+        self.assertEqual(service.tick(), [])
+        self.assertEqual(WeatherAlert.objects.count(), 2)
+        self.assertGreaterEqual(
+            WeatherAlert.objects.get(title="High Wind Alert").end_time, end_time
+        )
+
+
+class AlertRuleEngineTests(SimpleTestCase):
+    """Test cases for vectorized rule evaluation."""
+
+    def setUp(self):
+        """Set up rules over two metrics with and without a duration."""
+        self.rules = [
+            AlertRule(metric="windSpeed", comparator="gt", threshold=15),
+            AlertRule(
+                metric="windSpeed", comparator="gte", threshold=10, duration_minutes=10
+            ),
+            AlertRule(metric="visibility", comparator="lt", threshold=1),
+        ]
+        self.metrics = ["visibility", "windSpeed"]
+        self.window = ObservationWindow(["A", "B"], self.metrics, 3, 5)
+        self.compiled = CompiledRules(self.rules, self.metrics, 5)
+        self.now = datetime(2026, 9, 1, 10, tzinfo=dt_timezone.utc)
+
+    def push(self, a, b, minutes=5):
+        self.now += timedelta(minutes=minutes)
+        self.window.push(
+            {
+                "A": dict(zip(["windSpeed", "visibility"], a)),
+                "B": dict(zip(["windSpeed", "visibility"], b)),
+            },
+            self.now,
+        )
+        return self.evaluate()
+
+    def evaluate(self):
+        return evaluate(self.window.values, self.window.times, self.compiled).tolist()
+
+    def test_comparators(self):
+        """Test strict and inclusive comparisons at the threshold."""
+        self.assertEqual(
+            self.push((15, 1), (15.5, 0.5)),
+            [[False, False, False], [True, False, True]],
+        )
+
+    def test_sustained_duration(self):
+        """Test duration rules need every step over the duration to match."""
+        self.push((10, 5), (12, 5))
+        self.push((11, 5), (9, 5))
+        self.assertEqual(
+            self.push((10, 5), (12, 5)),
+            [[False, True, False], [False, False, False]],
+        )
+
+    def test_duration_is_measured_in_time(self):
+        """Test closely spaced steps don't add up to a duration."""
+        for _ in range(3):
+            firing = self.push((12, 5), (12, 5), minutes=1)
+        self.assertEqual(firing[0], [False, False, False])
+        self.assertEqual(self.push((12, 5), (12, 5), minutes=9)[0][1], True)
+
+    def test_missing_observations_never_fire(self):
+        """Test failed fetches leave gaps that break sustained conditions."""
+        self.push((12, 5), (12, 5))
+        self.now += timedelta(minutes=5)
+        self.window.push({"A": {"windSpeed": 12, "visibility": 5}}, self.now)
+        firing = self.evaluate()
+        self.assertEqual(firing[1], [False, False, False])
+        self.assertEqual(
+            self.push((12, 5), (20, 0.1)),
+            [
+                [False, True, False],
+                [True, False, True],
+            ],
+        )
+
+
+class AlertFanOutTests(TransactionTestCase):
+    """Test cases for district-scoped alert delivery over WebSockets."""
+
+    def setUp(self):
+        """Set up a citizen and a staff user."""
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.staff = User.objects.create_user(
+            email="staff@test.com", password="testpass123", is_staff=True
+        )
+
+    async def connect(self, user, districts):
+        communicator = WebsocketCommunicator(
+            AlertConsumer.as_asgi(), f"/ws/alerts/?districts={districts}"
+        )
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        subscriptions = await communicator.receive_json_from()
+        self.assertEqual(subscriptions["type"], "subscriptions")
+        return communicator
+
+    @database_sync_to_async
+    def create_alert(self, district, is_public=True):
+        return Alert.objects.create(
+            title=f"Flooding in {district}",
+            severity="HIGH",
+            district=district,
+            is_public=is_public,
+            created_by=self.staff,
+        )
+
+    async def test_district_subscriptions(self):
+        """Test clients only get alerts for their districts and "All"."""
+        citizen = await self.connect(self.citizen, "Castries")
+        staff = await self.connect(self.staff, "Castries")
+
+        alert = await self.create_alert("Castries")
+        for communicator in (citizen, staff):
+            message = await communicator.receive_json_from()
+            self.assertEqual(message["type"], "alert_created")
+            self.assertEqual(message["alert"]["id"], alert.pk)
+
+        await self.create_alert("Soufriere")
+        await self.create_alert("All")
+        message = await citizen.receive_json_from()
+        self.assertEqual(message["district"], "All")
+
+        # Non-public alerts only reach staff
+        await self.create_alert("Castries", is_public=False)
+        self.assertEqual((await staff.receive_json_from())["district"], "All")
+        self.assertEqual((await staff.receive_json_from())["type"], "alert_created")
+        self.assertTrue(await citizen.receive_nothing())
+
+        await citizen.disconnect()
+        await staff.disconnect()
+
+    async def test_changing_subscriptions(self):
+        """Test districts can be added and removed on an open socket."""
+        communicator = await self.connect(self.citizen, "")
+        await communicator.send_json_to(
+            {"type": "subscribe", "districts": ["Micoud", "Atlantis"]}
+        )
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["districts"], ["All", "Micoud"])
+
+        alert = await self.create_alert("Micoud")
+        self.assertEqual(
+            (await communicator.receive_json_from())["alert"]["id"], alert.pk
+        )
+
+        await communicator.send_json_to(
+            {"type": "unsubscribe", "districts": ["Micoud", "All"]}
+        )
+        message = await communicator.receive_json_from()
+        self.assertEqual(message["districts"], ["All"])
+
+        # Hiding an alert removes it from the public group
+        alert.is_public = False
+        await database_sync_to_async(alert.save)()
+        await self.create_alert("Micoud")
+        self.assertTrue(await communicator.receive_nothing())
+
+        await communicator.disconnect()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class CurrentAlertsTests(APITestCase):
+    """Test cases for the cached, conditional current alerts endpoint."""
+
+    def setUp(self):
+        """Set up users and alerts."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.staff = User.objects.create_user(
+            email="staff@test.com", password="testpass123", is_staff=True
+        )
+        self.url = reverse("alert-current")
+        self.create_alert("Castries")
+        self.create_alert("All")
+        self.create_alert("Soufriere")
+        self.create_alert("Castries", is_public=False)
+        self.create_alert("Castries", is_active=False)
+
+    def create_alert(self, district, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Alert.objects.create(
+                title=f"Alert for {district}",
+                severity="HIGH",
+                district=district,
+                created_by=self.staff,
+                **kwargs,
+            )
+
+    def get_titles(self, user, **params):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(alert["title"] for alert in response.json())
+
+    def test_broadcast_failure_is_logged(self):
+        """Test a channel layer outage doesn't fail the save that triggered it."""
+        with patch(
+            "alerts.broadcast.get_channel_layer", side_effect=ConnectionError("down")
+        ), self.assertLogs("alerts.broadcast", level="ERROR"):
+            alert = self.create_alert("Gros Islet")
+        self.assertTrue(Alert.objects.filter(pk=alert.pk).exists())
+
+    def test_audience_and_district(self):
+        """Test regular users only see public alerts and districts include All."""
+        self.assertEqual(
+            self.get_titles(self.citizen, district="Castries"),
+            ["Alert for All", "Alert for Castries"],
+        )
+        self.assertEqual(len(self.get_titles(self.staff, district="Castries")), 3)
+        self.assertEqual(len(self.get_titles(self.citizen)), 3)
+
+    def test_unknown_district(self):
+        """Test districts outside the choices are rejected before the cache."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(self.url, {"district": "x" * 500})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalidate_failure_is_logged(self):
+        """Test a cache outage doesn't fail the save that triggered it."""
+        with patch(
+            "alerts.cache.cache.incr", side_effect=ConnectionError("down")
+        ), self.assertLogs("alerts.cache", level="ERROR"):
+            alert = self.create_alert("Gros Islet")
+        self.assertTrue(Alert.objects.filter(pk=alert.pk).exists())
+
+    def test_snapshot_is_a_cache_read(self):
+        """Test repeated polls skip the database and honour If-None-Match."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Any alert change invalidates the snapshot
+        self.create_alert("Micoud")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.json()), 4)
+
+
+# Roughly the Castries waterfront
+SURGE_ZONE = MultiPolygon(
+    Polygon(
+        [
+            (-61.00, 14.00),
+            (-60.98, 14.00),
+            (-60.98, 14.02),
+            (-61.00, 14.02),
+            (-61.00, 14.00),
+        ]
+    ),
+    srid=4326,
+)
+INSIDE = Point(-60.99, 14.01, srid=4326)
+OUTSIDE = Point(-60.95, 13.75, srid=4326)
+
+
+class AlertMatchingTests(APITestCase):
+    """Test cases for polygon-targeted alerts."""
+
+    def setUp(self):
+        """Set up users, a shelter and a resource around a surge zone."""
+        self.staff = User.objects.create_user(
+            email="staff@test.com", password="testpass123", is_staff=True
+        )
+        self.inside = User.objects.create_user(
+            email="inside@test.com", password="testpass123", home_location=INSIDE
+        )
+        User.objects.create_user(
+            email="outside@test.com", password="testpass123", home_location=OUTSIDE
+        )
+        User.objects.create_user(email="nowhere@test.com", password="testpass123")
+
+        self.alert = Alert.objects.create(
+            title="Storm surge",
+            severity="EXTREME",
+            district="Castries",
+            area=SURGE_ZONE,
+            created_by=self.staff,
+        )
+        self.island_wide = Alert.objects.create(
+            title="Hurricane warning",
+            severity="HIGH",
+            district="All",
+            created_by=self.staff,
+        )
+        Shelter.objects.create(
+            name="Waterfront school",
+            address="Castries",
+            latitude=14.01,
+            longitude=-60.99,
+            capacity=100,
+        )
+        Shelter.objects.create(
+            name="Vieux Fort school",
+            address="Vieux Fort",
+            latitude=13.75,
+            longitude=-60.95,
+            capacity=100,
+        )
+        Resource.objects.create(
+            name="Water depot",
+            resource_type="WATER",
+            capacity=10,
+            current_count=10,
+            location=INSIDE,
+            address="Castries",
+        )
+
+    def test_alerts_covering_point(self):
+        """Test area alerts match points inside them, island-wide alerts everywhere."""
+        self.assertEqual(
+            set(get_alerts_covering(INSIDE)), {self.alert, self.island_wide}
+        )
+        self.assertEqual(set(get_alerts_covering(OUTSIDE)), {self.island_wide})
+
+        self.client.force_authenticate(user=self.inside)
+        response = self.client.get(
+            reverse("alert-covering"), {"lat": 14.01, "lng": -60.99}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_alert_recipients(self):
+        """Test users, shelters and resources inside the area are found."""
+        self.assertEqual(get_user_ids_in_area(SURGE_ZONE), [self.inside.pk])
+
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(reverse("alert-recipients", args=[self.alert.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["users"], 1)
+        self.assertEqual(
+            [shelter["name"] for shelter in response.data["shelters"]],
+            ["Waterfront school"],
+        )
+        self.assertEqual(len(response.data["resources"]), 1)
+
+        self.client.force_authenticate(user=self.inside)
+        response = self.client.get(reverse("alert-recipients", args=[self.alert.pk]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_polygon_area_is_accepted(self):
+        """Test a plain Polygon can be posted as an alert area."""
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.post(
+            reverse("alert-list"),
+            {
+                "title": "Surge",
+                "description": "Move inland",
+                "severity": "HIGH",
+                "area": {
+                    "type": "Polygon",
+                    "coordinates": [list(SURGE_ZONE[0].coords[0])],
+                },
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["area"]["type"], "MultiPolygon")
+
+
+class AlertReceiptTests(APITestCase):
+    """Test cases for buffered alert receipts and delivery stats."""
+
+    def setUp(self):
+        """Set up users, an alert and a buffer that only flushes on demand."""
+        self.staff = User.objects.create_user(
+            email="staff@test.com", password="testpass123", is_staff=True
+        )
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.alert = Alert.objects.create(
+            title="Hurricane warning",
+            severity="HIGH",
+            district="All",
+            created_by=self.staff,
+        )
+        self.buffer = ReceiptBuffer(interval=None)
+        patcher = patch("alerts.receipts.buffer", self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_receipts_are_buffered_and_deduplicated(self):
+        """Test acks are only written on flush, once per user and alert."""
+        self.buffer.add(self.alert.pk, self.citizen.pk, "websocket")
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+        self.buffer.add(self.alert.pk + 1000, self.citizen.pk, "rest")
+        self.assertFalse(AlertReceipt.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 1)
+        receipt = AlertReceipt.objects.get()
+        self.assertEqual(receipt.channel, "websocket")
+
+        # Receipts flushed again are ignored
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+        self.buffer.flush()
+        self.assertEqual(AlertReceipt.objects.count(), 1)
+
+    def test_invalid_receipts_are_dropped(self):
+        """Test acks of deleted users and of alerts they can't see are dropped."""
+        staff_only = Alert.objects.create(
+            title="Staff briefing",
+            severity="LOW",
+            district="All",
+            is_public=False,
+            created_by=self.staff,
+        )
+        deleted = User.objects.create_user(
+            email="deleted@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.buffer.add(self.alert.pk, deleted.pk, "rest")
+        deleted.delete()
+        self.buffer.add(staff_only.pk, self.citizen.pk, "websocket")
+        self.buffer.add(staff_only.pk, self.staff.pk, "websocket")
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(
+            set(AlertReceipt.objects.values_list("alert_id", "user_id")),
+            {(staff_only.pk, self.staff.pk), (self.alert.pk, self.citizen.pk)},
+        )
+
+    def test_failed_flush_keeps_receipts(self):
+        """Test receipts are put back when the write fails."""
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+        with patch(
+            "alerts.receipts.update_delivery_stats", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            self.buffer.flush()
+        self.assertEqual(len(self.buffer), 1)
+        self.assertEqual(self.buffer.flush(), 1)
+
+    def test_failing_receipts_are_dropped_after_max_attempts(self):
+        """Test receipts that keep failing don't stay in the buffer forever."""
+        self.buffer = ReceiptBuffer(interval=None, max_attempts=2)
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+        with patch(
+            "alerts.receipts.update_delivery_stats", side_effect=RuntimeError
+        ), self.assertLogs("alerts.receipts", level="ERROR"):
+            for _ in range(2):
+                with self.assertRaises(RuntimeError):
+                    self.buffer.flush()
+        self.assertEqual(len(self.buffer), 0)
+
+    def test_rejected_receipt_does_not_block_the_batch(self):
+        """Test a receipt the database rejects is dropped on its own."""
+        other = Alert.objects.create(
+            title="Flood watch", severity="LOW", district="All", created_by=self.staff
+        )
+        real_update = update_delivery_stats
+
+        def update(alert_ids):
+            # As if the other alert was deleted between the check and the write
+            if other.pk in alert_ids:
+                raise IntegrityError("alert does not exist")
+            real_update(alert_ids)
+
+        self.buffer.add(self.alert.pk, self.citizen.pk, "rest")
+        self.buffer.add(other.pk, self.citizen.pk, "rest")
+        with patch("alerts.receipts.update_delivery_stats", side_effect=update):
+            self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(AlertReceipt.objects.get().alert, self.alert)
+
+    def test_delivery_stats(self):
+        """Test flushing keeps the delivery totals up to date."""
+        self.buffer.add(self.alert.pk, self.citizen.pk, "websocket")
+        self.buffer.flush()
+        stats = AlertDeliveryStats.objects.get(alert=self.alert)
+        self.assertEqual((stats.recipients, stats.received), (2, 1))
+        self.assertEqual(stats.delivery_rate, 0.5)
+
+        self.buffer.add(self.alert.pk, self.staff.pk, "rest")
+        self.buffer.flush()
+        stats.refresh_from_db()
+        self.assertEqual((stats.received, stats.websocket, stats.rest), (2, 1, 1))
+        self.assertEqual(stats.recipients, 2)
+
+    def test_ack_and_delivery_endpoints(self):
+        """Test acks are accepted without a write and reported to staff."""
+        self.client.force_authenticate(user=self.citizen)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse("alert-ack", args=[self.alert.pk]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(self.buffer), 1)
+
+        response = self.client.get(reverse("alert-delivery", args=[self.alert.pk]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.buffer.flush()
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(reverse("alert-delivery", args=[self.alert.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["received"], 1)
+        self.assertEqual(response.data["rest"], 1)
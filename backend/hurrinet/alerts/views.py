@@ -5,10 +5,15 @@ This module provides the ViewSet for handling Alert-related API endpoints,
 including listing, creating, updating, and filtering alerts based on various criteria.
 """
 
+from django.contrib.gis.geos import Point
+from django.http import HttpResponse, HttpResponseNotModified
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from .models import Alert
+from . import receipts
+from .cache import get_audience, get_snapshot
+from .matching import get_alert_recipients, get_alerts_covering
+from .models import Alert, AlertDeliveryStats
 from .serializers import AlertSerializer
 
 
@@ -70,22 +75,145 @@ class AlertViewSet(viewsets.ModelViewSet):
         """
         Custom endpoint to retrieve all currently active alerts.
 
-        Endpoint: GET /api/alerts/current/
-        Returns an empty array if no active alerts exist.
+        Endpoint: GET /api/alerts/current/?district=<district>
+        Returns an empty array if no active alerts exist. Regular users only
+        see public alerts, and a district also includes island-wide alerts.
+        Unknown districts are rejected with a 400.
+
+        The response is a cached snapshot with an ETag; requests with a
+        matching ``If-None-Match`` get a 304 Not Modified.
 
         Returns:
             Response: Serialized list of active alerts, ordered by creation date
         """
-        # Get all active alerts, newest first
-        active_alerts = Alert.objects.filter(is_active=True).order_by("-created_at")
+        district = request.query_params.get("district") or None
+        if district and district not in dict(Alert.DISTRICT_CHOICES):
+            return Response(
+                {"error": "Unknown district"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        snapshot = get_snapshot(get_audience(request.user), district)
+        if snapshot["etag"] in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            # Already rendered as JSON
+            response = HttpResponse(
+                snapshot["content"], content_type="application/json"
+            )
+        response["ETag"] = snapshot["etag"]
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    @action(detail=False, methods=["get"])
+    def covering(self, request):
+        """
+        Custom endpoint to retrieve the active alerts covering a point.
 
-        # Return empty array if no active alerts found
-        if not active_alerts.exists():
-            return Response([])
+        Endpoint: GET /api/alerts/covering/?lat=<lat>&lng=<lng>
 
-        serializer = self.get_serializer(active_alerts, many=True)
+        Returns:
+            Response: Serialized list of active alerts whose area contains the
+            point, plus island-wide alerts without an area
+        """
+        try:
+            point = Point(
+                float(request.query_params["lng"]),
+                float(request.query_params["lat"]),
+                srid=4326,
+            )
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "lat and lng query parameters are required numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        alerts = get_alerts_covering(point, get_audience(request.user))
+        serializer = self.get_serializer(alerts.select_related("created_by"), many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def recipients(self, request, pk=None):
+        """
+        Custom endpoint listing who and what is inside an alert's area.
+
+        Endpoint: GET /api/alerts/{id}/recipients/ (staff only)
+
+        Returns:
+            Response: Number of users, and the shelters and resources inside
+            the area
+        """
+        if not request.user.is_staff:
+            return Response(
+                {"error": "Only staff can view alert recipients"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        recipients = get_alert_recipients(self.get_object())
+        return Response(
+            {
+                "users": len(recipients["user_ids"]),
+                "shelters": list(recipients["shelters"].values("id", "name")),
+                "resources": list(
+                    recipients["resources"].values("id", "name", "resource_type")
+                ),
+            }
+        )
+
+    @action(detail=True, methods=["post"])
+    def ack(self, request, pk=None):
+        """
+        Custom endpoint to acknowledge receipt of an alert.
+
+        Endpoint: POST /api/alerts/{id}/ack/
+
+        The receipt is buffered and written with the next batch, so the
+        alert is not looked up here; receipts for unknown alerts, and for
+        alerts the user can't see, are dropped when the batch is flushed.
+
+        Returns:
+            Response: 202 once the receipt is buffered
+        """
+        try:
+            alert_id = int(pk)
+        except ValueError:
+            return Response(
+                {"error": "Invalid alert id"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        receipts.buffer.add(alert_id, request.user.pk, "rest")
+        return Response(status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"])
+    def delivery(self, request, pk=None):
+        """
+        Custom endpoint reporting how many users received an alert.
+
+        Endpoint: GET /api/alerts/{id}/delivery/ (staff only)
+
+        Returns:
+            Response: Delivery totals as of the last receipt flush
+        """
+        if not request.user.is_staff:
+            return Response(
+                {"error": "Only staff can view alert delivery"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        alert = self.get_object()
+        stats = AlertDeliveryStats.objects.filter(alert=alert).first()
+        if stats is None:
+            stats = AlertDeliveryStats(alert=alert)
+        return Response(
+            {
+                "recipients": stats.recipients,
+                "received": stats.received,
+                "websocket": stats.websocket,
+                "rest": stats.rest,
+                "delivery_rate": stats.delivery_rate,
+                "first_received_at": stats.first_received_at,
+                "last_received_at": stats.last_received_at,
+            }
+        )
+
     def partial_update(self, request, *args, **kwargs):
         """
         Handle PATCH requests to update alerts partially.
@@ -4,20 +4,34 @@ WebSocket consumer for the Chat application.
 This module handles real-time chat functionality using Django Channels,
 enabling bidirectional communication between clients and server for
 instant messaging and read receipt features.
+
+Each connection loads its session's participants and status once, on
+connect, and keeps them for the life of the socket. Session changes reach
+the connection as a ``chat_session`` group event (see ``chats.signals``),
+so sending a message needs no query of its own: it joins the next batch
+insert of ``chats.persistence``, and the sender gets a ``message_saved``
+reply with the stored id and the ``client_id`` it sent, if any.
 """
 
 import json
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
 from .models import ChatSession, ChatMessage
+from .persistence import get_writer
 from .serializers import ChatMessageSerializer
 
 # Get the active User model as defined in settings
 User = get_user_model()
 
 
+def group_name(session_id):
+    """Get the Channels group of a chat session."""
+    return f"chat_{session_id}"
+
+
 class ChatConsumer(AsyncWebsocketConsumer):
     """
     WebSocket consumer for handling real-time chat communications.
@@ -40,17 +54,26 @@ class ChatConsumer(AsyncWebsocketConsumer):
         4. Accepts or rejects the connection
         """
         self.session_id = self.scope["url_route"]["kwargs"]["session_id"]
-        self.room_group_name = f"chat_{self.session_id}"
+        self.room_group_name = group_name(self.session_id)
         self.user = self.scope["user"]
+        self.participants = set()
+        self.status = None
+        # When this connection last bumped the session's updated_at
+        self.touched_at = None
+
+        # Add user to the chat group for real-time updates. Joining before the
+        # session is loaded means no status change can slip in between.
+        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 
         # Verify user's authorization to access this chat session
         can_access = await self.can_access_chat()
         if not can_access:
+            await self.channel_layer.group_discard(
+                self.room_group_name, self.channel_name
+            )
             await self.close()
             return
 
-        # Add user to the chat group for real-time updates
-        await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
     async def disconnect(self, close_code):
@@ -81,6 +104,17 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 message = text_data_json["message"]
                 chat_message = await self.save_message(message)
                 if chat_message:
+                    # Confirm to the sender that the message is stored
+                    await self.send(
+                        text_data=json.dumps(
+                            {
+                                "type": "chat_message",
+                                "action": "message_saved",
+                                "client_id": text_data_json.get("client_id"),
+                                "id": chat_message["id"],
+                            }
+                        )
+                    )
                     # Broadcast the new message to all users in the chat
                     await self.channel_layer.group_send(
                         self.room_group_name,
@@ -120,6 +154,34 @@ class ChatConsumer(AsyncWebsocketConsumer):
         """
         await self.send(text_data=json.dumps(event))
 
+    async def chat_session(self, event):
+        """
+        Update the cached session state after the session changed.
+
+        Forwards the new status to the client, and closes the connection
+        once the user can no longer participate.
+
+        Args:
+            event (dict): New session status and participant ids
+        """
+        self.status = event["status"]
+        self.participants = set(event["participants"])
+        await self.send(
+            text_data=json.dumps(
+                {
+                    "type": "chat_session",
+                    "action": event["action"],
+                    "status": event["status"],
+                }
+            )
+        )
+        if not self.can_participate():
+            await self.close()
+
+    def can_participate(self):
+        """Check the cached session state lets the user send and read messages."""
+        return self.user.pk in self.participants and self.status == "active"
+
     @database_sync_to_async
     def can_access_chat(self):
         """
@@ -130,45 +192,62 @@ class ChatConsumer(AsyncWebsocketConsumer):
         2. User is either the initiator or recipient of the chat
         3. Chat session is active
 
+        The participants and status are kept for the rest of the connection.
+
         Returns:
             bool: True if user can access the chat, False otherwise
         """
-        try:
-            session = ChatSession.objects.get(id=self.session_id)
-            return (
-                self.user.is_authenticated
-                and (self.user == session.initiator or self.user == session.recipient)
-                and session.status == "active"
-            )
-        except ChatSession.DoesNotExist:
+        if not self.user.is_authenticated or not self.session_id.isdigit():
             return False
+        session = (
+            ChatSession.objects.filter(id=self.session_id)
+            .values("id", "initiator_id", "recipient_id", "status")
+            .first()
+        )
+        if session is None:
+            return False
+        self.session_id = session["id"]
+        self.participants = {session["initiator_id"], session["recipient_id"]}
+        self.status = session["status"]
+        return self.can_participate()
 
-    @database_sync_to_async
-    def save_message(self, content):
+    async def save_message(self, content):
         """
         Save a new chat message to the database.
 
+        The message is written in a batch with the messages of the other
+        connections in this process, see ``chats.persistence``.
+
         Args:
             content (str): Message content to be saved
 
         Returns:
             dict: Serialized message data if successful, None if failed
         """
-        try:
-            session = ChatSession.objects.get(id=self.session_id)
-            if not session.can_participate(self.user):
-                return None
+        if not self.can_participate():
+            return None
 
-            # Create and save the new message
-            message = ChatMessage.objects.create(
-                session=session, sender=self.user, content=content, message_type="text"
-            )
+        # Bump the session's updated_at at most once per interval
+        now = time.monotonic()
+        touch_session = (
+            self.touched_at is None
+            or now - self.touched_at >= settings.CHAT_SESSION_TOUCH_INTERVAL
+        )
 
-            # Serialize the message for broadcasting
-            serializer = ChatMessageSerializer(message)
-            return serializer.data
-        except ChatSession.DoesNotExist:
-            return None
+        # Create and save the new message
+        message = ChatMessage(
+            session_id=self.session_id,
+            sender=self.user,
+            content=content,
+            message_type="text",
+        )
+        await get_writer().write(message, touch_session=touch_session)
+        if touch_session:
+            self.touched_at = now
+
+        # Serialize the message for broadcasting
+        serializer = ChatMessageSerializer(message)
+        return serializer.data
 
     @database_sync_to_async
     def mark_messages_as_read(self):
@@ -183,14 +262,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
         Returns:
             bool: True if messages were marked as read, False otherwise
         """
-        try:
-            session = ChatSession.objects.get(id=self.session_id)
-            if session.can_participate(self.user):
-                # Update all unread messages from other participants
-                ChatMessage.objects.filter(session=session, read=False).exclude(
-                    sender=self.user
-                ).update(read=True)
-                return True
-            return False
-        except ChatSession.DoesNotExist:
+        if not self.can_participate():
             return False
+
+        # Update all unread messages from other participants
+        ChatMessage.objects.filter(session_id=self.session_id, read=False).exclude(
+            sender=self.user
+        ).update(read=True)
+        return True
@@ -0,0 +1,144 @@
+"""
+Django management command to measure chat message throughput.
+
+Opens two ChatConsumer sockets per chat session, driven in-process through
+the ASGI interface, and has every socket send --messages messages, each
+after the previous one was acknowledged. Reports messages per second and
+the time from sending a message to its ``message_saved`` reply.
+
+Run it with ``--batch-size 1`` for a baseline where every message is
+written on its own, as before batching.
+"""
+
+import asyncio
+import json
+import time
+import numpy as np
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from chats.models import ChatSession
+from chats.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+BENCH_USER_EMAIL = "chat-bench-{}@hurrinet.local"
+
+
+class Socket:
+    """A WebSocket connection to ChatConsumer without the network."""
+
+    def __init__(self, app, user, session_id):
+        self.queue = asyncio.Queue()
+        self.acks = asyncio.Queue()
+        self.connected = asyncio.Event()
+        self.task = asyncio.create_task(
+            app(
+                {
+                    "type": "websocket",
+                    "path": f"/ws/chat/{session_id}/",
+                    "query_string": b"",
+                    "headers": [],
+                    "subprotocols": [],
+                    "user": user,
+                },
+                self.queue.get,
+                self.send,
+            )
+        )
+        self.queue.put_nowait({"type": "websocket.connect"})
+
+    async def send(self, message):
+        if message["type"] == "websocket.accept":
+            self.connected.set()
+        elif message["type"] == "websocket.send":
+            event = json.loads(message["text"])
+            if event.get("action") == "message_saved":
+                self.acks.put_nowait(time.perf_counter())
+
+    async def run(self, count, latencies):
+        for i in range(count):
+            sent = time.perf_counter()
+            await self.queue.put(
+                {
+                    "type": "websocket.receive",
+                    "text": json.dumps({"message": f"Benchmark message {i}"}),
+                }
+            )
+            latencies.append(await self.acks.get() - sent)
+
+    async def close(self):
+        await self.queue.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+class Command(BaseCommand):
+    help = "Measures chat messages stored per second over WebSockets"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=100)
+        parser.add_argument(
+            "--messages", type=int, default=50, help="Messages per socket"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Overrides CHAT_MESSAGE_BATCH_SIZE, 1 writes every message alone",
+        )
+        parser.add_argument(
+            "--interval", type=float, help="Overrides CHAT_MESSAGE_BATCH_INTERVAL"
+        )
+
+    def handle(self, *args, **options):
+        users = [
+            User.objects.get_or_create(
+                email=BENCH_USER_EMAIL.format(i), defaults={"role": "CITIZEN"}
+            )[0]
+            for i in range(2)
+        ]
+        sessions = ChatSession.objects.bulk_create(
+            [
+                ChatSession(initiator=users[0], recipient=users[1])
+                for _ in range(options["sessions"])
+            ]
+        )
+        overrides = {}
+        if options["batch_size"]:
+            overrides["CHAT_MESSAGE_BATCH_SIZE"] = options["batch_size"]
+        if options["interval"] is not None:
+            overrides["CHAT_MESSAGE_BATCH_INTERVAL"] = options["interval"]
+        try:
+            with override_settings(**overrides):
+                asyncio.run(self.bench(users, sessions, options["messages"]))
+        finally:
+            # Deletes the messages too
+            ChatSession.objects.filter(pk__in=[s.pk for s in sessions]).delete()
+
+    async def bench(self, users, sessions, count):
+        app = URLRouter(websocket_urlpatterns)
+        sockets = [
+            Socket(app, user, session.pk) for session in sessions for user in users
+        ]
+        await asyncio.gather(*(socket.connected.wait() for socket in sockets))
+
+        latencies = []
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(socket.run(count, latencies) for socket in sockets))
+        finally:
+            elapsed = time.perf_counter() - started
+            await asyncio.gather(*(socket.close() for socket in sockets))
+
+        latencies = np.array(latencies) * 1000
+        p50, p99 = np.percentile(latencies, [50, 99])
+        self.stdout.write(
+            f"{len(sockets)} sockets, ack p50 {p50:.1f}ms, p99 {p99:.1f}ms, "
+            f"max {latencies.max():.1f}ms"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(latencies)} messages in {elapsed:.1f}s "
+                f"({len(latencies) / elapsed:.0f} messages/s)"
+            )
+        )
@@ -7,6 +7,7 @@ between users in the HurriNet application.
 
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class ChatSession(models.Model):
@@ -75,8 +76,9 @@ class ChatMessage(models.Model):
         ("location", "Location Share"),
     ]
 
+    # Indexed by the history index below, which starts with the session
     session = models.ForeignKey(
-        ChatSession, on_delete=models.CASCADE, related_name="messages"
+        ChatSession, on_delete=models.CASCADE, related_name="messages", db_index=False
     )
     sender = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="sent_messages"
@@ -95,14 +97,24 @@ class ChatMessage(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # Keyset pagination of a session's history, see chats.pagination
+            models.Index(
+                fields=["session", "created_at", "id"],
+                name="chatmessage_history_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_message_type_display()} from {self.sender.email} at {self.created_at}"
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, touch_session=True, **kwargs):
         """
         Override save method to update attachment information
         and session's updated_at timestamp.
+
+        Args:
+            touch_session: Whether to bump the session's updated_at
         """
         if self.attachment:
             self.attachment_name = self.attachment.name.split("/")[-1]
@@ -110,5 +122,9 @@ class ChatMessage(models.Model):
 
         super().save(*args, **kwargs)
 
-        # Update the session's updated_at timestamp
-        self.session.save()
+        # Update the session's updated_at timestamp without loading or
+        # rewriting the session, so a concurrent close isn't undone
+        if touch_session:
+            ChatSession.objects.filter(pk=self.session_id).update(
+                updated_at=timezone.now()
+            )
@@ -0,0 +1,102 @@
+"""
+Keyset pagination of chat message history for HurriNet.
+
+Pages are anchored on a message id rather than an offset. The anchor's
+``(created_at, id)`` is looked up once, and the page is read from the
+``(session, created_at, id)`` index starting right next to it, so every
+page costs the same however long the conversation is.
+
+- ``?session=<id>`` returns the latest messages
+- ``&before=<message id>`` returns the messages just older than that one
+  ("load older")
+- ``&after=<message id>`` returns the messages just newer than that one
+  ("load newer since")
+- ``&limit=<n>`` sets the page size, up to ``max_limit``
+
+Pages are always returned oldest first, as a plain list. Links to the
+neighbouring pages are sent in a ``Link`` header, as ``rel="prev"`` for older
+and ``rel="next"`` for newer messages.
+"""
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class MessageKeysetPagination(BasePagination):
+    """Paginates messages by ``(created_at, id)`` around an anchor message."""
+
+    max_limit = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        limit = self.get_limit(request)
+        before = self.get_anchor(queryset, request, "before")
+        after = self.get_anchor(queryset, request, "after")
+
+        if after is not None:
+            created_at, pk = after
+            queryset = queryset.filter(created_at__gte=created_at).filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk)
+            )
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            if before is not None:
+                created_at, pk = before
+                queryset = queryset.filter(created_at__lte=created_at).filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+                )
+            queryset = queryset.order_by("-created_at", "-id")
+
+        # The plain created_at bound lets the index scan start at the anchor;
+        # one extra row tells whether there is another page
+        messages = list(queryset[: limit + 1])
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after is None:
+            messages.reverse()
+
+        self.has_older = has_more if after is None else True
+        self.has_newer = has_more if after is not None else before is not None
+        self.messages = messages
+        return messages
+
+    def get_limit(self, request):
+        try:
+            limit = int(
+                request.query_params.get("limit", settings.CHAT_HISTORY_PAGE_SIZE)
+            )
+        except ValueError:
+            raise ValidationError({"limit": "Must be a number"})
+        return min(max(limit, 1), self.max_limit)
+
+    def get_anchor(self, queryset, request, param):
+        """Get the ``(created_at, id)`` of the message named by a parameter."""
+        message_id = request.query_params.get(param)
+        if message_id is None:
+            return None
+        anchor = (
+            queryset.filter(pk=message_id).values_list("created_at", "id").first()
+            if message_id.isdigit()
+            else None
+        )
+        if anchor is None:
+            raise ValidationError({param: "Unknown message"})
+        return anchor
+
+    def get_link(self, param, message):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "before" if param == "after" else "after")
+        return replace_query_param(url, param, message.pk)
+
+    def get_paginated_response(self, data):
+        links = []
+        if self.messages and self.has_older:
+            links.append(f'<{self.get_link("before", self.messages[0])}>; rel="prev"')
+        if self.messages and self.has_newer:
+            links.append(f'<{self.get_link("after", self.messages[-1])}>; rel="next"')
+        headers = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
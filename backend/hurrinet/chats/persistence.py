@@ -0,0 +1,130 @@
+"""
+Batched chat message persistence for HurriNet.
+
+Chat consumers don't insert their messages one at a time. They hand them to
+the :class:`MessageWriter` of their event loop, which collects the messages
+of every consumer in the process. The whole batch is written with one
+``bulk_create``, ``CHAT_MESSAGE_BATCH_INTERVAL`` seconds after the first
+message arrived or as soon as ``CHAT_MESSAGE_BATCH_SIZE`` are waiting. Each
+sender waits for its batch to commit and gets its message back with the
+final id, so a message is only acknowledged once it is stored.
+"""
+
+import asyncio
+import logging
+import weakref
+from channels.db import database_sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import ChatMessage, ChatSession
+
+logger = logging.getLogger(__name__)
+
+# One writer per event loop, as futures can't be shared between loops
+_writers = weakref.WeakKeyDictionary()
+
+
+def write_messages(messages, touched_sessions):
+    """Insert a batch of messages and bump the sessions that need it."""
+    with transaction.atomic():
+        ChatMessage.objects.bulk_create(messages)
+        if touched_sessions:
+            ChatSession.objects.filter(pk__in=touched_sessions).update(
+                updated_at=timezone.now()
+            )
+
+
+class MessageWriter:
+    """
+    Collects chat messages and writes them in batches.
+
+    Args:
+        interval: Seconds to wait for more messages after the first one,
+            defaults to ``CHAT_MESSAGE_BATCH_INTERVAL``
+        batch_size: Messages that trigger an immediate write, defaults to
+            ``CHAT_MESSAGE_BATCH_SIZE``
+    """
+
+    def __init__(self, interval=None, batch_size=None):
+        self.interval = (
+            settings.CHAT_MESSAGE_BATCH_INTERVAL if interval is None else interval
+        )
+        self.batch_size = batch_size or settings.CHAT_MESSAGE_BATCH_SIZE
+        self._pending = []
+        self._timer = None
+        self._flushes = set()
+
+    async def write(self, message, touch_session=True):
+        """
+        Store a message with the next batch.
+
+        Args:
+            message: Unsaved ChatMessage
+            touch_session: Whether to bump the session's updated_at
+
+        Returns:
+            ChatMessage: The message, with its id and created_at set
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((message, touch_session, future))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.interval, self.flush
+            )
+        return await future
+
+    def flush(self):
+        """Start writing the pending messages."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._write(batch))
+            # Keep a reference until the write finishes
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch):
+        messages = [message for message, _, _ in batch]
+        touched_sessions = {
+            message.session_id for message, touch_session, _ in batch if touch_session
+        }
+        try:
+            await database_sync_to_async(write_messages)(messages, touched_sessions)
+        except IntegrityError as e:
+            if len(batch) > 1:
+                # A message whose session was just deleted fails the whole
+                # batch, so write the messages one by one to only fail that one
+                for item in batch:
+                    await self._write([item])
+                return
+            logger.warning(f"Chat message rejected: {str(e)}")
+            self._fail(batch, e)
+            return
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} chat messages: {str(e)}")
+            self._fail(batch, e)
+            return
+        # Senders that disconnected meanwhile have cancelled their futures
+        for message, _, future in batch:
+            if not future.done():
+                future.set_result(message)
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+def get_writer():
+    """Get the message writer of the running event loop."""
+    loop = asyncio.get_running_loop()
+    writer = _writers.get(loop)
+    if writer is None:
+        writer = _writers[loop] = MessageWriter()
+    return writer
@@ -0,0 +1,49 @@
+"""
+Signal handlers for the chats app.
+
+Tells the chat consumers of a session when its status changes, so they can
+update the session state they keep for the connection instead of reloading
+the session on every message.
+"""
+
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .consumers import group_name
+from .models import ChatSession
+
+logger = logging.getLogger(__name__)
+
+
+def publish_session(session_id, status, participants):
+    """Send a session's state to its consumers, logging failures."""
+    try:
+        async_to_sync(get_channel_layer().group_send)(
+            group_name(session_id),
+            {
+                "type": "chat_session",
+                "action": "session_updated",
+                "status": status,
+                "participants": participants,
+            },
+        )
+    except Exception as e:
+        logger.error(f"Error publishing chat session {session_id}: {str(e)}")
+
+
+@receiver(post_save, sender=ChatSession)
+def publish_on_save(sender, instance, **kwargs):
+    """Push the saved session state to connected consumers once committed."""
+    session_id, status = instance.pk, instance.status
+    participants = [instance.initiator_id, instance.recipient_id]
+    transaction.on_commit(lambda: publish_session(session_id, status, participants))
+
+
+@receiver(post_delete, sender=ChatSession)
+def publish_on_delete(sender, instance, **kwargs):
+    """Tell connected consumers a deleted session is gone once committed."""
+    session_id = instance.pk
+    transaction.on_commit(lambda: publish_session(session_id, "deleted", []))
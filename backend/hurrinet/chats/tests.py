@@ -8,13 +8,20 @@ This module contains test cases for:
 4. Real-time communication
 """
 
-from django.test import TestCase
+import asyncio
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from unittest.mock import patch
+from django.test import TestCase, TransactionTestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 from accounts.models import CustomGroup
 from chats.models import ChatSession, ChatMessage
+from chats.persistence import MessageWriter
+from chats.routing import websocket_urlpatterns
 from chats.serializers import ChatSessionSerializer, ChatMessageSerializer
 
 User = get_user_model()
@@ -68,6 +75,15 @@ class ChatSessionTests(TestCase):
         self.assertEqual(session.recipient, self.user2)
         self.assertEqual(session.status, "active")
 
+    def test_session_publish_failure_is_logged(self):
+        """Test a channel layer outage doesn't fail the session update."""
+        with patch(
+            "chats.signals.get_channel_layer", side_effect=ConnectionError("down")
+        ), self.assertLogs("chats.signals", level="ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.chat_session.status = "closed"
+                self.chat_session.save()
+
     def test_list_chat_sessions(self):
         """Test listing user's chat sessions."""
         self.client.force_authenticate(user=self.user1)
@@ -158,6 +174,65 @@ class ChatMessageTests(TestCase):
         self.assertEqual(response.data["content"], "Test message")
 
 
+class ChatHistoryPaginationTests(TestCase):
+    """Test cases for keyset-paginated message history."""
+
+    def setUp(self):
+        """Set up a session with five messages."""
+        self.client = APIClient()
+        self.user1 = User.objects.create_user(
+            email="user1@example.com", password="user1pass", role="CITIZEN"
+        )
+        self.user2 = User.objects.create_user(
+            email="user2@example.com", password="user2pass", role="CITIZEN"
+        )
+        self.chat_session = ChatSession.objects.create(
+            initiator=self.user1, recipient=self.user2, status="active"
+        )
+        self.messages = [
+            ChatMessage.objects.create(
+                session=self.chat_session, sender=self.user1, content=f"Update {i}"
+            )
+            for i in range(5)
+        ]
+        self.client.force_authenticate(user=self.user1)
+
+    def get_ids(self, **params):
+        response = self.client.get(
+            "/api/chats/messages/",
+            {"session": self.chat_session.id, "limit": 2, **params},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [message["id"] for message in response.data], response
+
+    def test_latest_page(self):
+        """Test the latest messages come first, oldest first within the page."""
+        ids, response = self.get_ids()
+        self.assertEqual(ids, [m.id for m in self.messages[3:]])
+        self.assertIn('rel="prev"', response["Link"])
+        self.assertNotIn('rel="next"', response["Link"])
+
+    def test_load_older_and_newer(self):
+        """Test paging backwards from a message and forwards since one."""
+        ids, _ = self.get_ids(before=self.messages[3].id)
+        self.assertEqual(ids, [m.id for m in self.messages[1:3]])
+
+        ids, response = self.get_ids(before=self.messages[1].id)
+        self.assertEqual(ids, [self.messages[0].id])
+        self.assertNotIn('rel="prev"', response["Link"])
+
+        ids, response = self.get_ids(after=self.messages[0].id)
+        self.assertEqual(ids, [m.id for m in self.messages[1:3]])
+        self.assertIn(f"after={self.messages[2].id}", response["Link"])
+
+    def test_unknown_anchor(self):
+        """Test anchors must be messages the user can see."""
+        response = self.client.get(
+            "/api/chats/messages/", {"session": self.chat_session.id, "before": 999}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class ChatPermissionTests(TestCase):
     """Test cases for chat permissions."""
 
@@ -229,3 +304,97 @@ class ChatPermissionTests(TestCase):
         self.client.force_authenticate(user=self.user3)
         response = self.client.post("/api/chats/messages/", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ChatConsumerTests(TransactionTestCase):
+    """Test cases for real-time chat over WebSockets."""
+
+    def setUp(self):
+        """Set up two participants and an active chat session."""
+        self.user1 = User.objects.create_user(
+            email="user1@example.com", password="user1pass", role="CITIZEN"
+        )
+        self.user2 = User.objects.create_user(
+            email="user2@example.com", password="user2pass", role="CITIZEN"
+        )
+        self.chat_session = ChatSession.objects.create(
+            initiator=self.user1, recipient=self.user2, status="active"
+        )
+
+    async def connect(self, user):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/chat/{self.chat_session.id}/"
+        )
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator
+
+    async def test_send_message(self):
+        """Test a message is stored once and broadcast to the session."""
+        sender = await self.connect(self.user1)
+        recipient = await self.connect(self.user2)
+
+        await sender.send_json_to(
+            {"message": "Road to the shelter is flooded", "client_id": "c1"}
+        )
+        ack = await sender.receive_json_from()
+        self.assertEqual(ack["action"], "message_saved")
+        self.assertEqual(ack["client_id"], "c1")
+        for communicator in (sender, recipient):
+            event = await communicator.receive_json_from()
+            self.assertEqual(event["action"], "new_message")
+            self.assertEqual(event["message"]["session"], self.chat_session.id)
+
+        message = await database_sync_to_async(ChatMessage.objects.get)()
+        self.assertEqual(message.sender_id, self.user1.id)
+        self.assertEqual(ack["id"], message.id)
+
+        await sender.disconnect()
+        await recipient.disconnect()
+
+    async def test_messages_are_written_in_batches(self):
+        """Test concurrent messages share one write and each gets its id."""
+        writer = MessageWriter(interval=60, batch_size=3)
+        messages = [
+            ChatMessage(session=self.chat_session, sender=self.user1, content=str(i))
+            for i in range(3)
+        ]
+        # Filling the batch writes it without waiting for the interval
+        saved = await asyncio.wait_for(
+            asyncio.gather(*(writer.write(message) for message in messages)), 5
+        )
+        self.assertTrue(all(message.pk for message in saved))
+        self.assertEqual(await database_sync_to_async(ChatMessage.objects.count)(), 3)
+
+    async def test_closing_session_disconnects(self):
+        """Test closing a session reaches open sockets, which stop accepting messages."""
+        communicator = await self.connect(self.user1)
+
+        self.chat_session.status = "closed"
+        await database_sync_to_async(self.chat_session.save)()
+        event = await communicator.receive_json_from()
+        self.assertEqual(event["action"], "session_updated")
+        self.assertEqual(event["status"], "closed")
+        self.assertEqual(
+            (await communicator.receive_output())["type"], "websocket.close"
+        )
+
+        # New messages don't undo the close
+        await database_sync_to_async(ChatMessage.objects.create)(
+            session=self.chat_session, sender=self.user2, content="Still there?"
+        )
+        await database_sync_to_async(self.chat_session.refresh_from_db)()
+        self.assertEqual(self.chat_session.status, "closed")
+
+    async def test_non_participant_is_rejected(self):
+        """Test users outside the session can't connect."""
+        outsider = await database_sync_to_async(User.objects.create_user)(
+            email="user3@example.com", password="user3pass", role="CITIZEN"
+        )
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/chat/{self.chat_session.id}/"
+        )
+        communicator.scope["user"] = outsider
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
@@ -25,7 +25,8 @@ router.register("users", UserViewSet, basename="user")
 router.register("sessions", ChatSessionViewSet, basename="chat-session")
 
 # Chat message endpoints:
-# - GET /api/chats/messages/?session={id} (list messages)
+# - GET /api/chats/messages/?session={id} (latest messages, paged with
+#   before={message id}, after={message id} and limit)
 # - POST /api/chats/messages/ (create message)
 # - GET /api/chats/messages/{id}/ (get message)
 router.register("messages", ChatMessageViewSet, basename="chat-message")
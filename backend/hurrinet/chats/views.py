@@ -20,6 +20,7 @@ from .serializers import (
     ChatMessageSerializer,
     UserSerializer,
 )
+from .pagination import MessageKeysetPagination
 from .permissions import CanMessageUser
 
 User = get_user_model()
@@ -154,11 +155,13 @@ class ChatMessageViewSet(
     Provides endpoints for:
     - Creating new messages
     - Retrieving message history
-    - Listing messages in a chat session
+    - Listing messages in a chat session, a page at a time (see
+      ``chats.pagination`` for the before/after/limit parameters)
     """
 
     permission_classes = [IsAuthenticated]
     serializer_class = ChatMessageSerializer
+    pagination_class = MessageKeysetPagination
 
     def get_queryset(self):
         """Get messages for a specific chat session."""
@@ -173,9 +176,10 @@ class ChatMessageViewSet(
             queryset = queryset.filter(session_id=session_id)
 
         # Filter to only show messages from sessions where the user is a participant
-        return queryset.filter(
+        queryset = queryset.filter(
             Q(session__initiator=user) | Q(session__recipient=user)
-        ).order_by("created_at")
+        )
+        return queryset.select_related("sender").order_by("created_at")
 
     def perform_create(self, serializer):
         """Create a new message and set the sender."""
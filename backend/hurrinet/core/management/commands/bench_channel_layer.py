@@ -0,0 +1,250 @@
+"""
+Django management command to test the Redis channel layer across workers.
+
+Starts --workers processes, each acting as a separate daphne worker with its
+own channel layer connection and --sockets AlertConsumer instances driven
+in-process through the ASGI interface. Every socket joins the public "All"
+alert group, then this process sends --messages group messages and each
+worker counts what its sockets received. The run fails unless every socket
+in every worker got every message, which is what the in-memory layer can't
+do, and reports delivery latency and throughput.
+
+Local throwaway Redis servers are started, one per --shards, unless --redis
+points at existing ones.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import queue
+import time
+from types import SimpleNamespace
+import numpy as np
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from utils.redis_server import LocalRedisServer, is_available
+
+
+class Socket:
+    """A WebSocket connection to AlertConsumer without the network."""
+
+    def __init__(self, app, deliveries):
+        self.queue = asyncio.Queue()
+        self.subscribed = asyncio.Event()
+        self.deliveries = deliveries
+        self.task = asyncio.create_task(
+            app(
+                {
+                    "type": "websocket",
+                    "path": "/ws/alerts/",
+                    "query_string": b"",
+                    "headers": [],
+                    "subprotocols": [],
+                    "user": SimpleNamespace(
+                        pk=None, is_authenticated=True, is_staff=False
+                    ),
+                },
+                self.queue.get,
+                self.send,
+            )
+        )
+        self.queue.put_nowait({"type": "websocket.connect"})
+
+    async def send(self, message):
+        if message["type"] != "websocket.send":
+            return
+        if not self.subscribed.is_set():
+            # The first message lists the subscriptions
+            self.subscribed.set()
+            return
+        self.deliveries.append(time.time() - json.loads(message["text"])["sent"])
+
+    async def close(self):
+        await self.queue.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+def run_worker(layers, index, sockets, expected, idle_timeout, ready, results):
+    """Entry point of a worker process."""
+    import django
+
+    django.setup()
+    with override_settings(CHANNEL_LAYERS=layers):
+        asyncio.run(serve(index, sockets, expected, idle_timeout, ready, results))
+
+
+async def serve(index, sockets, expected, idle_timeout, ready, results):
+    # Workers import this module before Django is set up
+    from alerts.consumers import AlertConsumer
+
+    app = AlertConsumer.as_asgi()
+    deliveries = []
+    connections = [Socket(app, deliveries) for _ in range(sockets)]
+    await asyncio.gather(*(socket.subscribed.wait() for socket in connections))
+    ready.put(index)
+
+    # Wait for every message, or give up once deliveries stop arriving; the
+    # other workers may still be connecting before the first one
+    received, last_change = 0, time.monotonic()
+    while len(deliveries) < expected:
+        await asyncio.sleep(0.01)
+        if len(deliveries) != received:
+            received, last_change = len(deliveries), time.monotonic()
+        elif time.monotonic() - last_change > idle_timeout * (1 if received else 2):
+            break
+    finished = time.time()
+    await asyncio.gather(*(socket.close() for socket in connections))
+    results.put((index, np.array(deliveries), finished))
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifies and measures group delivery across workers on the Redis channel layer"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument(
+            "--sockets", type=int, default=1000, help="Sockets per worker"
+        )
+        parser.add_argument("--messages", type=int, default=100)
+        parser.add_argument(
+            "--shards", type=int, default=1, help="Local Redis servers to start"
+        )
+        parser.add_argument(
+            "--redis",
+            help="Comma-separated URLs of existing Redis servers to use instead",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait for workers to connect and for deliveries",
+        )
+
+    def handle(self, *args, **options):
+        servers = []
+        if options["redis"]:
+            hosts = [host.strip() for host in options["redis"].split(",")]
+        else:
+            if not is_available():
+                raise CommandError(
+                    "Install redis-server or fakeredis[lua], or pass --redis"
+                )
+            servers = [LocalRedisServer().start() for _ in range(options["shards"])]
+            hosts = [server.url for server in servers]
+        try:
+            return self.bench(hosts, options)
+        finally:
+            for server in servers:
+                server.stop()
+
+    def bench(self, hosts, options):
+        self.stdout.write(
+            f"Channel layer on {len(hosts)} Redis shard(s): {', '.join(hosts)}"
+        )
+        layers = {
+            "default": {
+                "BACKEND": "channels_redis.core.RedisChannelLayer",
+                "CONFIG": {
+                    "hosts": hosts,
+                    "prefix": "hurrinet",
+                    "expiry": settings.CHANNEL_MESSAGE_EXPIRY,
+                    "group_expiry": settings.CHANNEL_GROUP_EXPIRY,
+                    "capacity": settings.CHANNEL_CAPACITY,
+                },
+            }
+        }
+
+        # Fresh interpreters, so no worker shares this process's connections
+        context = multiprocessing.get_context("spawn")
+        ready, results = context.Queue(), context.Queue()
+        workers = [
+            context.Process(
+                target=run_worker,
+                args=(
+                    layers,
+                    index,
+                    options["sockets"],
+                    options["messages"] * options["sockets"],
+                    options["timeout"],
+                    ready,
+                    results,
+                ),
+                daemon=True,
+            )
+            for index in range(options["workers"])
+        ]
+        started = time.monotonic()
+        for worker in workers:
+            worker.start()
+        try:
+            for _ in workers:
+                ready.get(timeout=options["timeout"])
+        except queue.Empty:
+            for worker in workers:
+                worker.terminate()
+            raise CommandError("Workers did not connect in time")
+        self.stdout.write(
+            f"Connected {options['workers'] * options['sockets']} sockets on "
+            f"{options['workers']} workers in {time.monotonic() - started:.1f}s"
+        )
+
+        sending = time.time()
+        with override_settings(CHANNEL_LAYERS=layers):
+            async_to_sync(self.send_messages)(options["messages"])
+        sent = time.time() - sending
+
+        try:
+            reports = sorted(
+                results.get(timeout=options["timeout"] * 3) for _ in workers
+            )
+        except queue.Empty:
+            for worker in workers:
+                worker.terminate()
+            raise CommandError("Workers did not report in time")
+        for worker in workers:
+            worker.join()
+        self.report(reports, options, sending, sent)
+
+    async def send_messages(self, count):
+        from alerts.broadcast import group_name
+
+        layer = get_channel_layer()
+        group = group_name("public", "All")
+        for sequence in range(count):
+            text = json.dumps({"type": "bench", "seq": sequence, "sent": time.time()})
+            await layer.group_send(group, {"type": "alert.message", "text": text})
+
+    def report(self, reports, options, sending, sent):
+        expected = options["messages"] * options["sockets"]
+        self.stdout.write(
+            f"Sent {options['messages']} group messages in {sent * 1000:.0f}ms"
+        )
+        self.stdout.write(
+            f"{'worker':>6} {'received':>10} {'expected':>10} "
+            f"{'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        missing = 0
+        for index, latencies, _ in reports:
+            received = len(latencies)
+            missing += expected - received
+            latencies = latencies * 1000 if received else np.zeros(1)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            self.stdout.write(
+                f"{index:>6} {received:>10} {expected:>10} "
+                f"{p50:>8.1f} {p99:>8.1f} {latencies.max():>8.1f}"
+            )
+
+        delivered = sum(len(latencies) for _, latencies, _ in reports)
+        elapsed = max(finished for _, _, finished in reports) - sending
+        summary = (
+            f"{delivered} deliveries in {elapsed:.1f}s "
+            f"({delivered / elapsed:.0f} messages/s)"
+        )
+        if missing:
+            raise CommandError(f"{missing} deliveries missing; {summary}")
+        self.stdout.write(self.style.SUCCESS(summary))
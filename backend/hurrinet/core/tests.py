@@ -0,0 +1,30 @@
+"""
+Tests for the project-wide infrastructure of HurriNet.
+
+This module contains tests for the Redis channel layer shared by workers.
+"""
+
+from io import StringIO
+from unittest import skipUnless
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from utils.redis_server import is_available
+
+
+@skipUnless(is_available(), "redis-server or fakeredis[lua] is required")
+class ChannelLayerTests(SimpleTestCase):
+    """Test cases for group delivery across workers on the Redis channel layer."""
+
+    def test_group_delivery_across_workers(self):
+        """Test every socket on every worker gets every group message."""
+        out = StringIO()
+        call_command(
+            "bench_channel_layer",
+            workers=2,
+            sockets=20,
+            messages=10,
+            shards=2,
+            timeout=30,
+            stdout=out,
+        )
+        self.assertIn("400 deliveries", out.getvalue())
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    FeedPost = apps.get_model("feed", "FeedPost")
+    FeedPost.objects.update(
+        search_vector=SearchVector("content", weight="A", config="english")
+        + SearchVector("location", weight="B", config="english")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='feedpost',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='feedpost_search_vector_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
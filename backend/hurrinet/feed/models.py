@@ -5,7 +5,12 @@ This module defines models for managing feed posts and interactions.
 """
 
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from utils.search import update_search_vector
 
 
 class FeedPost(models.Model):
@@ -45,14 +50,27 @@ class FeedPost(models.Model):
     attachment = models.FileField(
         upload_to="feed_attachments/%Y/%m/%d/", null=True, blank=True
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Fields indexed for full-text search, with their ranking weight
+    SEARCH_VECTOR_FIELDS = [("content", "A"), ("location", "B")]
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="feedpost_search_vector_gin")
+        ]
 
     def __str__(self):
         return f"{self.get_post_type_display()} by {self.author.email}"
 
 
+@receiver(post_save, sender=FeedPost)
+def update_feed_post_search_vector(sender, instance, **kwargs):
+    """Refresh the post's full-text search vector on every write."""
+    update_search_vector(instance)
+
+
 class PostComment(models.Model):
     """Model for comments on feed posts."""
 
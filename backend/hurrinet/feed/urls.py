@@ -22,6 +22,7 @@ router.register(r"posts", FeedPostViewSet, basename="feed-post")
 # - POST /api/feed/posts/{id}/react/ (add/toggle reaction)
 # - GET /api/feed/posts/{id}/comments/ (get comments)
 # - GET /api/feed/posts/{id}/reactions/ (get reactions)
+# - GET /api/feed/posts/search/?q= (ranked full-text search)
 # - GET /api/feed/posts/my-posts/ (get user's posts)
 # - GET /api/feed/posts/nearby/ (get nearby posts)
 urlpatterns = [
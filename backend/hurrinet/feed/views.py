@@ -18,6 +18,7 @@ from .serializers import (
     PostReactionSerializer,
 )
 from .permissions import IsAuthorOrReadOnly
+from utils.search import FullTextSearchFilter, get_search_limit, ranked_search
 
 
 class FeedPostViewSet(viewsets.ModelViewSet):
@@ -36,7 +37,7 @@ class FeedPostViewSet(viewsets.ModelViewSet):
 
     permission_classes = [IsAuthenticated, IsAuthorOrReadOnly]
     filterset_fields = ["post_type", "author", "is_verified"]
-    search_fields = ["content", "location"]
+    filter_backends = [FullTextSearchFilter]
     ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
 
@@ -108,6 +109,23 @@ class FeedPostViewSet(viewsets.ModelViewSet):
         serializer = PostReactionSerializer(reactions, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Full-text search over active posts, ranked with highlighted snippets."""
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Missing 'q' parameter"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = get_search_limit(request)
+        results = ranked_search(
+            FeedPost.objects.filter(is_active=True), text, "content"
+        ).values("id", "post_type", "location", "created_at", "rank", "headline")[
+            :limit
+        ]
+        return Response({"results": list(results)})
+
     @action(detail=False, methods=["get"])
     def my_posts(self, request):
         """Get all posts by the current user."""
@@ -25,11 +25,86 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 TOMORROW_API_KEY = os.getenv("TOMORROW_API_KEY")
 if not TOMORROW_API_KEY:
     raise ValueError("TOMORROW_API_KEY environment variable is not set")
+TOMORROW_API_BASE_URL = os.getenv("TOMORROW_API_BASE_URL", "https://api.tomorrow.io/v4")
+TOMORROW_API_TIMEOUT = 10  # Seconds before an upstream weather request gives up
+TOMORROW_API_RETRIES = 3  # Retries on connection errors, 429 and 5xx responses
+
+# Locations polled by the fetch_weather_data command. The first one is served
+# by WeatherViewSet.current and forecast.
+WEATHER_LOCATIONS = [
+    {"name": "Saint Lucia", "lat": 13.9094, "lng": -60.9789},
+    {"name": "Castries", "lat": 14.0101, "lng": -60.9875},
+    {"name": "Gros Islet", "lat": 14.0722, "lng": -60.9498},
+    {"name": "Soufriere", "lat": 13.8566, "lng": -61.0564},
+    {"name": "Vieux Fort", "lat": 13.7246, "lng": -60.9490},
+]
+WEATHER_POLL_INTERVAL = 60 * 5  # Seconds between polls in --loop mode
+WEATHER_POLL_WORKERS = 8  # Locations fetched concurrently
+WEATHER_READING_INTERVAL = 60 * 10  # Seconds; one stored reading per location
+WEATHER_RAW_RETENTION_DAYS = 30  # Raw readings older than this are pruned
+WEATHER_HOURLY_RETENTION_DAYS = 365  # Hourly rollups older than this are pruned
+
+# Grid that weather for arbitrary points is interpolated on, covering Saint Lucia
+WEATHER_GRID_BOUNDS = {"south": 13.70, "north": 14.12, "west": -61.08, "east": -60.86}
+WEATHER_GRID_RESOLUTION = 0.005  # Degrees between grid points (~500 m)
+WEATHER_GRID_POWER = 2  # Inverse-distance weighting exponent
+
+# Districts monitored by the weather alert service, keyed by the names in
+# Alert.DISTRICT_CHOICES. Any number of communities can be added.
+ALERT_DISTRICTS = {
+    "Castries": {"lat": 14.0101, "lon": -60.9875},
+    "Gros Islet": {"lat": 14.0722, "lon": -60.9498},
+    "Vieux Fort": {"lat": 13.7246, "lon": -60.9490},
+    "Soufriere": {"lat": 13.8566, "lon": -61.0564},
+    "Micoud": {"lat": 13.8190, "lon": -60.9000},
+    "Dennery": {"lat": 13.9125, "lon": -60.8870},
+    "Laborie": {"lat": 13.7500, "lon": -61.0000},
+    "Choiseul": {"lat": 13.7750, "lon": -61.0500},
+    "Anse La Raye": {"lat": 13.9400, "lon": -61.0400},
+    "Canaries": {"lat": 13.9000, "lon": -61.0700},
+}
+ALERT_POLL_WORKERS = 16  # Districts fetched concurrently
+ALERT_RULE_STEP_MINUTES = 5  # Minutes between alert rule evaluations
+ALERT_RULE_ALERT_MINUTES = 60 * 3  # How long a raised weather alert stays active
+ALERT_RECEIPT_BATCH_SIZE = 1000  # Buffered receipts that trigger an early flush
+ALERT_RECEIPT_FLUSH_INTERVAL = 2  # Seconds between receipt flushes
+ALERT_RECEIPT_MAX_ATTEMPTS = 5  # Failed flushes before a receipt is dropped
+CHAT_SESSION_TOUCH_INTERVAL = 60  # Seconds between session bumps per chat socket
+CHAT_MESSAGE_BATCH_SIZE = 500  # Chat messages that trigger an immediate write
+CHAT_MESSAGE_BATCH_INTERVAL = 0.005  # Seconds chat messages wait for a batch
+CHAT_HISTORY_PAGE_SIZE = 50  # Chat messages per history page
 
 # Cache timeout settings
 CACHE_TTL = 60 * 15  # 15 minutes default
 INCIDENT_CACHE_TTL = 60 * 5  # 5 minutes for incidents
+ALERT_SNAPSHOT_TTL = 60 * 15  # Active alert snapshots, also invalidated on change
 WEATHER_CACHE_TTL = 60 * 30  # 30 minutes for weather data
+WEATHER_CACHE_STALE_TTL = 60 * 60 * 6  # Stale weather served while refreshing
+WEATHER_CACHE_PRECISION = 2  # Decimal places locations are rounded to (~1 km)
+WEATHER_FETCH_LOCK_TIMEOUT = 30  # Seconds one upstream fetch may hold the lock
+INCIDENT_TILE_CACHE_TTL = 60 * 60  # 1 hour for incident map tiles
+INCIDENT_TILE_MAX_CACHED_ZOOM = 16  # Tiles above this zoom are not cached
+
+# In-memory incident cluster index
+INCIDENT_CLUSTER_MAX_ZOOM = 16
+INCIDENT_CLUSTER_MAX_RESULTS = 500  # Upper bound on clusters per response
+INCIDENT_CLUSTER_SYNC_INTERVAL = 5  # Seconds between catch-up syncs
+INCIDENT_CLUSTER_REBUILD_INTERVAL = 60 * 10  # Seconds between full rebuilds
+
+# Duplicate detection for new incident reports
+INCIDENT_DUPLICATE_RADIUS_METERS = 250
+INCIDENT_DUPLICATE_WINDOW_HOURS = 6
+INCIDENT_DUPLICATE_SIMILARITY = 0.5  # Minimum text similarity (0-1)
+INCIDENT_DUPLICATE_MAX_CANDIDATES = 50
+
+# Hexagonal density aggregates (cell circumradius in metres)
+INCIDENT_DENSITY_HEX_SIZE = 500
+
+# Bulk incident imports (rows validated and inserted per chunk)
+INCIDENT_IMPORT_CHUNK_SIZE = 2000
+
+# Resolved incidents older than this are moved to the archive table
+INCIDENT_ARCHIVE_AFTER_DAYS = 90
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -54,6 +129,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.gis",
+    "django.contrib.postgres",
     "channels",
     "rest_framework",
     "corsheaders",
@@ -238,6 +314,19 @@ STATICFILES_DIRS = [
 MEDIA_URL = "/media/"
 MEDIA_ROOT = "/app/media"
 
+# Stream every upload to a temporary file instead of buffering it in memory
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# Image processing for uploaded photos (longest edge in pixels per variant)
+IMAGE_VARIANTS = {
+    "thumbnail": 320,
+    "medium": 1280,
+}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_PROCESSING_WORKERS = 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -272,25 +361,43 @@ LOGGING = {
 # Add ASGI application
 ASGI_APPLICATION = "hurrinet.routing.application"
 
-# Channel layers configuration
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
-        "CONFIG": {
-            "capacity": 1500,
-        },
+# Channel layers configuration. Set CHANNEL_REDIS_HOSTS to a comma-separated
+# list of Redis URLs so groups are shared by every daphne worker; with several
+# hosts, channels and groups are sharded across them by consistent hashing.
+# Without it, an in-memory layer is used, which only works within one process.
+CHANNEL_REDIS_HOSTS = [
+    host.strip()
+    for host in os.getenv("CHANNEL_REDIS_HOSTS", "").split(",")
+    if host.strip()
+]
+# Group memberships expire after this many seconds, so a socket open longer
+# stops receiving group messages; keep it at least daphne's websocket_timeout
+CHANNEL_GROUP_EXPIRY = int(os.getenv("CHANNEL_GROUP_EXPIRY", 60 * 60 * 24))
+CHANNEL_MESSAGE_EXPIRY = 30  # Seconds an undelivered message is kept
+CHANNEL_CAPACITY = 1500  # Messages queued per channel before sends fail
+
+if CHANNEL_REDIS_HOSTS:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": CHANNEL_REDIS_HOSTS,
+                "prefix": "hurrinet",
+                "expiry": CHANNEL_MESSAGE_EXPIRY,
+                "group_expiry": CHANNEL_GROUP_EXPIRY,
+                "capacity": CHANNEL_CAPACITY,
+            },
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels.layers.InMemoryChannelLayer",
+            "CONFIG": {
+                "capacity": CHANNEL_CAPACITY,
+            },
+        }
     }
-}
-
-# For production, uncomment this and comment out the above:
-# CHANNEL_LAYERS = {
-#     "default": {
-#         "BACKEND": "channels_redis.core.RedisChannelLayer",
-#         "CONFIG": {
-#             "hosts": [("127.0.0.1", 6379)],
-#         },
-#     }
-# }
 
 # WebSocket settings
 WEBSOCKET_URL = "/ws/incidents/"
@@ -4,8 +4,40 @@ Admin configuration for the incidents app.
 This module defines the admin interfaces for incident models.
 """
 
-from django.contrib import admin
-from .models import Incident, IncidentUpdate, IncidentFlag
+import io
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+from .importers import (
+    FORMATS,
+    ImportFileError,
+    ImportResult,
+    detect_format,
+    import_incidents,
+    iter_rows,
+)
+from .models import (
+    ArchivedIncident,
+    Incident,
+    IncidentUpdate,
+    IncidentFlag,
+    IncidentDensityCell,
+)
+
+# Rejected rows listed on the import page
+MAX_IMPORT_ERRORS_SHOWN = 500
+
+
+class IncidentImportForm(forms.Form):
+    """Upload form for bulk incident imports."""
+
+    file = forms.FileField(help_text="CSV or GeoJSON file")
+    format = forms.ChoiceField(
+        choices=[("", "Detect from file name")] + [(f, f.upper()) for f in FORMATS],
+        required=False,
+    )
 
 
 @admin.register(Incident)
@@ -24,7 +56,54 @@ class IncidentAdmin(admin.ModelAdmin):
     list_filter = ["incident_type", "severity", "is_resolved", "created_at"]
     search_fields = ["title", "description", "location"]
     readonly_fields = ["created_at", "updated_at", "resolved_at"]
-    raw_id_fields = ["created_by", "resolved_by"]
+    raw_id_fields = ["created_by", "resolved_by", "duplicate_of"]
+
+    def get_urls(self):
+        urls = [
+            path(
+                "import/",
+                self.admin_site.admin_view(self.import_view),
+                name="incidents_incident_import",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        """Bulk import incidents from an uploaded CSV or GeoJSON file."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        result = None
+        form = IncidentImportForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            result = ImportResult()
+            try:
+                file_format = form.cleaned_data["format"] or detect_format(upload.name)
+                stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+                import_incidents(
+                    iter_rows(stream, file_format), request.user, result=result
+                )
+            except (ImportFileError, UnicodeDecodeError) as e:
+                # Chunks inserted before the error are committed
+                messages.error(
+                    request,
+                    f"Import failed after {result.created} incidents were created: {e}",
+                )
+            else:
+                messages.success(request, f"Imported {result.created} incidents")
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Import incidents",
+            "opts": self.model._meta,
+            "form": form,
+            "result": result,
+            "errors": result.errors[:MAX_IMPORT_ERRORS_SHOWN] if result else [],
+        }
+        return TemplateResponse(
+            request, "admin/incidents/incident/import.html", context
+        )
 
 
 @admin.register(IncidentUpdate)
@@ -42,8 +121,48 @@ class IncidentUpdateAdmin(admin.ModelAdmin):
 class IncidentFlagAdmin(admin.ModelAdmin):
     """Admin interface for incident flags."""
 
-    list_display = ["incident", "reported_by", "reason", "created_at", "reviewed"]
-    list_filter = ["reason", "reviewed", "created_at"]
+    list_display = [
+        "incident",
+        "reported_by",
+        "reason",
+        "is_automatic",
+        "created_at",
+        "reviewed",
+    ]
+    list_filter = ["reason", "is_automatic", "reviewed", "created_at"]
     search_fields = ["description", "incident__title"]
     readonly_fields = ["created_at", "reviewed_at"]
     raw_id_fields = ["incident", "reported_by", "reviewed_by"]
+
+
+@admin.register(IncidentDensityCell)
+class IncidentDensityCellAdmin(admin.ModelAdmin):
+    """Admin interface for incident density aggregates."""
+
+    list_display = ["cell", "severity", "hour", "count"]
+    list_filter = ["severity", "hour"]
+    search_fields = ["cell"]
+    readonly_fields = ["cell", "severity", "hour", "count", "center_lon", "center_lat"]
+
+
+@admin.register(ArchivedIncident)
+class ArchivedIncidentAdmin(admin.ModelAdmin):
+    """Read-only admin interface for archived incidents."""
+
+    list_display = [
+        "title",
+        "incident_type",
+        "severity",
+        "created_at",
+        "resolved_at",
+        "archived_at",
+    ]
+    list_filter = ["incident_type", "severity", "created_at"]
+    search_fields = ["title", "description", "location_name"]
+    raw_id_fields = ["created_by", "resolved_by"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,128 @@
+"""
+Archiving of resolved incidents in HurriNet.
+
+The active incident table is kept small by moving incidents that were
+resolved a while ago into ``ArchivedIncident``, together with a snapshot of
+their updates and flags. Queries for open and recent incidents never touch
+the archive.
+"""
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from .models import ArchivedIncident, Incident
+
+# Incident columns copied to the archive as-is
+ARCHIVED_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "location",
+    "location_name",
+    "affected_area",
+    "incident_type",
+    "severity",
+    "photo",
+    "photo_variants",
+    "created_by_id",
+    "created_at",
+    "updated_at",
+    "resolved_at",
+    "resolved_by_id",
+    "duplicate_of_id",
+]
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def snapshot_history(incident):
+    """Serialize an incident's prefetched updates and flags."""
+    return {
+        "updates": [
+            {
+                "author_id": update.author_id,
+                "content": update.content,
+                "attachment": update.attachment.name or None,
+                "created_at": _isoformat(update.created_at),
+            }
+            for update in incident.updates.all()
+        ],
+        "flags": [
+            {
+                "reported_by_id": flag.reported_by_id,
+                "is_automatic": flag.is_automatic,
+                "reason": flag.reason,
+                "description": flag.description,
+                "created_at": _isoformat(flag.created_at),
+                "reviewed": flag.reviewed,
+                "reviewed_by_id": flag.reviewed_by_id,
+                "reviewed_at": _isoformat(flag.reviewed_at),
+            }
+            for flag in incident.flags.all()
+        ],
+    }
+
+
+def get_archivable(before):
+    """
+    Get resolved incidents last touched before a cutoff.
+
+    Originals that active reports are still linked to as duplicates stay, as
+    deleting them would unlink those reports. They are archived once their
+    duplicates are. Likewise, incidents with resources still assigned stay
+    until the resources are released, as deleting them would silently clear
+    the assignment.
+    """
+    return (
+        Incident.objects.filter(is_resolved=True)
+        .filter(
+            Q(resolved_at__lt=before)
+            | Q(resolved_at__isnull=True, updated_at__lt=before)
+        )
+        .exclude(Exists(Incident.objects.filter(duplicate_of=OuterRef("pk"))))
+        .filter(assigned_resources__isnull=True)
+    )
+
+
+def archive_resolved(before, batch_size=500):
+    """
+    Move resolved incidents into the archive, one batch per transaction.
+
+    Returns:
+        int: Number of incidents archived
+    """
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                get_archivable(before)
+                .defer("search_vector")
+                .prefetch_related("updates", "flags")
+                .order_by("id")[:batch_size]
+            )
+            if not batch:
+                return archived
+
+            # An incident already in the archive (e.g. written by a concurrent
+            # run) is overwritten with its current state rather than skipped.
+            # The upsert writes every row of the batch or raises, so the whole
+            # batch can then be deleted; this cascades to the updates and
+            # flags captured in the snapshot.
+            ArchivedIncident.objects.bulk_create(
+                [
+                    ArchivedIncident(
+                        **{
+                            field: getattr(incident, field) for field in ARCHIVED_FIELDS
+                        },
+                        history=snapshot_history(incident),
+                    )
+                    for incident in batch
+                ],
+                update_conflicts=True,
+                unique_fields=["id"],
+                update_fields=[field for field in ARCHIVED_FIELDS if field != "id"]
+                + ["history"],
+            )
+            Incident.objects.filter(pk__in=[incident.pk for incident in batch]).delete()
+        archived += len(batch)
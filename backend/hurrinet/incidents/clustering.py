@@ -0,0 +1,227 @@
+"""
+Server-side clustering of open incidents in HurriNet.
+
+This module keeps an in-memory, supercluster-style hierarchical grid of open
+incidents. Every zoom level has its own grid of fixed pixel-size cells, so a
+viewport at any zoom touches a bounded number of cells. The index is loaded
+once per process, updated incrementally as incidents are created or resolved,
+and caught up with writes from other processes through ``updated_at``.
+"""
+
+import math
+import threading
+import time
+from collections import Counter
+from django.conf import settings
+from django.utils import timezone
+
+# Size of the world at zoom 0 and of one cluster cell, in pixels
+TILE_SIZE = 256
+CELL_SIZE = 64
+
+
+def lonlat_to_world(lon, lat):
+    """Project a WGS84 coordinate to normalised Web Mercator in [0, 1)."""
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def world_to_lonlat(x, y):
+    """Inverse of :func:`lonlat_to_world`."""
+    lon = x * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return lon, lat
+
+
+class Cluster:
+    """Running aggregate for the incidents in one grid cell."""
+
+    __slots__ = ("ids", "sum_x", "sum_y", "severity")
+
+    def __init__(self):
+        self.ids = set()
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.severity = Counter()
+
+    def add(self, incident_id, x, y, severity):
+        self.ids.add(incident_id)
+        self.sum_x += x
+        self.sum_y += y
+        self.severity[severity] += 1
+
+    def remove(self, incident_id, x, y, severity):
+        self.ids.discard(incident_id)
+        self.sum_x -= x
+        self.sum_y -= y
+        self.severity[severity] -= 1
+        if self.severity[severity] <= 0:
+            del self.severity[severity]
+
+    def to_dict(self, key):
+        count = len(self.ids)
+        lon, lat = world_to_lonlat(self.sum_x / count, self.sum_y / count)
+        return {
+            "id": key,
+            "count": count,
+            "coordinates": [lon, lat],
+            "severity": dict(self.severity),
+            "incident_id": next(iter(self.ids)) if count == 1 else None,
+        }
+
+
+class IncidentClusterIndex:
+    """
+    Hierarchical grid index of open incidents.
+
+    Each zoom level ``z`` divides the world into ``TILE_SIZE * 2**z / CELL_SIZE``
+    cells per axis. Adding or removing an incident touches one cell per level.
+    """
+
+    def __init__(self, max_zoom=16, max_clusters=500):
+        self.max_zoom = max_zoom
+        self.max_clusters = max_clusters
+        self._lock = threading.RLock()
+        self._points = {}
+        self._grids = [{} for _ in range(max_zoom + 1)]
+        self._loaded_at = None
+        self._synced_at = None
+        self._watermark = None
+
+    def _cells_per_axis(self, zoom):
+        return TILE_SIZE * 2**zoom // CELL_SIZE
+
+    def _cell(self, zoom, x, y):
+        n = self._cells_per_axis(zoom)
+        return int(x * n), int(y * n)
+
+    def upsert(self, incident_id, lon, lat, severity):
+        """Add an incident to the index, replacing any previous position."""
+        with self._lock:
+            self.discard(incident_id)
+            x, y = lonlat_to_world(lon, lat)
+            self._points[incident_id] = (x, y, severity)
+            for zoom, grid in enumerate(self._grids):
+                cell = self._cell(zoom, x, y)
+                cluster = grid.get(cell)
+                if cluster is None:
+                    cluster = grid[cell] = Cluster()
+                cluster.add(incident_id, x, y, severity)
+
+    def discard(self, incident_id):
+        """Remove an incident from the index if present."""
+        with self._lock:
+            point = self._points.pop(incident_id, None)
+            if point is None:
+                return
+            x, y, severity = point
+            for zoom, grid in enumerate(self._grids):
+                cell = self._cell(zoom, x, y)
+                cluster = grid.get(cell)
+                if cluster is None:
+                    continue
+                cluster.remove(incident_id, x, y, severity)
+                if not cluster.ids:
+                    del grid[cell]
+
+    def apply(self, incident):
+        """Update the index from an incident instance."""
+        if incident.is_resolved or incident.location is None:
+            self.discard(incident.pk)
+        else:
+            self.upsert(
+                incident.pk, incident.location.x, incident.location.y, incident.severity
+            )
+
+    def rebuild(self):
+        """Reload every open incident from the database."""
+        from .models import Incident
+
+        started = timezone.now()
+        rows = (
+            Incident.objects.filter(is_resolved=False)
+            .values_list("id", "location", "severity")
+            .iterator(chunk_size=2000)
+        )
+        with self._lock:
+            self._points = {}
+            self._grids = [{} for _ in range(self.max_zoom + 1)]
+            for incident_id, location, severity in rows:
+                self.upsert(incident_id, location.x, location.y, severity)
+            self._watermark = started
+            self._loaded_at = self._synced_at = time.monotonic()
+
+    def sync(self):
+        """
+        Bring the index up to date.
+
+        The index is fully rebuilt when first used and every
+        ``INCIDENT_CLUSTER_REBUILD_INTERVAL`` seconds. In between, incidents
+        written by other processes are picked up through ``updated_at``.
+        """
+        from .models import Incident
+
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._loaded_at is None
+                or now - self._loaded_at > settings.INCIDENT_CLUSTER_REBUILD_INTERVAL
+            ):
+                self.rebuild()
+                return
+            if now - self._synced_at < settings.INCIDENT_CLUSTER_SYNC_INTERVAL:
+                return
+
+            started = timezone.now()
+            changed = Incident.objects.filter(
+                updated_at__gte=self._watermark
+            ).only("id", "location", "severity", "is_resolved")
+            for incident in changed.iterator(chunk_size=2000):
+                self.apply(incident)
+            self._watermark = started
+            self._synced_at = now
+
+    def _query_zoom(self, west, south, east, north, zoom):
+        x0, y0 = lonlat_to_world(west, north)
+        x1, y1 = lonlat_to_world(east, south)
+        cx0, cy0 = self._cell(zoom, x0, y0)
+        cx1, cy1 = self._cell(zoom, x1, y1)
+        grid = self._grids[zoom]
+
+        results = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) < len(grid):
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    cluster = grid.get((cx, cy))
+                    if cluster is not None:
+                        results.append(cluster.to_dict(f"{zoom}:{cx}:{cy}"))
+        else:
+            for (cx, cy), cluster in grid.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    results.append(cluster.to_dict(f"{zoom}:{cx}:{cy}"))
+        return results
+
+    def get_clusters(self, west, south, east, north, zoom):
+        """
+        Get the clusters inside a bounding box at a zoom level.
+
+        If the box holds more than ``max_clusters`` cells at the requested
+        zoom, coarser levels are used so the response size stays bounded.
+        """
+        self.sync()
+        zoom = min(max(int(zoom), 0), self.max_zoom)
+        with self._lock:
+            while True:
+                clusters = self._query_zoom(west, south, east, north, zoom)
+                if len(clusters) <= self.max_clusters or zoom == 0:
+                    return zoom, clusters
+                zoom -= 1
+
+
+cluster_index = IncidentClusterIndex(
+    max_zoom=settings.INCIDENT_CLUSTER_MAX_ZOOM,
+    max_clusters=settings.INCIDENT_CLUSTER_MAX_RESULTS,
+)
@@ -0,0 +1,92 @@
+"""
+Incrementally maintained incident density aggregates.
+
+Every open incident contributes one to the ``IncidentDensityCell`` row for
+its hexagon, severity and reporting hour. Writes adjust those counters with
+a single upsert; reads only touch the aggregate table.
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Sum
+from .hexgrid import cell_center, lonlat_to_cell
+from .models import IncidentDensityCell
+
+UPSERT_SQL = f"""
+    INSERT INTO {IncidentDensityCell._meta.db_table}
+        (cell, severity, hour, count, center_lon, center_lat)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    ON CONFLICT (cell, severity, hour)
+    DO UPDATE SET count = {IncidentDensityCell._meta.db_table}.count + EXCLUDED.count
+"""
+
+
+def density_key(location, severity, created_at):
+    """Get the (cell, severity, hour) an open incident counts towards."""
+    cell = lonlat_to_cell(location.x, location.y, settings.INCIDENT_DENSITY_HEX_SIZE)
+    hour = created_at.replace(minute=0, second=0, microsecond=0)
+    return cell, severity, hour
+
+
+def adjust(key, delta):
+    """Add ``delta`` to the count of one aggregate row, creating it if needed."""
+    cell, severity, hour = key
+    lon, lat = cell_center(cell, settings.INCIDENT_DENSITY_HEX_SIZE)
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_SQL, [cell, severity, hour, delta, lon, lat])
+
+
+def apply_change(previous, current):
+    """
+    Move an incident's contribution between aggregate rows.
+
+    Args:
+        previous: Key the incident counted towards before the write, or None
+        current: Key it counts towards after the write, or None
+    """
+    if previous == current:
+        return
+    if previous is not None:
+        adjust(previous, -1)
+    if current is not None:
+        adjust(current, 1)
+
+
+def get_density(west, south, east, north, start, end, severity=None):
+    """
+    Get per-cell open incident counts for a bounding box and time window.
+
+    Returns:
+        list: One dict per cell with its centre, total and severity breakdown
+    """
+    rows = IncidentDensityCell.objects.filter(
+        hour__gte=start,
+        hour__lt=end,
+        center_lon__gte=west,
+        center_lon__lte=east,
+        center_lat__gte=south,
+        center_lat__lte=north,
+    )
+    if severity:
+        rows = rows.filter(severity=severity)
+    rows = (
+        rows.values("cell", "center_lon", "center_lat", "severity")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        .order_by()
+    )
+
+    cells = {}
+    for row in rows:
+        cell = cells.setdefault(
+            row["cell"],
+            {
+                "cell": row["cell"],
+                "coordinates": [row["center_lon"], row["center_lat"]],
+                "count": 0,
+                "severity": {},
+            },
+        )
+        cell["count"] += row["total"]
+        cell["severity"][row["severity"]] = row["total"]
+    return list(cells.values())
@@ -0,0 +1,111 @@
+"""
+Duplicate detection for new incident reports in HurriNet.
+
+Candidates are found with a space-time query (``ST_DWithin`` on the
+geography GiST index plus a ``created_at`` window), then scored in Python by
+text similarity. Only the handful of reports near the new one in space and
+time are ever compared.
+"""
+
+import re
+from datetime import timedelta
+from difflib import SequenceMatcher
+from django.conf import settings
+from django.contrib.gis.measure import D
+from .models import Incident, IncidentFlag
+
+WORD_RE = re.compile(r"\w+")
+
+
+def _words(text):
+    return set(WORD_RE.findall((text or "").lower()))
+
+
+def text_similarity(incident, other):
+    """
+    Score how similar two incident reports read, from 0 to 1.
+
+    Titles are compared character-wise since they are short, descriptions by
+    the overlap of their words.
+    """
+    title_ratio = SequenceMatcher(
+        None, (incident.title or "").lower(), (other.title or "").lower()
+    ).ratio()
+
+    words, other_words = _words(incident.description), _words(other.description)
+    union = words | other_words
+    description_ratio = len(words & other_words) / len(union) if union else 0.0
+
+    return 0.6 * title_ratio + 0.4 * description_ratio
+
+
+def find_duplicate_candidates(incident):
+    """
+    Get open incidents reported near the incident shortly before it.
+
+    Reports already linked to an original are left out, so new duplicates
+    are always linked to the original itself rather than to another copy.
+    """
+    window_start = incident.created_at - timedelta(
+        hours=settings.INCIDENT_DUPLICATE_WINDOW_HOURS
+    )
+    return (
+        Incident.objects.filter(
+            is_resolved=False,
+            created_at__gte=window_start,
+            created_at__lte=incident.created_at,
+            duplicate_of__isnull=True,
+            location__dwithin=(
+                incident.location,
+                D(m=settings.INCIDENT_DUPLICATE_RADIUS_METERS),
+            ),
+        )
+        .exclude(pk=incident.pk)
+        .only("id", "title", "description", "created_at")
+        .order_by("-created_at")[: settings.INCIDENT_DUPLICATE_MAX_CANDIDATES]
+    )
+
+
+def find_duplicate(incident):
+    """
+    Find the most likely original report for an incident.
+
+    Returns:
+        tuple: (Incident, score) for the best match above the similarity
+        threshold, or (None, 0.0)
+    """
+    best, best_score = None, 0.0
+    for candidate in find_duplicate_candidates(incident):
+        score = text_similarity(incident, candidate)
+        if score > best_score:
+            best, best_score = candidate, score
+
+    if best_score < settings.INCIDENT_DUPLICATE_SIMILARITY:
+        return None, 0.0
+    return best, best_score
+
+
+def flag_if_duplicate(incident):
+    """
+    Link a new incident to its likely original and flag it for review.
+
+    The flag uses the existing DUPLICATE reason so moderators triage it
+    alongside citizen-reported duplicates. It is marked automatic and has no
+    reporter, since the incident's author didn't flag their own report.
+    """
+    original, score = find_duplicate(incident)
+    if original is None:
+        return None
+
+    incident.duplicate_of = original
+    Incident.objects.filter(pk=incident.pk).update(duplicate_of=original)
+    IncidentFlag.objects.create(
+        incident=incident,
+        reason="DUPLICATE",
+        is_automatic=True,
+        description=(
+            f"Automatically flagged as a possible duplicate of incident "
+            f"#{original.pk} (similarity {score:.2f})."
+        ),
+    )
+    return original
@@ -0,0 +1,54 @@
+"""
+Hexagonal grid helpers for incident density aggregates.
+
+Cells are pointy-top hexagons laid out in Web Mercator metres and addressed
+by axial coordinates ``"q:r"``. This plays the role of an H3 index without
+the extra dependency; the cell size is set by ``INCIDENT_DENSITY_HEX_SIZE``.
+"""
+
+import math
+
+EARTH_RADIUS = 6378137.0
+SQRT3 = math.sqrt(3)
+
+
+def _to_mercator(lon, lat):
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    x = math.radians(lon) * EARTH_RADIUS
+    y = math.log(math.tan(math.pi / 4 + math.radians(lat) / 2)) * EARTH_RADIUS
+    return x, y
+
+
+def _from_mercator(x, y):
+    lon = math.degrees(x / EARTH_RADIUS)
+    lat = math.degrees(2 * math.atan(math.exp(y / EARTH_RADIUS)) - math.pi / 2)
+    return lon, lat
+
+
+def _round_axial(q, r):
+    """Round fractional axial coordinates to the containing hexagon."""
+    s = -q - r
+    rq, rr, rs = round(q), round(r), round(s)
+    dq, dr, ds = abs(rq - q), abs(rr - r), abs(rs - s)
+    if dq > dr and dq > ds:
+        rq = -rr - rs
+    elif dr > ds:
+        rr = -rq - rs
+    return int(rq), int(rr)
+
+
+def lonlat_to_cell(lon, lat, size):
+    """Get the id of the hexagon of circumradius ``size`` metres containing a point."""
+    x, y = _to_mercator(lon, lat)
+    q = (SQRT3 / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+    q, r = _round_axial(q, r)
+    return f"{q}:{r}"
+
+
+def cell_center(cell, size):
+    """Get the (lon, lat) centre of a hexagon."""
+    q, r = (int(part) for part in cell.split(":"))
+    x = size * SQRT3 * (q + r / 2)
+    y = size * 1.5 * r
+    return _from_mercator(x, y)
@@ -0,0 +1,192 @@
+"""
+Image processing pipeline for incident photos and update attachments.
+
+Once an upload is committed, a process pool rewrites the original without
+its metadata (EXIF, GPS, maker notes) and renders resized WebP variants next
+to it, so neither full-resolution re-encode runs on the request path. Uploads
+in image formats Pillow cannot write back are rejected by the serializers,
+as their metadata could not be removed. The variant file names are then
+recorded on the model so serializers can expose a URL for each one.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+# Records finished variants, so no database work runs on the pool's
+# management thread or on the thread that submitted the image
+_store_executor = ThreadPoolExecutor(max_workers=1)
+
+
+def get_executor():
+    """Get the process pool used for image work, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # Spawn rather than fork so workers don't inherit DB connections or
+        # the server's threads
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def variant_name(name, variant):
+    """Get the storage name of a variant, stored next to the original."""
+    base, _ = os.path.splitext(name)
+    return f"{base}_{variant}.webp"
+
+
+def can_strip_metadata(upload):
+    """
+    Check whether the metadata of an uploaded file can be removed later.
+
+    Only the image header is read, so this is cheap enough for the request
+    path. Files that are not images are fine; images are only accepted in
+    formats Pillow can write back without their metadata.
+
+    Args:
+        upload: Uploaded file not yet saved to storage
+
+    Returns:
+        bool: False for images whose metadata would be kept
+    """
+    try:
+        upload.seek(0)
+        with Image.open(upload) as image:
+            image_format = image.format
+    except (UnidentifiedImageError, OSError):
+        # Image types Pillow can't read at all (e.g. HEIC) are refused too
+        content_type = getattr(upload, "content_type", None) or ""
+        return not content_type.startswith("image/")
+    finally:
+        upload.seek(0)
+    return image_format in Image.SAVE
+
+
+def strip_metadata(path):
+    """
+    Rewrite an image file without its metadata.
+
+    The EXIF orientation is applied to the pixels first, so the image still
+    displays the right way up. The file is replaced in one step, so it is
+    never served half written.
+
+    Returns:
+        Image: The stripped image, or None if the file is not an image
+    """
+    try:
+        with Image.open(path) as original:
+            image_format = original.format
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (UnidentifiedImageError, OSError):
+        return None
+
+    temp_path = f"{path}.tmp"
+    save_kwargs = {"quality": 90} if image_format == "JPEG" else {}
+    image.save(temp_path, format=image_format, **save_kwargs)
+    os.replace(temp_path, path)
+    return image
+
+
+def build_variants(root, name, variants, quality):
+    """
+    Strip the metadata of an image and render its WebP variants.
+
+    Runs inside a worker process, so it only deals with plain file paths.
+
+    Args:
+        root: Storage root directory (``MEDIA_ROOT``)
+        name: Storage name of the original file
+        variants: Mapping of variant name to maximum edge length in pixels
+        quality: WebP quality
+
+    Returns:
+        dict: Mapping of variant name to storage name, empty if the file is
+        not an image
+    """
+    image = strip_metadata(os.path.join(root, name))
+    if image is None:
+        return {}
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    results = {}
+    for variant, size in variants.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        resized_name = variant_name(name, variant)
+        resized.save(os.path.join(root, resized_name), format="WEBP", quality=quality)
+        results[variant] = resized_name
+    return results
+
+
+def _store_variants(model, pk, variants_field, future):
+    """Record the rendered variants on the model; runs on the store thread."""
+    try:
+        variants = future.result()
+    except Exception as e:
+        logger.error(f"Image processing failed for {model.__name__} {pk}: {e}")
+        return
+
+    # The thread's connection lives across images
+    close_old_connections()
+    try:
+        model.objects.filter(pk=pk).update(**{variants_field: variants})
+    except Exception as e:
+        logger.error(f"Error storing image variants for {model.__name__} {pk}: {e}")
+
+
+def process_image_field(instance, file_field, variants_field):
+    """
+    Schedule variant generation for a file field after the transaction commits.
+
+    The variants field is updated with a queryset ``update()`` so no model
+    signals fire again.
+    """
+    field_file = getattr(instance, file_field)
+    if not field_file:
+        return
+
+    model = type(instance)
+    pk = instance.pk
+    name = field_file.name
+
+    def submit():
+        future = get_executor().submit(
+            build_variants,
+            str(settings.MEDIA_ROOT),
+            name,
+            settings.IMAGE_VARIANTS,
+            settings.IMAGE_VARIANT_QUALITY,
+        )
+        # Done callbacks run on the pool's management thread, or right here
+        # if the work is already finished, so hand the result over
+        future.add_done_callback(
+            lambda f: _store_executor.submit(
+                _store_variants, model, pk, variants_field, f
+            )
+        )
+
+    transaction.on_commit(submit)
+
+
+def get_variant_urls(variants, request=None):
+    """Build URLs for each stored variant."""
+    from django.core.files.storage import default_storage
+
+    urls = {}
+    for variant, name in (variants or {}).items():
+        url = default_storage.url(name)
+        urls[variant] = request.build_absolute_uri(url) if request else url
+    return urls
@@ -0,0 +1,246 @@
+"""
+Bulk incident imports from CSV and GeoJSON files.
+
+Partner agencies hand over incident reports in bulk after an event. Files are
+parsed as a stream, rows are validated one at a time and inserted in chunks
+with ``bulk_create``. Reverse geocoding is deferred to the
+``geocode_incidents`` command, and every rejected row is reported with its
+row number and field errors.
+
+CSV files need ``title``, ``description``, ``incident_type``, ``severity``,
+``longitude`` and ``latitude`` columns, plus an optional ``location_name``.
+GeoJSON files are FeatureCollections of Points with the same properties; the
+altitude of 3-D points is ignored.
+"""
+
+import csv
+import json
+import re
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from utils.search import build_search_vector
+from . import density
+from .models import Incident
+from .serializers import IncidentImportSerializer
+from .tiles import invalidate_tiles_for_points
+
+FORMATS = ("csv", "geojson")
+
+# Row columns validated as incident fields; coordinates are handled apart
+IMPORT_FIELDS = {
+    "title",
+    "description",
+    "incident_type",
+    "severity",
+    "location_name",
+}
+
+REQUIRED_COLUMNS = {
+    "title",
+    "description",
+    "incident_type",
+    "severity",
+    "longitude",
+    "latitude",
+}
+
+FEATURES_RE = re.compile(r'"features"\s*:\s*\[')
+SEPARATOR_RE = re.compile(r"[\s,]*")
+
+
+class ImportFileError(Exception):
+    """Raised when an import file cannot be parsed at all."""
+
+
+class ImportResult:
+    """Outcome of an import: the number of rows created and per-row errors."""
+
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+
+    def add_error(self, row_number, errors):
+        self.errors.append({"row": row_number, "errors": errors})
+
+    def write_error_report(self, stream):
+        """Write the errors as CSV with one line per row and field."""
+        writer = csv.writer(stream)
+        writer.writerow(["row", "field", "error"])
+        for error in self.errors:
+            for field, message in error["errors"].items():
+                writer.writerow([error["row"], field, message])
+
+
+def detect_format(name):
+    """Guess the import format from a file name."""
+    if name.lower().endswith(".csv"):
+        return "csv"
+    if name.lower().endswith((".geojson", ".json")):
+        return "geojson"
+    raise ImportFileError(f"Cannot tell the format of '{name}', use CSV or GeoJSON")
+
+
+def iter_csv_rows(stream):
+    """Yield ``(line number, row)`` pairs from a CSV text stream."""
+    reader = csv.DictReader(stream)
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+    if missing:
+        raise ImportFileError(f"Missing CSV columns: {', '.join(sorted(missing))}")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _feature_to_row(feature):
+    """Flatten a GeoJSON feature into a row with longitude/latitude columns."""
+    if not isinstance(feature, dict):
+        return {}
+    row = dict(feature.get("properties") or {})
+    geometry = feature.get("geometry") or {}
+    coordinates = geometry.get("coordinates")
+    if geometry.get("type") == "Point" and isinstance(coordinates, list):
+        # Drop the altitude of 3-D points
+        if len(coordinates) in (2, 3):
+            row["longitude"], row["latitude"] = coordinates[:2]
+    return row
+
+
+def iter_geojson_rows(stream, read_size=65536):
+    """
+    Yield ``(feature number, row)`` pairs from a GeoJSON FeatureCollection.
+
+    Features are decoded one at a time from a sliding buffer, so memory use
+    does not depend on the size of the file.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while True:
+        match = FEATURES_RE.search(buffer)
+        if match:
+            break
+        chunk = stream.read(read_size)
+        if not chunk:
+            raise ImportFileError("No 'features' array found in GeoJSON")
+        buffer += chunk
+
+    pos = match.end()
+    number = 0
+    while True:
+        pos = SEPARATOR_RE.match(buffer, pos).end()
+        if buffer.startswith("]", pos):
+            return
+        try:
+            if pos == len(buffer):
+                raise ValueError
+            feature, pos = decoder.raw_decode(buffer, pos)
+        except ValueError:
+            # The next feature is incomplete, read more of the file
+            chunk = stream.read(read_size)
+            if not chunk:
+                raise ImportFileError(f"Invalid GeoJSON after feature {number}")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        number += 1
+        yield number, _feature_to_row(feature)
+
+
+def iter_rows(stream, file_format):
+    """Yield ``(row number, row)`` pairs from a text stream."""
+    if file_format == "csv":
+        return iter_csv_rows(stream)
+    if file_format == "geojson":
+        return iter_geojson_rows(stream)
+    raise ImportFileError(f"Unsupported format '{file_format}'")
+
+
+def validate_row(row, serializer=None):
+    """
+    Validate one row with :class:`IncidentImportSerializer`.
+
+    Args:
+        row: Mapping of column to value
+        serializer: Serializer to validate with; pass the same one for every
+            row of a file so its fields are only built once
+
+    Returns:
+        tuple: (field values for the incident, dict of field errors)
+    """
+    data = {
+        field: value.strip() if isinstance(value, str) else value
+        for field, value in row.items()
+        if field in IMPORT_FIELDS and value not in (None, "")
+    }
+    if isinstance(data.get("severity"), str):
+        data["severity"] = data["severity"].upper()
+    data["location"] = [row.get("longitude"), row.get("latitude")]
+
+    serializer = serializer or IncidentImportSerializer()
+    try:
+        return serializer.run_validation(data), {}
+    except ValidationError as e:
+        return {}, {
+            field: " ".join(str(message) for message in messages)
+            for field, messages in e.detail.items()
+        }
+
+
+def _insert_chunk(incidents):
+    """
+    Insert a chunk of incidents and update the data signals would maintain.
+
+    ``bulk_create`` sends no model signals, so search vectors, density
+    aggregates and cached tiles are updated here once per chunk. The cluster
+    index picks the new rows up through ``updated_at``.
+    """
+    with transaction.atomic():
+        created = Incident.objects.bulk_create(incidents)
+        Incident.objects.filter(pk__in=[incident.pk for incident in created]).update(
+            search_vector=build_search_vector(Incident.SEARCH_VECTOR_FIELDS)
+        )
+        counts = Counter(
+            density.density_key(
+                incident.location, incident.severity, incident.created_at
+            )
+            for incident in created
+        )
+        for key, count in counts.items():
+            density.adjust(key, count)
+
+    invalidate_tiles_for_points(incident.location for incident in created)
+    return len(created)
+
+
+def import_incidents(rows, created_by, chunk_size=None, result=None):
+    """
+    Validate and insert incidents from an iterable of ``(row number, row)``.
+
+    Valid rows are inserted in chunks of ``INCIDENT_IMPORT_CHUNK_SIZE``, each
+    in its own transaction, so an invalid row never blocks the rest.
+
+    Args:
+        result: ImportResult to record into; pass one to know how many rows
+            were created when reading the file fails part way through
+
+    Returns:
+        ImportResult: Number of incidents created and the rejected rows
+    """
+    chunk_size = chunk_size or settings.INCIDENT_IMPORT_CHUNK_SIZE
+    result = result or ImportResult()
+    serializer = IncidentImportSerializer()
+    chunk = []
+
+    for row_number, row in rows:
+        values, errors = validate_row(row, serializer)
+        if errors:
+            result.add_error(row_number, errors)
+            continue
+        chunk.append(Incident(created_by=created_by, **values))
+        if len(chunk) >= chunk_size:
+            result.created += _insert_chunk(chunk)
+            chunk = []
+
+    if chunk:
+        result.created += _insert_chunk(chunk)
+    return result
@@ -0,0 +1,47 @@
+"""
+Django management command to archive old resolved incidents.
+
+Moves incidents resolved more than INCIDENT_ARCHIVE_AFTER_DAYS ago out of the
+active incident table, so queries for open incidents only scan recent rows.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from incidents.archive import archive_resolved, get_archivable
+
+
+class Command(BaseCommand):
+    help = "Move old resolved incidents to the archive table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.INCIDENT_ARCHIVE_AFTER_DAYS,
+            help="Archive incidents resolved more than this many days ago "
+            "(default: INCIDENT_ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Incidents moved per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many incidents would be archived",
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options["days"])
+
+        if options["dry_run"]:
+            count = get_archivable(before).count()
+            self.stdout.write(f"{count} incidents would be archived")
+            return
+
+        count = archive_resolved(before, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} incidents"))
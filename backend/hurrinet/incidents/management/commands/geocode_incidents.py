@@ -0,0 +1,61 @@
+"""
+Django management command to fill in missing incident location names.
+
+Bulk imports skip reverse geocoding so they are not throttled by the
+geocoding service; this command resolves the names afterwards at a polite
+request rate.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from incidents.models import Incident
+from utils.search import update_search_vector
+
+# Names get_location_name returns when the lookup failed
+FAILED_NAMES = {"Geocoding Failed", "Error"}
+
+
+class Command(BaseCommand):
+    help = "Reverse geocode incidents that have no location name"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=1000,
+            help="Maximum number of incidents to geocode (default: 1000)",
+        )
+        parser.add_argument(
+            "--delay",
+            type=float,
+            default=1.0,
+            help="Seconds to wait between requests (default: 1.0, the "
+            "Nominatim usage limit)",
+        )
+
+    def handle(self, *args, **options):
+        pending = (
+            Incident.objects.filter(Q(location_name__isnull=True) | Q(location_name=""))
+            .only("id", "location", "location_name")
+            .order_by("id")[: options["limit"]]
+        )
+
+        geocoded = failed = 0
+        for incident in pending:
+            name = incident.get_location_name(force_update=True)
+            time.sleep(options["delay"])
+            if not name or name in FAILED_NAMES:
+                # Left empty so the next run tries again
+                failed += 1
+                continue
+            # Update without save() so no signals or extra geocoding run
+            Incident.objects.filter(pk=incident.pk).update(location_name=name)
+            update_search_vector(incident)
+            geocoded += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Geocoded {geocoded} incidents"))
+        if failed:
+            self.stdout.write(
+                self.style.WARNING(f"{failed} incidents failed, run again to retry")
+            )
@@ -0,0 +1,80 @@
+"""
+Django management command to bulk import incidents from CSV or GeoJSON.
+
+Rows are streamed from the file, validated and inserted in chunks. Location
+names are not geocoded during the import; run geocode_incidents afterwards.
+"""
+
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from incidents.importers import (
+    FORMATS,
+    ImportFileError,
+    detect_format,
+    import_incidents,
+    iter_rows,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Bulk import incidents from a CSV or GeoJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or GeoJSON file to import")
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the user the incidents are reported by",
+        )
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format (default: guessed from the file extension)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows inserted per batch (default: INCIDENT_IMPORT_CHUNK_SIZE)",
+        )
+        parser.add_argument(
+            "--errors",
+            help="Write rejected rows to this CSV file",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options["user"])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+
+        started = time.monotonic()
+        try:
+            file_format = options["format"] or detect_format(options["path"])
+            with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                result = import_incidents(
+                    iter_rows(stream, file_format), user, options["chunk_size"]
+                )
+        except (ImportFileError, OSError) as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        if result.errors and options["errors"]:
+            with open(options["errors"], "w", newline="") as stream:
+                result.write_error_report(stream)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {result.created} incidents in {elapsed:.1f}s")
+        )
+        if result.errors:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Rejected {len(result.errors)} rows"
+                    + (f", see {options['errors']}" if options["errors"] else "")
+                )
+            )
+            if not options["errors"]:
+                for error in result.errors[:20]:
+                    self.stdout.write(f"  row {error['row']}: {error['errors']}")
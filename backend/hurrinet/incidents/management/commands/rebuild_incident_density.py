@@ -0,0 +1,39 @@
+"""
+Django management command to rebuild the incident density aggregates.
+
+The aggregates are maintained incrementally by signals; this command
+recomputes them from scratch, e.g. after a bulk load or a change of
+INCIDENT_DENSITY_HEX_SIZE.
+"""
+
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from incidents.density import adjust, density_key
+from incidents.models import Incident, IncidentDensityCell
+
+
+class Command(BaseCommand):
+    help = "Rebuild incident density aggregates from open incidents"
+
+    def handle(self, *args, **options):
+        counts = Counter()
+        rows = (
+            Incident.objects.filter(is_resolved=False)
+            .values_list("location", "severity", "created_at")
+            .iterator(chunk_size=2000)
+        )
+        for location, severity, created_at in rows:
+            counts[density_key(location, severity, created_at)] += 1
+
+        with transaction.atomic():
+            IncidentDensityCell.objects.all().delete()
+            for key, count in counts.items():
+                adjust(key, count)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {len(counts)} density cells from "
+                f"{sum(counts.values())} open incidents"
+            )
+        )
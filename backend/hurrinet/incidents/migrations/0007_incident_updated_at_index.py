@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0006_incident_location_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['updated_at'], name='incident_updated_at_idx'),
+        ),
+    ]
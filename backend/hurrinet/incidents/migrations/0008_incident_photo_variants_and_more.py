@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-19 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0007_incident_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incident',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Resized WebP variants of the photo (auto-generated)'),
+        ),
+        migrations.AddField(
+            model_name='incidentupdate',
+            name='attachment_variants',
+            field=models.JSONField(blank=True, default=dict, help_text='Resized WebP variants of image attachments (auto-generated)'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0008_incident_photo_variants_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incident',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, help_text='Original report this incident likely duplicates (auto-detected)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicates', to='incidents.incident'),
+        ),
+    ]
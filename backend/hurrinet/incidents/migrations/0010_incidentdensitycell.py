@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0009_incident_duplicate_of'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IncidentDensityCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cell', models.CharField(help_text='Axial hexagon id (q:r)', max_length=32)),
+                ('severity', models.CharField(choices=[('LOW', 'Low'), ('MODERATE', 'Moderate'), ('HIGH', 'High'), ('EXTREME', 'Extreme')], max_length=10)),
+                ('hour', models.DateTimeField(help_text='Hour the incidents were reported in')),
+                ('count', models.IntegerField(default=0)),
+                ('center_lon', models.FloatField()),
+                ('center_lat', models.FloatField()),
+            ],
+            options={
+                'ordering': ['-hour'],
+                'indexes': [models.Index(fields=['hour', 'center_lon', 'center_lat'], name='densitycell_hour_cell_idx')],
+                'constraints': [models.UniqueConstraint(fields=('cell', 'severity', 'hour'), name='unique_density_cell')],
+            },
+        ),
+    ]
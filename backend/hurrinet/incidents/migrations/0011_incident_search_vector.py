@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def populate_search_vector(apps, schema_editor):
+    Incident = apps.get_model("incidents", "Incident")
+    Incident.objects.update(
+        search_vector=SearchVector("title", weight="A", config="english")
+        + SearchVector("location_name", weight="B", config="english")
+        + SearchVector("description", weight="C", config="english")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0010_incidentdensitycell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incident',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='incident_search_vector_gin'),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
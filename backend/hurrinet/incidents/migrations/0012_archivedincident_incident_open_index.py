@@ -0,0 +1,48 @@
+# Generated by Django 5.1.6 on 2026-10-19 11:30
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0011_incident_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(condition=models.Q(('is_resolved', False)), fields=['-created_at'], name='incident_open_created_idx'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedIncident',
+            fields=[
+                ('id', models.BigIntegerField(help_text='Id the incident had while active', primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('location', django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)),
+                ('location_name', models.CharField(blank=True, max_length=255, null=True)),
+                ('affected_area', django.contrib.gis.db.models.fields.PolygonField(blank=True, null=True, srid=4326)),
+                ('incident_type', models.CharField(max_length=100)),
+                ('severity', models.CharField(choices=[('LOW', 'Low'), ('MODERATE', 'Moderate'), ('HIGH', 'High'), ('EXTREME', 'Extreme')], max_length=10)),
+                ('photo', models.ImageField(blank=True, null=True, upload_to='incidents/')),
+                ('photo_variants', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('duplicate_of_id', models.BigIntegerField(blank=True, null=True)),
+                ('history', models.JSONField(blank=True, default=dict, help_text='Snapshot of the updates and flags')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_incidents', to=settings.AUTH_USER_MODEL)),
+                ('resolved_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resolved_archived_incidents', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['-created_at'], name='archivedincident_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0012_archivedincident_incident_open_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='incidentflag',
+            name='is_automatic',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='incidentflag',
+            name='reported_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reported_flags', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
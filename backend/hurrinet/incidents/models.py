@@ -5,6 +5,8 @@ This module defines models for managing incident reports and flags.
 """
 
 from django.contrib.gis.db import models as gis_models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
@@ -53,6 +55,11 @@ class Incident(models.Model):
     incident_type = models.CharField(max_length=100)
     severity = models.CharField(max_length=10, choices=SEVERITY_CHOICES)
     photo = models.ImageField(upload_to="incidents/", null=True, blank=True)
+    photo_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Resized WebP variants of the photo (auto-generated)",
+    )
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -70,12 +77,36 @@ class Incident(models.Model):
         blank=True,
         related_name="resolved_incidents",
     )
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicates",
+        help_text="Original report this incident likely duplicates (auto-detected)",
+    )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Fields indexed for full-text search, with their ranking weight
+    SEARCH_VECTOR_FIELDS = [
+        ("title", "A"),
+        ("location_name", "B"),
+        ("description", "C"),
+    ]
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["-created_at"]),
+            models.Index(fields=["updated_at"], name="incident_updated_at_idx"),
+            # Open incidents are the hot set; this stays small as the table grows
+            models.Index(
+                fields=["-created_at"],
+                name="incident_open_created_idx",
+                condition=models.Q(is_resolved=False),
+            ),
             gis_models.Index(fields=["location"]),
+            GinIndex(fields=["search_vector"], name="incident_search_vector_gin"),
         ]
 
     def __str__(self):
@@ -142,6 +173,11 @@ class IncidentUpdate(models.Model):
     attachment = models.FileField(
         upload_to="incident_updates/%Y/%m/%d/", null=True, blank=True
     )
+    attachment_variants = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Resized WebP variants of image attachments (auto-generated)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -169,10 +205,14 @@ class IncidentFlag(models.Model):
     reported_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        null=True,
+        blank=True,
         related_name="reported_flags",
     )
     reason = models.CharField(max_length=20, choices=FLAG_REASONS)
     description = models.TextField()
+    # Raised by HurriNet itself (e.g. duplicate detection), with no reporter
+    is_automatic = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     reviewed = models.BooleanField(default=False)
     reviewed_by = models.ForeignKey(
@@ -188,4 +228,91 @@ class IncidentFlag(models.Model):
         ordering = ["-created_at"]
 
     def __str__(self):
+        if self.reported_by is None:
+            return f"Automatic flag on {self.incident}"
         return f"Flag on {self.incident} by {self.reported_by.email}"
+
+
+class IncidentDensityCell(models.Model):
+    """
+    Count of open incidents per hexagonal cell, severity and hour.
+
+    Maintained incrementally as incidents are created, moved, re-graded or
+    resolved, so density maps never scan the incident table.
+    """
+
+    cell = models.CharField(max_length=32, help_text="Axial hexagon id (q:r)")
+    severity = models.CharField(max_length=10, choices=Incident.SEVERITY_CHOICES)
+    hour = models.DateTimeField(help_text="Hour the incidents were reported in")
+    count = models.IntegerField(default=0)
+    center_lon = models.FloatField()
+    center_lat = models.FloatField()
+
+    class Meta:
+        ordering = ["-hour"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cell", "severity", "hour"], name="unique_density_cell"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["hour", "center_lon", "center_lat"],
+                name="densitycell_hour_cell_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.cell} {self.severity} @ {self.hour:%Y-%m-%d %H:00}: {self.count}"
+
+
+class ArchivedIncident(models.Model):
+    """
+    Resolved incident moved out of the active incident table.
+
+    Keeps the incident's columns along with a snapshot of its updates and
+    flags, so the active table only holds recent and open incidents.
+    """
+
+    id = models.BigIntegerField(
+        primary_key=True, help_text="Id the incident had while active"
+    )
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    location = gis_models.PointField(geography=True, srid=4326)
+    location_name = models.CharField(max_length=255, blank=True, null=True)
+    affected_area = gis_models.PolygonField(null=True, blank=True, srid=4326)
+    incident_type = models.CharField(max_length=100)
+    severity = models.CharField(max_length=10, choices=Incident.SEVERITY_CHOICES)
+    photo = models.ImageField(upload_to="incidents/", null=True, blank=True)
+    photo_variants = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="archived_incidents",
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    resolved_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="resolved_archived_incidents",
+    )
+    duplicate_of_id = models.BigIntegerField(null=True, blank=True)
+    history = models.JSONField(
+        default=dict, blank=True, help_text="Snapshot of the updates and flags"
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="archivedincident_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.incident_type} (archived)"
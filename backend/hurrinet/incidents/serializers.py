@@ -7,11 +7,42 @@ This module provides serializers for converting incident models to/from JSON.
 from rest_framework import serializers
 from rest_framework_gis.serializers import GeoFeatureModelSerializer
 from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
 from .models import Incident, IncidentUpdate, IncidentFlag
+from .images import can_strip_metadata, get_variant_urls
 
 User = get_user_model()
 
 
+def validate_coordinates(coordinates):
+    """
+    Validate a ``[longitude, latitude]`` pair.
+
+    Returns:
+        tuple: (longitude, latitude) as floats
+    """
+    try:
+        longitude, latitude = (float(value) for value in coordinates)
+    except (TypeError, ValueError):
+        raise serializers.ValidationError(
+            "Location must have valid coordinates [longitude, latitude]"
+        )
+    if not (-180 <= longitude <= 180) or not (-90 <= latitude <= 90):
+        raise serializers.ValidationError(
+            "Invalid coordinates. Longitude must be between -180 and 180, latitude between -90 and 90"
+        )
+    return longitude, latitude
+
+
+def validate_upload(upload):
+    """Reject image uploads whose metadata could not be removed."""
+    if upload and not can_strip_metadata(upload):
+        raise serializers.ValidationError(
+            "Unsupported image format, upload a JPEG, PNG or WebP image"
+        )
+    return upload
+
+
 class UserBriefSerializer(serializers.ModelSerializer):
     """Brief serializer for user information in incident contexts."""
 
@@ -26,6 +57,7 @@ class IncidentUpdateSerializer(serializers.ModelSerializer):
 
     author = UserBriefSerializer(read_only=True)
     attachment_url = serializers.SerializerMethodField()
+    attachment_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = IncidentUpdate
@@ -36,11 +68,16 @@ class IncidentUpdateSerializer(serializers.ModelSerializer):
             "content",
             "attachment",
             "attachment_url",
+            "attachment_variants",
             "created_at",
             "updated_at",
         )
         read_only_fields = ("incident", "author")
 
+    def validate_attachment(self, value):
+        """Validate that an image attachment can have its metadata removed."""
+        return validate_upload(value)
+
     def get_attachment_url(self, obj):
         """Get the full URL for the attachment if it exists."""
         if obj.attachment:
@@ -49,6 +86,10 @@ class IncidentUpdateSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.attachment.url)
         return None
 
+    def get_attachment_variants(self, obj):
+        """Get URLs for the resized variants of an image attachment."""
+        return get_variant_urls(obj.attachment_variants, self.context.get("request"))
+
 
 class IncidentFlagSerializer(serializers.ModelSerializer):
     """Serializer for incident flags."""
@@ -66,6 +107,7 @@ class IncidentFlagSerializer(serializers.ModelSerializer):
             "reason",
             "reason_display",
             "description",
+            "is_automatic",
             "created_at",
             "reviewed",
             "reviewed_by",
@@ -74,6 +116,7 @@ class IncidentFlagSerializer(serializers.ModelSerializer):
         read_only_fields = (
             "incident",
             "reported_by",
+            "is_automatic",
             "reviewed",
             "reviewed_by",
             "reviewed_at",
@@ -92,6 +135,7 @@ class IncidentSerializer(GeoFeatureModelSerializer):
     created_by = UserSerializer(read_only=True)
     resolved_by = UserSerializer(read_only=True)
     photo_url = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Incident
@@ -106,12 +150,14 @@ class IncidentSerializer(GeoFeatureModelSerializer):
             "incident_type",
             "severity",
             "photo_url",
+            "photo_variants",
             "created_by",
             "created_at",
             "updated_at",
             "is_resolved",
             "resolved_at",
             "resolved_by",
+            "duplicate_of",
         ]
         read_only_fields = [
             "created_by",
@@ -119,13 +165,21 @@ class IncidentSerializer(GeoFeatureModelSerializer):
             "updated_at",
             "resolved_at",
             "resolved_by",
+            "duplicate_of",
         ]
 
     def get_photo_url(self, obj):
         if obj.photo:
-            return self.context["request"].build_absolute_uri(obj.photo.url)
+            request = self.context.get("request")
+            if request:
+                return request.build_absolute_uri(obj.photo.url)
+            return obj.photo.url
         return None
 
+    def get_photo_variants(self, obj):
+        """Get URLs for the resized WebP variants of the photo."""
+        return get_variant_urls(obj.photo_variants, self.context.get("request"))
+
 
 class IncidentCreateSerializer(GeoFeatureModelSerializer):
     """Serializer for creating incidents with spatial data."""
@@ -157,16 +211,35 @@ class IncidentCreateSerializer(GeoFeatureModelSerializer):
         if value.get("type") != "Point":
             raise serializers.ValidationError("Location must be a GeoJSON Point")
 
-        coordinates = value.get("coordinates")
-        if not coordinates or len(coordinates) != 2:
-            raise serializers.ValidationError(
-                "Location must have valid coordinates [longitude, latitude]"
-            )
+        validate_coordinates(value.get("coordinates"))
+        return value
+
+    def validate_photo(self, value):
+        """Validate that the photo can have its metadata removed."""
+        return validate_upload(value)
 
-        longitude, latitude = coordinates
-        if not (-180 <= longitude <= 180) or not (-90 <= latitude <= 90):
-            raise serializers.ValidationError(
-                "Invalid coordinates. Longitude must be between -180 and 180, latitude between -90 and 90"
-            )
 
-        return value
+class IncidentImportSerializer(serializers.ModelSerializer):
+    """
+    Serializer for one row of a bulk incident import.
+
+    Applies the model's field rules, like :class:`IncidentCreateSerializer`,
+    with the location given as ``[longitude, latitude]``.
+    """
+
+    location = serializers.JSONField()
+
+    class Meta:
+        model = Incident
+        fields = (
+            "title",
+            "description",
+            "incident_type",
+            "severity",
+            "location",
+            "location_name",
+        )
+
+    def validate_location(self, value):
+        """Build the incident's point from the row's coordinates."""
+        return Point(*validate_coordinates(value), srid=4326)
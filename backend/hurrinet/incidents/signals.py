@@ -0,0 +1,130 @@
+"""
+Signal handlers for the incidents app.
+
+Keeps derived incident data (cached map tiles, the cluster index, image
+variants, density aggregates and search vectors) in sync with incident
+writes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Incident, IncidentUpdate
+from .tiles import invalidate_tiles_for_point, invalidate_tiles_for_points
+from .clustering import cluster_index
+from .images import process_image_field
+from . import density
+from utils.search import update_search_vector
+
+
+@receiver(pre_save, sender=Incident)
+def remember_previous_state(sender, instance, **kwargs):
+    """
+    Store the incident's persisted state before it is overwritten.
+
+    Handlers that run after the save need the old values, e.g. to invalidate
+    tiles the incident moved out of or to move its density contribution.
+    """
+    instance._previous_state = None
+    if instance.pk:
+        instance._previous_state = (
+            Incident.objects.filter(pk=instance.pk)
+            .values("location", "photo", "severity", "is_resolved", "created_at")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Incident)
+def invalidate_tiles_on_save(sender, instance, **kwargs):
+    """
+    Invalidate the cached tiles covering the incident's old and new location.
+
+    Tiles are dropped once the write is committed, so a request rendering
+    them in between can't cache the old state again.
+    """
+    previous = getattr(instance, "_previous_state", None)
+    points = [instance.location]
+    if previous and previous["location"] != instance.location:
+        points.append(previous["location"])
+    transaction.on_commit(lambda: invalidate_tiles_for_points(points))
+
+
+@receiver(post_delete, sender=Incident)
+def invalidate_tiles_on_delete(sender, instance, **kwargs):
+    """Invalidate the cached tiles covering a deleted incident once committed."""
+    location = instance.location
+    transaction.on_commit(lambda: invalidate_tiles_for_point(location))
+
+
+@receiver(post_save, sender=Incident)
+def update_cluster_index_on_save(sender, instance, **kwargs):
+    """Add, move or remove the incident in the cluster index once committed."""
+    transaction.on_commit(lambda: cluster_index.apply(instance))
+
+
+@receiver(post_delete, sender=Incident)
+def update_cluster_index_on_delete(sender, instance, **kwargs):
+    """Remove a deleted incident from the cluster index once committed."""
+    incident_id = instance.pk
+    transaction.on_commit(lambda: cluster_index.discard(incident_id))
+
+
+@receiver(post_save, sender=Incident)
+def process_incident_photo(sender, instance, created, **kwargs):
+    """Generate photo variants when a new photo is uploaded."""
+    previous = getattr(instance, "_previous_state", None)
+    if instance.photo and (not previous or previous["photo"] != instance.photo.name):
+        process_image_field(instance, "photo", "photo_variants")
+
+
+@receiver(post_save, sender=IncidentUpdate)
+def process_update_attachment(sender, instance, created, **kwargs):
+    """Generate variants for image attachments on new incident updates."""
+    if created and instance.attachment:
+        process_image_field(instance, "attachment", "attachment_variants")
+
+
+def _density_key(state):
+    """Get the density aggregate an incident state counts towards, if any."""
+    if state is None or state["is_resolved"] or state["location"] is None:
+        return None
+    return density.density_key(
+        state["location"], state["severity"], state["created_at"]
+    )
+
+
+@receiver(post_save, sender=Incident)
+def update_density_on_save(sender, instance, **kwargs):
+    """Move the incident's contribution to the density aggregates."""
+    current = {
+        "location": instance.location,
+        "severity": instance.severity,
+        "is_resolved": instance.is_resolved,
+        "created_at": instance.created_at,
+    }
+    density.apply_change(
+        _density_key(getattr(instance, "_previous_state", None)),
+        _density_key(current),
+    )
+
+
+@receiver(post_delete, sender=Incident)
+def update_density_on_delete(sender, instance, **kwargs):
+    """Remove a deleted open incident from the density aggregates."""
+    density.apply_change(
+        _density_key(
+            {
+                "location": instance.location,
+                "severity": instance.severity,
+                "is_resolved": instance.is_resolved,
+                "created_at": instance.created_at,
+            }
+        ),
+        None,
+    )
+
+
+@receiver(post_save, sender=Incident)
+def update_incident_search_vector(sender, instance, **kwargs):
+    """Refresh the incident's full-text search vector."""
+    update_search_vector(instance)
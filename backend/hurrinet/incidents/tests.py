@@ -4,7 +4,9 @@ Tests for incident reporting in HurriNet.
 This module contains tests for incidents, updates, flags, and related permissions.
 """
 
-from django.test import TestCase, override_settings
+from unittest.mock import patch
+from django.core.management import call_command
+from django.test import TestCase, SimpleTestCase, override_settings
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase
@@ -13,8 +15,26 @@ from django.contrib.auth import get_user_model
 
 # Import Point for GeoDjango
 from django.contrib.gis.geos import Point
-from .models import Incident, IncidentUpdate, IncidentFlag
+from .models import (
+    ArchivedIncident,
+    Incident,
+    IncidentUpdate,
+    IncidentFlag,
+    IncidentDensityCell,
+)
+from resource_management.models import Resource
+from .archive import archive_resolved
+from .tiles import get_tile_cache_key, is_valid_tile, lonlat_to_tile
+from .clustering import IncidentClusterIndex, cluster_index
+from .images import build_variants, can_strip_metadata, strip_metadata
+from .importers import import_incidents, iter_csv_rows, iter_geojson_rows
+import io
+import json
+import os
+import tempfile
+from PIL import Image
 from django.utils import timezone
+from datetime import timedelta
 
 # Import cache
 from django.core.cache import cache
@@ -425,6 +445,741 @@ class IncidentPermissionTests(APITestCase):
         self.assertNotIn("Unrelated Incident", titles)
 
 
+class TileMathTests(SimpleTestCase):
+    """Test cases for vector tile coordinate helpers."""
+
+    def test_lonlat_to_tile(self):
+        """Test converting coordinates to XYZ tile indices."""
+        self.assertEqual(lonlat_to_tile(0, 0, 0), (0, 0))
+        self.assertEqual(lonlat_to_tile(-60.9832, 14.0101, 1), (0, 0))
+        self.assertEqual(lonlat_to_tile(-60.9832, 14.0101, 10), (338, 471))
+
+    def test_is_valid_tile(self):
+        """Test rejecting tiles outside the zoom level's grid."""
+        self.assertTrue(is_valid_tile(0, 0, 0))
+        self.assertFalse(is_valid_tile(1, 2, 0))
+        self.assertFalse(is_valid_tile(-1, 0, 0))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IncidentTileTests(APITestCase):
+    """Test cases for the incident vector tile endpoint."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.test_incident = Incident.objects.create(
+            title="Test Incident",
+            description="Test description",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+        self.tile = (10, 338, 471)
+        self.tile_url = reverse("incident-tile", args=self.tile)
+
+    def test_get_tile(self):
+        """Test fetching a tile caches the rendered bytes."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(self.tile_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.mapbox-vector-tile"
+        )
+        self.assertTrue(len(response.content) > 0)
+        self.assertEqual(cache.get(get_tile_cache_key(*self.tile)), response.content)
+
+    def test_tile_invalidated_on_save(self):
+        """Test saving an incident drops the cached tiles that contain it."""
+        self.client.force_authenticate(user=self.citizen)
+        self.client.get(self.tile_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_incident.severity = "LOW"
+            self.test_incident.save()
+            # Still cached until the write is committed
+            self.assertIsNotNone(cache.get(get_tile_cache_key(*self.tile)))
+        self.assertIsNone(cache.get(get_tile_cache_key(*self.tile)))
+
+    def test_invalid_tile(self):
+        """Test requesting a tile outside the grid."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(reverse("incident-tile", args=[1, 5, 5]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class IncidentClusterIndexTests(SimpleTestCase):
+    """Test cases for the in-memory incident cluster index."""
+
+    def setUp(self):
+        self.index = IncidentClusterIndex(max_zoom=16, max_clusters=500)
+        self.index.upsert(1, -60.9832, 14.0101, "HIGH")  # Castries
+        self.index.upsert(2, -60.9830, 14.0103, "LOW")  # Castries
+        self.index.upsert(3, -60.9527, 13.7151, "HIGH")  # Vieux Fort
+        self.island = (-61.1, 13.6, -60.8, 14.2)
+
+    def test_clusters_merge_at_low_zoom(self):
+        """Test nearby incidents share a cluster with a severity breakdown."""
+        clusters = self.index._query_zoom(*self.island, 8)
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]["count"], 3)
+        self.assertEqual(clusters[0]["severity"], {"HIGH": 2, "LOW": 1})
+
+    def test_clusters_split_at_high_zoom(self):
+        """Test incidents separate into their own cells when zoomed in."""
+        clusters = self.index._query_zoom(*self.island, 16)
+        self.assertEqual(len(clusters), 3)
+        self.assertEqual({c["incident_id"] for c in clusters}, {1, 2, 3})
+
+    def test_discard_and_move(self):
+        """Test removing and relocating incidents updates every level."""
+        self.index.discard(3)
+        self.index.upsert(2, -60.9527, 13.7151, "LOW")
+        clusters = self.index._query_zoom(*self.island, 16)
+        self.assertEqual(len(clusters), 2)
+        for zoom in range(17):
+            total = sum(c["count"] for c in self.index._query_zoom(*self.island, zoom))
+            self.assertEqual(total, 2)
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IncidentClusterTests(APITestCase):
+    """Test cases for the incident clusters endpoint."""
+
+    def setUp(self):
+        """Set up test data and reset the cluster index."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        for severity in ["HIGH", "LOW"]:
+            Incident.objects.create(
+                title="Test Incident",
+                description="Test description",
+                incident_type="FLOOD",
+                severity=severity,
+                location=Point(-60.9832, 14.0101, srid=4326),
+                location_name="Castries",
+                created_by=self.citizen,
+            )
+        cluster_index._loaded_at = None
+        self.clusters_url = reverse("incident-clusters")
+
+    def test_get_clusters(self):
+        """Test listing clusters for a bounding box."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(
+            self.clusters_url, {"bbox": "-61.1,13.6,-60.8,14.2", "zoom": 10}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["clusters"]), 1)
+        self.assertEqual(response.data["clusters"][0]["count"], 2)
+
+    def test_get_clusters_requires_bbox(self):
+        """Test the bbox parameter is required."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(self.clusters_url, {"zoom": 10})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImageVariantTests(SimpleTestCase):
+    """Test cases for the incident photo processing pipeline."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "incidents"))
+        self.name = "incidents/photo.jpg"
+        exif = Image.Exif()
+        exif[0x010F] = "PhoneMaker"  # Make
+        Image.new("RGB", (2000, 1000), "blue").save(
+            os.path.join(self.root, self.name), exif=exif
+        )
+
+    def test_build_variants(self):
+        """Test variants are resized WebP files."""
+        variants = build_variants(
+            self.root, self.name, {"thumbnail": 320, "medium": 1280}, 80
+        )
+        self.assertEqual(variants["thumbnail"], "incidents/photo_thumbnail.webp")
+        with Image.open(os.path.join(self.root, variants["thumbnail"])) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+    def test_strip_metadata(self):
+        """Test the original is rewritten without EXIF off the request path."""
+        build_variants(self.root, self.name, {"thumbnail": 320}, 80)
+        with Image.open(os.path.join(self.root, self.name)) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(len(image.getexif()), 0)
+
+        name = os.path.join(self.root, "incidents/report.txt")
+        with open(name, "w") as f:
+            f.write("not an image")
+        self.assertIsNone(strip_metadata(name))
+
+    def test_can_strip_metadata(self):
+        """Test only images whose metadata can be removed are accepted."""
+        with open(os.path.join(self.root, self.name), "rb") as f:
+            photo = SimpleUploadedFile("photo.jpg", f.read(), "image/jpeg")
+        self.assertTrue(can_strip_metadata(photo))
+        self.assertEqual(photo.tell(), 0)
+        self.assertTrue(can_strip_metadata(SimpleUploadedFile("a.pdf", b"%PDF-1.4")))
+        # Pillow can't read HEIC, so its GPS tags could not be removed
+        heic = SimpleUploadedFile(
+            "photo.heic", b"\x00\x00\x00\x18ftypheic", "image/heic"
+        )
+        self.assertFalse(can_strip_metadata(heic))
+
+    def test_non_image_attachment(self):
+        """Test non-image files are left alone."""
+        name = "incidents/report.txt"
+        with open(os.path.join(self.root, name), "w") as f:
+            f.write("not an image")
+        self.assertEqual(build_variants(self.root, name, {"thumbnail": 320}, 80), {})
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IncidentDuplicateTests(APITestCase):
+    """Test cases for duplicate detection on incident creation."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.original = Incident.objects.create(
+            title="Flooded road on Bridge Street",
+            description="Water is knee deep and cars cannot pass",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+        self.incidents_url = reverse("incident-list")
+
+    def create_incident(self, title, description, lon, lat):
+        self.client.force_authenticate(user=self.citizen)
+        data = {
+            "title": title,
+            "description": description,
+            "incident_type": "FLOOD",
+            "severity": "HIGH",
+            "location": create_geojson_point(lon, lat),
+        }
+        response = self.client.post(self.incidents_url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Incident.objects.exclude(pk=self.original.pk).latest("created_at")
+
+    def test_duplicate_is_flagged(self):
+        """Test a similar report nearby is linked and flagged as a duplicate."""
+        incident = self.create_incident(
+            "Flooded road Bridge Street",
+            "Cars cannot pass, water is knee deep",
+            -60.9831,
+            14.0102,
+        )
+        self.assertEqual(incident.duplicate_of, self.original)
+        flag = IncidentFlag.objects.get(incident=incident)
+        self.assertEqual(flag.reason, "DUPLICATE")
+        self.assertTrue(flag.is_automatic)
+        self.assertIsNone(flag.reported_by)
+
+    def test_duplicate_links_to_original(self):
+        """Test a report matching an earlier duplicate is linked to the original."""
+        first = self.create_incident(
+            "Flooded road Bridge Street",
+            "Cars cannot pass, water is knee deep",
+            -60.9831,
+            14.0102,
+        )
+        second = self.create_incident(
+            "Flooded road Bridge Street",
+            "Cars cannot pass, water is knee deep",
+            -60.9831,
+            14.0102,
+        )
+        self.assertEqual(first.duplicate_of, self.original)
+        self.assertEqual(second.duplicate_of, self.original)
+
+    def test_distant_report_is_not_flagged(self):
+        """Test a similar report far away is not treated as a duplicate."""
+        incident = self.create_incident(
+            "Flooded road on Bridge Street",
+            "Water is knee deep and cars cannot pass",
+            -60.9527,
+            13.7151,
+        )
+        self.assertIsNone(incident.duplicate_of)
+        self.assertFalse(IncidentFlag.objects.filter(incident=incident).exists())
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IncidentDensityTests(APITestCase):
+    """Test cases for the incrementally maintained density aggregates."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.test_incident = Incident.objects.create(
+            title="Test Incident",
+            description="Test description",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+        self.density_url = reverse("incident-density")
+        self.params = {"bbox": "-61.1,13.6,-60.8,14.2"}
+
+    def get_total(self, severity):
+        return sum(
+            IncidentDensityCell.objects.filter(severity=severity).values_list(
+                "count", flat=True
+            )
+        )
+
+    def test_counts_follow_incident_changes(self):
+        """Test creating, re-grading and resolving adjust the counts."""
+        self.assertEqual(self.get_total("HIGH"), 1)
+
+        self.test_incident.severity = "LOW"
+        self.test_incident.save()
+        self.assertEqual(self.get_total("HIGH"), 0)
+        self.assertEqual(self.get_total("LOW"), 1)
+
+        self.test_incident.is_resolved = True
+        self.test_incident.save()
+        self.assertEqual(self.get_total("LOW"), 0)
+
+    def test_get_density(self):
+        """Test the density endpoint returns per-cell counts."""
+        self.client.force_authenticate(user=self.citizen)
+        response = self.client.get(self.density_url, self.params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["cells"]), 1)
+        self.assertEqual(response.data["cells"][0]["severity"], {"HIGH": 1})
+
+    def test_density_time_range(self):
+        """Test naive timestamps are accepted and invalid ones rejected."""
+        self.client.force_authenticate(user=self.citizen)
+        start = (timezone.localtime() - timedelta(hours=1)).replace(tzinfo=None)
+        response = self.client.get(
+            self.density_url, {**self.params, "start": start.isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["cells"]), 1)
+
+        for value in ["2026-13-45T10:00:00", "yesterday"]:
+            response = self.client.get(self.density_url, {**self.params, "end": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class IncidentSearchTests(APITestCase):
+    """Test cases for full-text incident search."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        Incident.objects.create(
+            title="Flooded road",
+            description="The river burst its banks near the bridge",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+        Incident.objects.create(
+            title="Fallen tree",
+            description="A tree is blocking the road",
+            incident_type="OTHER",
+            severity="LOW",
+            location=Point(-60.9500, 13.8800, srid=4326),
+            location_name="Vieux Fort",
+            created_by=self.citizen,
+        )
+        self.search_url = reverse("incident-search")
+        self.client.force_authenticate(user=self.citizen)
+
+    def test_search_ranks_and_highlights(self):
+        """Test title matches rank first and snippets are highlighted."""
+        response = self.client.get(self.search_url, {"q": "road"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["title"], "Flooded road")
+        self.assertIn("<mark>road</mark>", results[1]["headline"])
+
+    def test_search_stems_words(self):
+        """Test queries match other forms of the same word."""
+        response = self.client.get(self.search_url, {"q": "flooding"})
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_search_uses_view_queryset(self):
+        """Test search is built on the view's filtered queryset."""
+        response = self.client.get(
+            self.search_url, {"q": "road", "search": "Vieux Fort"}
+        )
+        self.assertEqual(
+            [result["title"] for result in response.data["results"]], ["Fallen tree"]
+        )
+
+    def test_list_search_param(self):
+        """Test ?search= on the list endpoint uses the search vector."""
+        response = self.client.get(reverse("incident-list"), {"search": "Vieux Fort"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_search_requires_query(self):
+        """Test the search endpoint rejects an empty query."""
+        response = self.client.get(self.search_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_limit(self):
+        """Test the result limit is clamped and must be a number."""
+        response = self.client.get(self.search_url, {"q": "road", "limit": 0})
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(self.search_url, {"q": "road", "limit": "all"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class IncidentImportTests(TestCase):
+    """Test cases for bulk incident imports."""
+
+    CSV = (
+        "title,description,incident_type,severity,longitude,latitude\n"
+        "Flooded road,Water over the road,FLOOD,HIGH,-60.9832,14.0101\n"
+        ",Missing title,FLOOD,LOW,-60.9832,14.0101\n"
+        "Bad point,Out of range,FLOOD,LOW,-200,14.0101\n"
+        "Fallen tree,Blocking the road,OTHER,low,-60.9527,13.7151\n"
+    )
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email="admin@test.com", password="testpass123", role="ADMINISTRATOR"
+        )
+
+    def test_csv_import(self):
+        """Test valid rows are created and invalid rows reported by line."""
+        result = import_incidents(
+            iter_csv_rows(io.StringIO(self.CSV)), self.admin, chunk_size=1
+        )
+        self.assertEqual(result.created, 2)
+        self.assertEqual([error["row"] for error in result.errors], [3, 4])
+        self.assertIn("title", result.errors[0]["errors"])
+        self.assertIn("location", result.errors[1]["errors"])
+
+        incident = Incident.objects.get(title="Fallen tree")
+        self.assertEqual(incident.severity, "LOW")
+        self.assertEqual(incident.created_by, self.admin)
+        # Geocoding is deferred
+        self.assertIsNone(incident.location_name)
+        self.assertEqual(
+            Incident.objects.filter(search_vector="tree").count(),
+            1,
+        )
+        self.assertEqual(
+            sum(IncidentDensityCell.objects.values_list("count", flat=True)), 2
+        )
+
+    def test_geojson_import(self):
+        """Test features are streamed from a FeatureCollection."""
+        features = [
+            {
+                "type": "Feature",
+                "geometry": create_geojson_point(-60.9832, 14.0101 + i / 1000),
+                "properties": {
+                    "title": f"Report {i}",
+                    "description": "Imported report",
+                    "incident_type": "WIND",
+                    "severity": "MODERATE",
+                },
+            }
+            for i in range(25)
+        ]
+        # Altitude is dropped from 3-D points
+        features[0]["geometry"]["coordinates"].append(12.5)
+        features.append({"type": "Feature", "geometry": None, "properties": {}})
+        stream = io.StringIO(
+            json.dumps({"type": "FeatureCollection", "features": features})
+        )
+
+        result = import_incidents(
+            iter_geojson_rows(stream, read_size=64), self.admin, chunk_size=10
+        )
+        self.assertEqual(result.created, 25)
+        self.assertEqual(result.errors[0]["row"], 26)
+        self.assertEqual(Incident.objects.filter(incident_type="WIND").count(), 25)
+        self.assertFalse(Incident.objects.get(title="Report 0").location.hasz)
+
+    def test_admin_upload(self):
+        """Test the admin import page imports an uploaded file."""
+        self.client.force_login(
+            User.objects.create_superuser(
+                email="superuser@test.com", password="testpass123"
+            )
+        )
+        url = reverse("admin:incidents_incident_import")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        upload = SimpleUploadedFile(
+            "incidents.csv", self.CSV.encode(), content_type="text/csv"
+        )
+        response = self.client.post(url, {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.context["result"].created, 2)
+        self.assertEqual([error["row"] for error in response.context["errors"]], [3, 4])
+        self.assertEqual(Incident.objects.count(), 2)
+
+    def test_admin_upload_reports_partial_import(self):
+        """Test a file that fails part way reports the incidents already created."""
+        self.client.force_login(
+            User.objects.create_superuser(
+                email="superuser@test.com", password="testpass123"
+            )
+        )
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [-60.98, 14.01]},
+                "properties": {
+                    "title": f"Report {i}",
+                    "description": "Tree down",
+                    "incident_type": "OTHER",
+                    "severity": "LOW",
+                },
+            }
+            for i in range(2)
+        ]
+        content = json.dumps({"type": "FeatureCollection", "features": features})
+        upload = SimpleUploadedFile(
+            "incidents.geojson", content[:-3].encode(), content_type="application/json"
+        )
+        with override_settings(INCIDENT_IMPORT_CHUNK_SIZE=1):
+            response = self.client.post(
+                reverse("admin:incidents_incident_import"), {"file": upload}
+            )
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertIn(
+            "Import failed after 1 incidents were created",
+            [str(message) for message in response.context["messages"]][0],
+        )
+
+    def test_admin_upload_requires_add_permission(self):
+        """Test staff without the add permission cannot import."""
+        self.client.force_login(
+            User.objects.create_user(
+                email="staff@test.com", password="testpass123", is_staff=True
+            )
+        )
+        response = self.client.get(reverse("admin:incidents_incident_import"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_failed_geocoding_is_retried(self):
+        """Test incidents whose lookup failed keep an empty location name."""
+        import_incidents(iter_csv_rows(io.StringIO(self.CSV)), self.admin)
+        with patch.object(
+            Incident, "get_location_name", side_effect=["Castries", "Geocoding Failed"]
+        ):
+            call_command("geocode_incidents", delay=0, stdout=io.StringIO())
+        self.assertEqual(
+            list(
+                Incident.objects.order_by("id").values_list("location_name", flat=True)
+            ),
+            ["Castries", None],
+        )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class IncidentQueryCountTests(APITestCase):
+    """Test incident endpoints take a fixed number of queries."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.staff = User.objects.create_user(
+            email="staff@test.com",
+            password="testpass123",
+            role="EMERGENCY_PERSONNEL",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=self.citizen)
+
+    def create_incidents(self, count):
+        for i in range(count):
+            incident = Incident.objects.create(
+                title=f"Incident {i}",
+                description="Test description",
+                incident_type="FLOOD",
+                severity="HIGH",
+                location=Point(-60.9832, 14.0101, srid=4326),
+                location_name="Castries",
+                created_by=self.citizen,
+            )
+            if i % 2:
+                incident.is_resolved = True
+                incident.resolved_by = self.staff
+                incident.save()
+            IncidentUpdate.objects.create(
+                incident=incident, author=self.staff, content="Update"
+            )
+        return incident
+
+    def test_list_query_count(self):
+        """Test listing takes one query whatever the number of incidents."""
+        self.create_incidents(3)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("incident-list"))
+        self.assertEqual(len(response.data["features"]), 3)
+
+        self.create_incidents(12)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("incident-list"))
+        self.assertEqual(len(response.data["features"]), 15)
+
+    def test_my_incidents_and_check_updates_query_count(self):
+        """Test the list-style actions take one query."""
+        self.create_incidents(10)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("incident-my-incidents"))
+        self.assertEqual(len(response.data["features"]), 10)
+
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("incident-check-updates"), {"since": since}
+            )
+        self.assertEqual(len(response.data["updates"]["features"]), 10)
+
+    def test_detail_and_updates_query_count(self):
+        """Test detail and nested updates don't query per related user."""
+        incident = self.create_incidents(2)
+        with self.assertNumQueries(1):
+            self.client.get(reverse("incident-detail", kwargs={"pk": incident.pk}))
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse("incident-updates", kwargs={"pk": incident.pk})
+            )
+        self.assertEqual(response.data[0]["author"]["email"], "staff@test.com")
+
+
+class IncidentArchiveTests(TestCase):
+    """Test cases for archiving resolved incidents."""
+
+    def setUp(self):
+        """Set up test data and clear cache."""
+        cache.clear()
+        self.citizen = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.old = Incident.objects.create(
+            title="Old flood",
+            description="Resolved long ago",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+        IncidentUpdate.objects.create(
+            incident=self.old, author=self.citizen, content="Water receding"
+        )
+        Incident.objects.filter(pk=self.old.pk).update(
+            is_resolved=True, resolved_at=timezone.now() - timedelta(days=120)
+        )
+        self.open = Incident.objects.create(
+            title="Open flood",
+            description="Still ongoing",
+            incident_type="FLOOD",
+            severity="HIGH",
+            location=Point(-60.9832, 14.0101, srid=4326),
+            location_name="Castries",
+            created_by=self.citizen,
+        )
+
+    def test_archive_resolved(self):
+        """Test only old resolved incidents move, with their history."""
+        count = archive_resolved(timezone.now() - timedelta(days=90))
+        self.assertEqual(count, 1)
+        self.assertFalse(Incident.objects.filter(pk=self.old.pk).exists())
+        self.assertTrue(Incident.objects.filter(pk=self.open.pk).exists())
+
+        archived = ArchivedIncident.objects.get(pk=self.old.pk)
+        self.assertEqual(archived.title, "Old flood")
+        self.assertEqual(archived.created_by, self.citizen)
+        self.assertEqual(archived.history["updates"][0]["content"], "Water receding")
+        self.assertFalse(
+            IncidentUpdate.objects.filter(incident_id=self.old.pk).exists()
+        )
+
+    def test_archive_keeps_linked_originals(self):
+        """Test originals stay active while a report is linked to them."""
+        Incident.objects.filter(pk=self.open.pk).update(duplicate_of=self.old)
+        self.assertEqual(archive_resolved(timezone.now() - timedelta(days=90)), 0)
+        self.open.refresh_from_db()
+        self.assertEqual(self.open.duplicate_of, self.old)
+
+    def test_archive_keeps_incidents_with_resources(self):
+        """Test incidents stay active while resources are assigned to them."""
+        resource = Resource.objects.create(
+            name="Water depot",
+            resource_type="WATER",
+            capacity=10,
+            current_count=10,
+            location=self.old.location,
+            address="Castries",
+            assigned_to=self.old,
+        )
+        self.assertEqual(archive_resolved(timezone.now() - timedelta(days=90)), 0)
+        resource.refresh_from_db()
+        self.assertEqual(resource.assigned_to, self.old)
+
+    def test_archive_overwrites_stale_copy(self):
+        """Test an incident already in the archive is refreshed, not lost."""
+        ArchivedIncident.objects.create(
+            id=self.old.pk,
+            title="Stale title",
+            description="Stale",
+            location=self.old.location,
+            incident_type="FLOOD",
+            severity="LOW",
+            created_at=self.old.created_at,
+            updated_at=self.old.updated_at,
+        )
+        self.assertEqual(archive_resolved(timezone.now() - timedelta(days=90)), 1)
+        self.assertFalse(Incident.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(
+            ArchivedIncident.objects.get(pk=self.old.pk).title, "Old flood"
+        )
+
+
 # TODO: Add tests for IncidentCreateSerializer.validate_location
 # TODO: Add tests mocking geopy for Incident.get_location_name
 # TODO: Add tests for WebSocket consumer if using Channels
@@ -0,0 +1,133 @@
+"""
+Mapbox Vector Tile rendering for incidents in HurriNet.
+
+This module builds incident tiles with PostGIS ``ST_AsMVT`` and keeps a
+per-tile cache that is invalidated when an incident inside the tile changes.
+"""
+
+import logging
+import math
+from django.conf import settings
+from django.db import connection
+from utils.cache import get_cache_key, get_cached_data, set_cached_data
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Name of the layer inside each tile
+TILE_LAYER = "incidents"
+
+# Tile resolution and buffer in tile coordinate units
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+TILE_SQL = """
+    WITH bounds AS (
+        SELECT ST_TileEnvelope(%(z)s, %(x)s, %(y)s) AS geom
+    ),
+    mvtgeom AS (
+        SELECT
+            ST_AsMVTGeom(
+                ST_Transform(i.location::geometry, 3857),
+                bounds.geom,
+                %(extent)s,
+                %(buffer)s,
+                true
+            ) AS geom,
+            i.id,
+            i.severity,
+            i.incident_type,
+            i.is_resolved
+        FROM incidents_incident i, bounds
+        WHERE i.location && ST_Transform(bounds.geom, 4326)::geography
+    )
+    SELECT ST_AsMVT(mvtgeom.*, %(layer)s, %(extent)s, 'geom') FROM mvtgeom
+"""
+
+
+def get_max_cached_zoom():
+    """Highest zoom level whose tiles are cached."""
+    return getattr(settings, "INCIDENT_TILE_MAX_CACHED_ZOOM", 16)
+
+
+def is_valid_tile(z, x, y):
+    """Check that the tile coordinates exist in the XYZ scheme."""
+    if z < 0 or z > 22:
+        return False
+    limit = 2**z
+    return 0 <= x < limit and 0 <= y < limit
+
+
+def lonlat_to_tile(lon, lat, z):
+    """Return the (x, y) tile containing a WGS84 coordinate at zoom ``z``."""
+    # Clamp latitude to the Web Mercator limits
+    lat = max(min(lat, 85.0511287798), -85.0511287798)
+    n = 2**z
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def get_tile_cache_key(z, x, y):
+    """Generate the cache key for a single tile."""
+    return get_cache_key("incidents", f"tile:{z}/{x}/{y}")
+
+
+def render_tile(z, x, y):
+    """Render a tile from the database."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            TILE_SQL,
+            {
+                "z": z,
+                "x": x,
+                "y": y,
+                "extent": TILE_EXTENT,
+                "buffer": TILE_BUFFER,
+                "layer": TILE_LAYER,
+            },
+        )
+        row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] else b""
+
+
+def get_tile(z, x, y):
+    """
+    Get a tile, rendering and caching it on a miss.
+
+    Tiles above the maximum cached zoom are rendered on every request, since
+    they cover few incidents and would otherwise flood the cache.
+    """
+    if z > get_max_cached_zoom():
+        return render_tile(z, x, y)
+
+    cache_key = get_tile_cache_key(z, x, y)
+    tile = get_cached_data(cache_key)
+    if tile is not None:
+        return tile
+
+    tile = render_tile(z, x, y)
+    set_cached_data(cache_key, tile, settings.INCIDENT_TILE_CACHE_TTL)
+    return tile
+
+
+def invalidate_tiles_for_point(point):
+    """Drop every cached tile that contains the given point."""
+    invalidate_tiles_for_points([point])
+
+
+def invalidate_tiles_for_points(points):
+    """Drop every cached tile that contains any of the given points."""
+    keys = {
+        get_tile_cache_key(z, *lonlat_to_tile(point.x, point.y, z))
+        for point in points
+        if point is not None
+        for z in range(get_max_cached_zoom() + 1)
+    }
+    if not keys:
+        return
+    try:
+        cache.delete_many(list(keys))
+    except Exception as e:
+        logger.error(f"Error invalidating {len(keys)} incident tiles: {str(e)}")
@@ -6,7 +6,7 @@ This module defines the URL patterns for incident-related endpoints.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import IncidentViewSet
+from .views import IncidentViewSet, IncidentTileView
 
 # Create a router and register our viewset with it
 router = DefaultRouter()
@@ -27,6 +27,15 @@ router.register(r"", IncidentViewSet, basename="incident")
 # - GET /api/incidents/{id}/flags/ (get flags)
 # - GET /api/incidents/my-incidents/ (get user's incidents)
 # - GET /api/incidents/nearby/ (get nearby incidents)
+# - GET /api/incidents/search/?q= (ranked full-text search)
+# - GET /api/incidents/clusters/?bbox=&zoom= (open incident clusters)
+# - GET /api/incidents/density/?bbox=&start=&end= (open incidents per hex cell)
+# - GET /api/incidents/tiles/{z}/{x}/{y}.mvt (incident vector tile)
 urlpatterns = [
+    path(
+        "tiles/<int:z>/<int:x>/<int:y>.mvt",
+        IncidentTileView.as_view(),
+        name="incident-tile",
+    ),
     path("", include(router.urls)),
 ]
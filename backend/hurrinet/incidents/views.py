@@ -5,11 +5,13 @@ This module provides views for managing incidents, updates, and flags.
 """
 
 from rest_framework import viewsets, status, permissions
+from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.utils import timezone
 from django.db.models import Q
+from django.http import HttpResponse
 from django.contrib.gis.geos import Point
 from .models import Incident, IncidentUpdate, IncidentFlag
 from .serializers import (
@@ -18,6 +20,10 @@ from .serializers import (
     IncidentUpdateSerializer,
     IncidentFlagSerializer,
 )
+from .tiles import get_tile, is_valid_tile
+from .clustering import cluster_index
+from .duplicates import flag_if_duplicate
+from .density import get_density
 from .permissions import (
     IsReporterOrReadOnly,
     CanVerifyIncidents,
@@ -25,6 +31,7 @@ from .permissions import (
     CanReviewFlags,
 )
 import uuid
+from datetime import timedelta
 from django.shortcuts import render
 from django.conf import settings
 from utils.cache import (
@@ -38,6 +45,34 @@ from utils.cache import (
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.core.cache import cache
+from utils.dates import parse_time_param
+from utils.search import FullTextSearchFilter, get_search_limit, ranked_search
+
+# Columns IncidentSerializer reads, loaded with the reporting and resolving
+# users in a single query
+INCIDENT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "location",
+    "location_name",
+    "affected_area",
+    "incident_type",
+    "severity",
+    "photo",
+    "photo_variants",
+    "created_at",
+    "updated_at",
+    "is_resolved",
+    "resolved_at",
+    "duplicate_of",
+    "created_by__id",
+    "created_by__username",
+    "created_by__email",
+    "resolved_by__id",
+    "resolved_by__username",
+    "resolved_by__email",
+]
 
 
 class IncidentViewSet(viewsets.ModelViewSet):
@@ -67,21 +102,22 @@ class IncidentViewSet(viewsets.ModelViewSet):
         "reported_by",
         "assigned_to",
     ]
-    search_fields = ["title", "description", "location"]
+    filter_backends = [FullTextSearchFilter]
     ordering_fields = ["created_at", "updated_at", "resolved_at"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        """Get cached queryset if available."""
-        cache_key = get_cache_key("incidents", "list")
-        cached_data = get_cached_data(cache_key)
-
-        if cached_data is not None:
-            return cached_data
-
-        queryset = super().get_queryset()
-        set_cached_data(cache_key, queryset, settings.INCIDENT_CACHE_TTL)
-        return queryset
+        """
+        Get incidents with their users joined in and only serialized columns.
+
+        Serializing any number of incidents takes a single query.
+        """
+        return (
+            super()
+            .get_queryset()
+            .select_related("created_by", "resolved_by")
+            .only(*INCIDENT_FIELDS)
+        )
 
     def get_serializer_class(self):
         """Return appropriate serializer based on the action."""
@@ -90,8 +126,10 @@ class IncidentViewSet(viewsets.ModelViewSet):
         return IncidentSerializer
 
     def perform_create(self, serializer):
-        """Create a new incident."""
-        return serializer.save()
+        """Create a new incident and flag it if it duplicates a recent report."""
+        incident = serializer.save()
+        flag_if_duplicate(incident)
+        return incident
 
     @action(detail=True, methods=["post"])
     def update_status(self, request, pk=None):
@@ -156,7 +194,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
     def updates(self, request, pk=None):
         """Get all updates for an incident."""
         incident = self.get_object()
-        updates = incident.updates.all()
+        updates = incident.updates.select_related("author")
         serializer = IncidentUpdateSerializer(updates, many=True)
         return Response(serializer.data)
 
@@ -175,15 +213,15 @@ class IncidentViewSet(viewsets.ModelViewSet):
     def flags(self, request, pk=None):
         """Get all flags for an incident."""
         incident = self.get_object()
-        flags = incident.flags.all()
+        flags = incident.flags.select_related("reported_by", "reviewed_by")
         serializer = IncidentFlagSerializer(flags, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def my_incidents(self, request):
-        """Get all incidents reported by or assigned to the current user."""
+        """Get all incidents reported or resolved by the current user."""
         incidents = self.get_queryset().filter(
-            Q(reported_by=request.user) | Q(assigned_to=request.user)
+            Q(created_by=request.user) | Q(resolved_by=request.user)
         )
         serializer = self.get_serializer(incidents, many=True)
         return Response(serializer.data)
@@ -206,6 +244,98 @@ class IncidentViewSet(viewsets.ModelViewSet):
             {"error": "Not implemented"}, status=status.HTTP_501_NOT_IMPLEMENTED
         )
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search over incident titles, locations and descriptions.
+
+        Results are ranked best first and carry a highlighted snippet of the
+        description. Supports web-search syntax ("quoted phrases", or, -word).
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Missing 'q' parameter"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = get_search_limit(request)
+        # Built on the view's queryset so any scoping applies to search too
+        queryset = self.filter_queryset(self.get_queryset())
+        results = ranked_search(queryset, text, "description").values(
+            "id",
+            "title",
+            "location_name",
+            "incident_type",
+            "severity",
+            "is_resolved",
+            "created_at",
+            "rank",
+            "headline",
+        )[:limit]
+        return Response({"results": list(results)})
+
+    @action(detail=False, methods=["get"])
+    def clusters(self, request):
+        """
+        Get open incident clusters for a bounding box and zoom level.
+
+        Expects ``bbox=west,south,east,north`` and ``zoom``. Each cluster
+        carries its incident count, centroid and severity breakdown.
+        """
+        try:
+            west, south, east, north = (
+                float(value) for value in request.query_params["bbox"].split(",")
+            )
+            zoom = int(request.query_params.get("zoom", 0))
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "bbox (west,south,east,north) and zoom are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        zoom, clusters = cluster_index.get_clusters(west, south, east, north, zoom)
+        return Response({"zoom": zoom, "clusters": clusters})
+
+    @action(detail=False, methods=["get"])
+    def density(self, request):
+        """
+        Get open incident counts per hexagonal cell.
+
+        Expects ``bbox=west,south,east,north`` and optionally ``start``/``end``
+        (ISO timestamps, default the last 24 hours) and ``severity``. Reads
+        only the pre-aggregated density table.
+        """
+        try:
+            west, south, east, north = (
+                float(value) for value in request.query_params["bbox"].split(",")
+            )
+        except (KeyError, ValueError):
+            return Response(
+                {"error": "bbox (west,south,east,north) is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            end = parse_time_param(request, "end") or timezone.now()
+            start = parse_time_param(request, "start") or end - timedelta(hours=24)
+        except ValueError:
+            return Response(
+                {"error": "start and end must be ISO timestamps"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        cells = get_density(
+            west,
+            south,
+            east,
+            north,
+            start,
+            end,
+            severity=request.query_params.get("severity"),
+        )
+        return Response(
+            {"start": start.isoformat(), "end": end.isoformat(), "cells": cells}
+        )
+
     @action(detail=True, methods=["post"])
     def resolve(self, request, pk=None):
         """Resolve incident and invalidate cache."""
@@ -240,9 +370,11 @@ class IncidentViewSet(viewsets.ModelViewSet):
 
         try:
             # Query only incidents updated after the given timestamp
-            updated_incidents = Incident.objects.filter(
-                updated_at__gt=timestamp
-            ).order_by("-updated_at")
+            updated_incidents = (
+                self.get_queryset()
+                .filter(updated_at__gt=timestamp)
+                .order_by("-updated_at")
+            )
 
             serializer = self.get_serializer(updated_incidents, many=True)
             return Response(
@@ -274,7 +406,7 @@ class IncidentViewSet(viewsets.ModelViewSet):
 
 
 class IncidentUpdateViewSet(viewsets.ModelViewSet):
-    queryset = IncidentUpdate.objects.all()
+    queryset = IncidentUpdate.objects.select_related("author")
     serializer_class = IncidentUpdateSerializer
 
     def create(self, request, *args, **kwargs):
@@ -298,3 +430,29 @@ class IncidentUpdateViewSet(viewsets.ModelViewSet):
         response = super().destroy(request, *args, **kwargs)
         delete_cached_data(get_cache_key("incidents", f"detail:{incident_id}"))
         return response
+
+
+class IncidentTileView(APIView):
+    """
+    Serve incidents as Mapbox Vector Tiles.
+
+    Each tile carries the incident id, severity, type and resolution status
+    as feature properties. Rendered tiles are cached per tile.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, z, x, y):
+        """Get a single vector tile."""
+        if not is_valid_tile(z, x, y):
+            return Response(
+                {"error": "Invalid tile coordinates"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        tile = get_tile(z, x, y)
+        response = HttpResponse(
+            tile, content_type="application/vnd.mapbox-vector-tile"
+        )
+        response["Cache-Control"] = "private, max-age=60"
+        return response
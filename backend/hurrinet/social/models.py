@@ -1,6 +1,11 @@
 from django.db import models
+from django.db.models.signals import post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
+from utils.search import update_search_vector
 
 
 class Post(models.Model):
@@ -43,9 +48,14 @@ class Post(models.Model):
     likes = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="liked_posts", blank=True
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # Fields indexed for full-text search, with their ranking weight
+    SEARCH_VECTOR_FIELDS = [("content", "A"), ("location", "B")]
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [GinIndex(fields=["search_vector"], name="post_search_vector_gin")]
 
     def save(self, *args, **kwargs):
         if self.pk is None:  # Only set defaults for new instances
@@ -64,6 +74,12 @@ class Post(models.Model):
         return self.likes.filter(id=user.id).exists()
 
 
+@receiver(post_save, sender=Post)
+def update_post_search_vector(sender, instance, **kwargs):
+    """Refresh the post's full-text search vector on every write."""
+    update_search_vector(instance)
+
+
 class Comment(models.Model):
     """Model for comments on posts."""
 
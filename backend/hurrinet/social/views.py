@@ -5,6 +5,7 @@ from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.db.models import Count, Q
 from .models import Post, Comment, Reaction
 from .serializers import PostSerializer, CommentSerializer, ReactionSerializer
+from utils.search import FullTextSearchFilter, get_search_limit, ranked_search
 
 
 class PostViewSet(viewsets.ModelViewSet):
@@ -12,7 +13,7 @@ class PostViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser, JSONParser)
     filterset_fields = ["post_type", "author", "is_verified"]
-    search_fields = ["content", "location"]
+    filter_backends = [FullTextSearchFilter]
     ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
 
@@ -51,6 +52,23 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,  # Changed to 500 for server errors
             )
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Full-text search over public posts, ranked with highlighted snippets."""
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"detail": "Missing 'q' parameter"}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        limit = get_search_limit(request)
+        results = ranked_search(
+            Post.objects.filter(is_public=True, is_active=True), text, "content"
+        ).values("id", "post_type", "location", "created_at", "rank", "headline")[
+            :limit
+        ]
+        return Response({"results": list(results)})
+
     @action(detail=True, methods=["post"])
     def like(self, request, pk=None):
         post = self.get_object()
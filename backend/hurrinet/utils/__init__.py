@@ -10,3 +10,8 @@ from .cache import (
     cache_response,
     clear_pattern,
 )
+from .search import (
+    FullTextSearchFilter,
+    ranked_search,
+    update_search_vector,
+)
@@ -0,0 +1,34 @@
+"""
+Date and time helpers for the HurriNet project.
+
+Views that accept time ranges parse their query parameters with
+:func:`parse_time_param` so bad input is reported the same way everywhere.
+"""
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+def parse_time_param(request, name):
+    """
+    Parse an optional ISO timestamp query parameter.
+
+    Naive timestamps are taken to be in the current time zone.
+
+    Returns:
+        datetime: The aware timestamp, or None if the parameter is missing
+
+    Raises:
+        ValueError: If the parameter is not a valid timestamp
+    """
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    # parse_datetime returns None for malformed input and raises ValueError
+    # for well-formed but impossible values such as February 30th
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(f"Invalid timestamp: {value}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
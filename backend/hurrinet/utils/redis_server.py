@@ -0,0 +1,139 @@
+"""
+Local stand-in for the Redis servers behind the channel layer.
+
+Starts a throwaway ``redis-server`` on a free port, with persistence off, so
+the Redis channel layer can be exercised across processes without the
+production Redis. If ``redis-server`` isn't installed, fakeredis's TCP server
+is used instead when available, installed with Lua support
+(``fakeredis[lua]``, in ``requirements-dev.txt``) since channels_redis relies
+on Lua scripts.
+``bench_channel_layer`` starts one stand-in per shard.
+"""
+
+import importlib.util
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+try:
+    from fakeredis import TcpFakeServer
+except ImportError:
+    TcpFakeServer = None
+
+
+def get_free_port(host="127.0.0.1"):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def has_fakeredis():
+    """Whether fakeredis can serve the channel layer, which runs Lua scripts."""
+    return TcpFakeServer is not None and importlib.util.find_spec("lupa") is not None
+
+
+def is_available():
+    """Whether a local Redis server can be started."""
+    return bool(shutil.which("redis-server")) or has_fakeredis()
+
+
+class LocalRedisServer:
+    """
+    Throwaway Redis server for tests and benchmarks.
+
+    Usable as a context manager; the server is stopped on exit and keeps no
+    data.
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on, 0 picks a free one
+        startup_timeout: Seconds to wait for the server to accept connections
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, startup_timeout=10):
+        self.host = host
+        self.port = port or get_free_port(host)
+        self.startup_timeout = startup_timeout
+        self._process = None
+        self._directory = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"redis://{self.host}:{self.port}/0"
+
+    def start(self):
+        binary = shutil.which("redis-server")
+        if binary:
+            self._directory = tempfile.TemporaryDirectory()
+            self._process = subprocess.Popen(
+                [
+                    binary,
+                    "--bind",
+                    self.host,
+                    "--port",
+                    str(self.port),
+                    "--save",
+                    "",
+                    "--appendonly",
+                    "no",
+                    "--dir",
+                    self._directory.name,
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        elif has_fakeredis():
+            self._server = TcpFakeServer((self.host, self.port))
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, daemon=True
+            )
+            self._thread.start()
+        else:
+            raise RuntimeError("Neither redis-server nor fakeredis[lua] is installed")
+        self.wait()
+        return self
+
+    def wait(self):
+        """Wait until the server answers a PING."""
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                with socket.create_connection(
+                    (self.host, self.port), timeout=1
+                ) as sock:
+                    sock.sendall(b"PING\r\n")
+                    if sock.recv(64).startswith(b"+PONG"):
+                        return
+            except OSError:
+                pass
+            if self._process is not None and self._process.poll() is not None:
+                raise RuntimeError(
+                    f"redis-server exited with {self._process.returncode}"
+                )
+            if time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Redis did not start on port {self.port}")
+            time.sleep(0.05)
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+            self._directory.cleanup()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,101 @@
+"""
+Postgres full-text search helpers for the HurriNet project.
+
+Searchable models declare a ``search_vector`` field (with a GIN index) and a
+``SEARCH_VECTOR_FIELDS`` list of ``(field, weight)`` pairs. The vector is
+refreshed on write with :func:`update_search_vector` and queried with
+:func:`ranked_search` or the :class:`FullTextSearchFilter` backend.
+"""
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+SEARCH_CONFIG = "english"
+
+# Results returned by a search endpoint, by default and at most
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_RESULTS = 100
+
+
+def build_search_vector(fields):
+    """Build a weighted search vector expression from ``(field, weight)`` pairs."""
+    vector = None
+    for field, weight in fields:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(instance):
+    """
+    Refresh the stored search vector of a single row.
+
+    Uses a queryset ``update()`` so the vector is computed by Postgres and no
+    save signals fire again.
+    """
+    model = type(instance)
+    model.objects.filter(pk=instance.pk).update(
+        search_vector=build_search_vector(model.SEARCH_VECTOR_FIELDS)
+    )
+
+
+def get_search_query(text):
+    """Parse user input with web-search syntax (quotes, OR, -exclusions)."""
+    return SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def get_search_limit(request):
+    """Get the ``?limit=`` of a search request, clamped to 1..SEARCH_MAX_RESULTS."""
+    try:
+        limit = int(request.query_params.get("limit", SEARCH_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError({"limit": "Must be a number"})
+    return min(max(limit, 1), SEARCH_MAX_RESULTS)
+
+
+def ranked_search(queryset, text, headline_field):
+    """
+    Filter a queryset by a full-text query, ranked best first.
+
+    Annotates each row with ``rank`` and a ``headline`` snippet of
+    ``headline_field`` with the matching terms wrapped in ``<mark>`` tags.
+    """
+    query = get_search_query(text)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank("search_vector", query),
+            headline=SearchHeadline(
+                headline_field,
+                query,
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                max_fragments=2,
+            ),
+        )
+        .order_by("-rank")
+    )
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Filter backend that serves ``?search=`` from the stored search vector.
+
+    Replaces DRF's ``SearchFilter``, whose ``ILIKE '%...%'`` lookups cannot
+    use an index.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, "").strip()
+        if not text:
+            return queryset
+        return queryset.filter(search_vector=get_search_query(text))
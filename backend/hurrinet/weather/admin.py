@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import WeatherData, WeatherForecast, WeatherAlert
+from .models import WeatherData, WeatherForecast, WeatherAlert, WeatherRollup
 
 
 @admin.register(WeatherData)
@@ -34,6 +34,22 @@ class WeatherForecastAdmin(admin.ModelAdmin):
     ordering = ["date"]
 
 
+@admin.register(WeatherRollup)
+class WeatherRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "location",
+        "period",
+        "start",
+        "count",
+        "temperature_min",
+        "temperature_max",
+        "wind_speed_max",
+    ]
+    list_filter = ["location", "period", "start"]
+    search_fields = ["location"]
+    ordering = ["-start"]
+
+
 @admin.register(WeatherAlert)
 class WeatherAlertAdmin(admin.ModelAdmin):
     list_display = [
@@ -0,0 +1,140 @@
+"""
+Cache for Tomorrow.io weather responses in HurriNet.
+
+Responses are cached per kind (current, forecast) and rounded location, so
+nearby requests share one entry. Entries are fresh for ``WEATHER_CACHE_TTL``
+and then served stale for up to ``WEATHER_CACHE_STALE_TTL`` while a single
+background fetch refreshes them. Concurrent misses are coalesced behind a
+cache lock, so upstream calls scale with locations and refresh rate rather
+than with requests.
+"""
+
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from utils.cache import get_cache_key, get_cached_data, set_cached_data
+
+logger = logging.getLogger(__name__)
+
+# How often callers waiting on another fetch check for its result
+LOCK_POLL_INTERVAL = 0.1
+
+
+def round_location(lat, lng):
+    """Round coordinates to the precision weather is cached at."""
+    precision = settings.WEATHER_CACHE_PRECISION
+    return round(float(lat), precision), round(float(lng), precision)
+
+
+def get_weather_cache_key(kind, lat, lng):
+    """Generate the cache key for a kind of weather data at a location."""
+    lat, lng = round_location(lat, lng)
+    return get_cache_key("weather", f"{kind}:{lat}:{lng}")
+
+
+def store(key, data):
+    """Cache a response along with the time it was fetched."""
+    set_cached_data(
+        key,
+        {"data": data, "fetched_at": time.time()},
+        settings.WEATHER_CACHE_STALE_TTL,
+    )
+
+
+def get_age(entry):
+    """Get the seconds since a cached entry was fetched."""
+    return time.time() - entry["fetched_at"]
+
+
+def get_entry(key):
+    """
+    Get a cached entry, or None if missing or too old to serve.
+
+    Entries expire from the cache after ``WEATHER_CACHE_STALE_TTL``, but the
+    age is checked too, so an entry whose timeout was extended (e.g. by a
+    cache backend ignoring it) is never served.
+    """
+    entry = get_cached_data(key)
+    if entry is None or get_age(entry) >= settings.WEATHER_CACHE_STALE_TTL:
+        return None
+    return entry
+
+
+def get_cached_weather(kind, lat, lng):
+    """Get cached weather for a location that is still servable, or None."""
+    entry = get_entry(get_weather_cache_key(kind, lat, lng))
+    return entry["data"] if entry is not None else None
+
+
+def _lock_key(key):
+    return f"{key}:lock"
+
+
+def _acquire(key):
+    """Take the key's fetch lock, returning False if another caller holds it."""
+    return cache.add(_lock_key(key), 1, settings.WEATHER_FETCH_LOCK_TIMEOUT)
+
+
+def _fetch_and_store(key, fetch):
+    """Run the upstream fetch and release the key's lock, which must be held."""
+    try:
+        data = fetch()
+        if data is not None:
+            store(key, data)
+        return data
+    finally:
+        cache.delete(_lock_key(key))
+
+
+def _refresh_in_background(key, fetch):
+    """Refresh a stale entry without making the caller wait."""
+
+    def refresh():
+        try:
+            _fetch_and_store(key, fetch)
+        except Exception as e:
+            logger.error(f"Background weather refresh failed for {key}: {e}")
+        finally:
+            connection.close()
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def get_weather(kind, lat, lng, fetch):
+    """
+    Get cached weather, fetching it at most once across concurrent callers.
+
+    Args:
+        kind: Kind of data, part of the cache key (e.g. "current")
+        lat: Latitude of the location
+        lng: Longitude of the location
+        fetch: Callable returning JSON-serializable data, or None on failure
+
+    Returns:
+        The cached or freshly fetched data, or None if nothing is available
+    """
+    key = get_weather_cache_key(kind, lat, lng)
+    entry = get_entry(key)
+
+    if entry is not None:
+        stale = get_age(entry) >= settings.WEATHER_CACHE_TTL
+        if stale and _acquire(key):
+            _refresh_in_background(key, fetch)
+        return entry["data"]
+
+    if _acquire(key):
+        return _fetch_and_store(key, fetch)
+
+    # Another caller is fetching this location, wait for its result
+    deadline = time.monotonic() + settings.WEATHER_FETCH_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = get_entry(key)
+        if entry is not None:
+            return entry["data"]
+        if cache.get(_lock_key(key)) is None:
+            break
+    return None
@@ -0,0 +1,92 @@
+"""
+HTTP client for the Tomorrow.io weather API.
+
+All upstream weather requests share one pooled ``requests`` session with
+timeouts and retries, and go to ``TOMORROW_API_BASE_URL`` so tests and load
+runs can point them at a local stub server.
+"""
+
+import threading
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+REALTIME_FIELDS = [
+    "temperature",
+    "temperatureApparent",
+    "humidity",
+    "windSpeed",
+    "windDirection",
+    "cloudCover",
+    "visibility",
+    "pressureSurfaceLevel",
+    "precipitationProbability",
+]
+
+FORECAST_FIELDS = ["temperature", "humidity", "windSpeed", "precipitationProbability"]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get the shared HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=settings.TOMORROW_API_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+            )
+            adapter = HTTPAdapter(
+                max_retries=retry,
+                pool_connections=4,
+                # Enough connections for every concurrent poller thread
+                pool_maxsize=max(
+                    settings.WEATHER_POLL_WORKERS, settings.ALERT_POLL_WORKERS
+                ),
+            )
+            _session = requests.Session()
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def get(path, lat, lng, **params):
+    """
+    Make a GET request to the weather API.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails after
+            retries or returns an error status
+    """
+    response = get_session().get(
+        f"{settings.TOMORROW_API_BASE_URL}{path}",
+        params={
+            "location": f"{lat},{lng}",
+            "apikey": settings.TOMORROW_API_KEY,
+            **params,
+        },
+        timeout=settings.TOMORROW_API_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_realtime(lat, lng):
+    """Get current conditions at a location."""
+    return get("/weather/realtime", lat, lng, fields=",".join(REALTIME_FIELDS))
+
+
+def get_forecast(lat, lng):
+    """Get the daily forecast timeline for a location."""
+    return get(
+        "/weather/forecast",
+        lat,
+        lng,
+        timesteps="1d",
+        fields=",".join(FORECAST_FIELDS),
+    )
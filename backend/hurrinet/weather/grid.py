@@ -0,0 +1,265 @@
+"""
+Interpolated weather grid for HurriNet.
+
+Only the locations in ``WEATHER_LOCATIONS`` are polled, so weather for any
+other point on the island is interpolated from their latest readings. After
+each poll the readings are spread over a regular lat/lng grid covering
+``WEATHER_GRID_BOUNDS`` with inverse-distance weighting, and the grid is
+cached as one compressed NumPy array. Looking up a point is then a bilinear
+blend of the four surrounding grid cells, with no queries or network calls.
+"""
+
+import io
+import logging
+import time
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from utils.cache import get_cache_key, get_cached_data, set_cached_data
+from .models import WeatherData
+
+logger = logging.getLogger(__name__)
+
+# Numeric WeatherData fields interpolated across the grid
+FIELDS = [
+    "temperature",
+    "feels_like",
+    "humidity",
+    "wind_speed",
+    "pressure",
+    "visibility",
+]
+
+# Wind direction is interpolated as a unit vector so 350° and 10° average to 0°
+CHANNELS = FIELDS + ["wind_east", "wind_north"]
+
+KM_PER_DEGREE = 111.32
+
+# Cache keys for the grid and the time it was built
+GRID_CACHE_KEY = get_cache_key("weather", "grid")
+GRID_VERSION_KEY = get_cache_key("weather", "grid:version")
+
+# This process's copy of the grid, reused until a newer one is built
+_local_grid = None
+
+
+class WeatherGrid:
+    """
+    Weather values interpolated over a regular lat/lng grid.
+
+    ``values`` is a ``(channels, rows, cols)`` float32 array with row 0 at
+    the southern edge and column 0 at the western edge. ``nearest`` holds the
+    index of the closest station for each cell, which supplies values that
+    can't be interpolated (conditions).
+    """
+
+    def __init__(
+        self,
+        south,
+        west,
+        resolution,
+        values,
+        nearest,
+        stations,
+        conditions,
+        timestamp,
+        version=None,
+    ):
+        self.south = south
+        self.west = west
+        self.resolution = resolution
+        self.values = values
+        self.nearest = nearest
+        self.stations = list(stations)
+        self.conditions = list(conditions)
+        # Time of the oldest reading, and when the grid was built
+        self.timestamp = timestamp
+        self.version = version or time.time()
+
+    def to_bytes(self):
+        """Serialize the grid as a compressed ``.npz`` archive."""
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            origin=np.array([self.south, self.west, self.resolution]),
+            values=self.values,
+            nearest=self.nearest,
+            stations=np.array(self.stations),
+            conditions=np.array(self.conditions),
+            timestamp=np.array(self.timestamp),
+            version=np.array(self.version),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data)) as archive:
+            south, west, resolution = archive["origin"].tolist()
+            return cls(
+                south,
+                west,
+                resolution,
+                archive["values"],
+                archive["nearest"],
+                archive["stations"].tolist(),
+                archive["conditions"].tolist(),
+                archive["timestamp"].item(),
+                archive["version"].item(),
+            )
+
+    def lookup(self, lat, lng):
+        """
+        Get the interpolated weather at a point.
+
+        Returns:
+            dict: Weather shaped like ``WeatherDataSerializer`` output, or
+            None if the point is outside the grid
+        """
+        _, rows, cols = self.values.shape
+        row = (lat - self.south) / self.resolution
+        col = (lng - self.west) / self.resolution
+        if not (0 <= row <= rows - 1 and 0 <= col <= cols - 1):
+            return None
+
+        r0 = min(int(row), rows - 2)
+        c0 = min(int(col), cols - 2)
+        dr, dc = row - r0, col - c0
+        cell = self.values[:, r0 : r0 + 2, c0 : c0 + 2].astype(np.float64)
+        weights = np.array(
+            [[(1 - dr) * (1 - dc), (1 - dr) * dc], [dr * (1 - dc), dr * dc]]
+        )
+        value = dict(zip(CHANNELS, (cell * weights).sum(axis=(1, 2)).tolist()))
+
+        station = int(self.nearest[int(round(row)), int(round(col))])
+        direction = np.degrees(np.arctan2(value["wind_east"], value["wind_north"]))
+        conditions = self.conditions[station]
+        return {
+            "temperature": f"{value['temperature']:.2f}",
+            "feels_like": f"{value['feels_like']:.2f}",
+            "humidity": round(value["humidity"]),
+            "wind_speed": f"{value['wind_speed']:.2f}",
+            "wind_direction": round(direction) % 360,
+            "conditions": conditions,
+            "conditions_display": dict(WeatherData.CONDITION_CHOICES).get(
+                conditions, conditions
+            ),
+            "pressure": f"{value['pressure']:.2f}",
+            "visibility": f"{value['visibility']:.2f}",
+            "timestamp": self.timestamp,
+            "location": self.stations[station],
+            "latitude": f"{lat:.6f}",
+            "longitude": f"{lng:.6f}",
+            "interpolated": True,
+        }
+
+
+def build_grid(readings, bounds=None, resolution=None, power=None):
+    """
+    Interpolate readings over the grid with inverse-distance weighting.
+
+    Args:
+        readings: WeatherData rows, at most one per location
+        bounds: Dict with ``south``, ``north``, ``west`` and ``east``,
+            defaults to ``WEATHER_GRID_BOUNDS``
+        resolution: Degrees between grid points, defaults to
+            ``WEATHER_GRID_RESOLUTION``
+        power: Distance weighting exponent, defaults to ``WEATHER_GRID_POWER``
+
+    Readings older than ``WEATHER_CACHE_STALE_TTL`` are left out, so a single
+    location that stopped reporting doesn't make the whole grid unservable;
+    its area is interpolated from the locations that are still fresh.
+
+    Returns:
+        WeatherGrid: The grid, or None without fresh readings
+    """
+    oldest = timezone.now() - timedelta(seconds=settings.WEATHER_CACHE_STALE_TTL)
+    readings = [reading for reading in readings if reading.timestamp >= oldest]
+    if not readings:
+        return None
+    bounds = bounds or settings.WEATHER_GRID_BOUNDS
+    resolution = resolution or settings.WEATHER_GRID_RESOLUTION
+    power = power or settings.WEATHER_GRID_POWER
+
+    rows = max(int(round((bounds["north"] - bounds["south"]) / resolution)) + 1, 2)
+    cols = max(int(round((bounds["east"] - bounds["west"]) / resolution)) + 1, 2)
+    lats = bounds["south"] + np.arange(rows) * resolution
+    lngs = bounds["west"] + np.arange(cols) * resolution
+
+    station_lats = np.array([float(reading.latitude) for reading in readings])
+    station_lngs = np.array([float(reading.longitude) for reading in readings])
+    direction = np.radians([reading.wind_direction for reading in readings])
+    station_values = np.column_stack(
+        [[float(getattr(reading, field)) for reading in readings] for field in FIELDS]
+        + [np.sin(direction), np.cos(direction)]
+    )
+
+    # (rows, cols, stations) distances in km, flat-earth over an island
+    km_per_lng = KM_PER_DEGREE * np.cos(np.radians(lats.mean()))
+    dy = (lats[:, None, None] - station_lats[None, None, :]) * KM_PER_DEGREE
+    dx = (lngs[None, :, None] - station_lngs[None, None, :]) * km_per_lng
+    distances = np.hypot(dy, dx)
+
+    # Points on a station take its reading
+    weights = 1.0 / np.maximum(distances, 1e-6) ** power
+    weights /= weights.sum(axis=2, keepdims=True)
+    values = np.einsum("rcs,sf->frc", weights, station_values).astype(np.float32)
+
+    return WeatherGrid(
+        bounds["south"],
+        bounds["west"],
+        resolution,
+        values,
+        distances.argmin(axis=2).astype(np.uint8),
+        [reading.location for reading in readings],
+        [reading.conditions for reading in readings],
+        min(reading.timestamp for reading in readings).isoformat(),
+    )
+
+
+def get_latest_readings():
+    """Get the latest stored reading of every polled location."""
+    names = [location["name"] for location in settings.WEATHER_LOCATIONS]
+    return (
+        WeatherData.objects.filter(location__in=names)
+        .order_by("location", "-timestamp")
+        .distinct("location")
+    )
+
+
+def rebuild_grid():
+    """
+    Build the grid from the latest readings and cache it.
+
+    Returns:
+        WeatherGrid: The new grid, or None without readings
+    """
+    global _local_grid
+    grid = build_grid(get_latest_readings())
+    if grid is None:
+        return None
+    timeout = settings.WEATHER_CACHE_STALE_TTL
+    set_cached_data(GRID_CACHE_KEY, grid.to_bytes(), timeout)
+    set_cached_data(GRID_VERSION_KEY, grid.version, timeout)
+    _local_grid = grid
+    logger.info(f"Rebuilt weather grid from {len(grid.stations)} locations")
+    return grid
+
+
+def get_grid():
+    """
+    Get the current grid.
+
+    The grid is decoded once per process and reused until the poller caches
+    a newer one. If nothing is cached, it is built from the stored readings.
+    """
+    global _local_grid
+    version = get_cached_data(GRID_VERSION_KEY)
+    if _local_grid is not None and _local_grid.version == version:
+        return _local_grid
+
+    data = get_cached_data(GRID_CACHE_KEY) if version is not None else None
+    if data is None:
+        return rebuild_grid()
+    _local_grid = WeatherGrid.from_bytes(data)
+    return _local_grid
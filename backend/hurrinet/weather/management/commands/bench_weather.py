@@ -0,0 +1,237 @@
+"""
+Django management command to load-test the weather endpoints offline.
+
+Starts the Tomorrow.io stand-in (replaying the recorded fixtures, with
+optional latency and error injection), polls it once so the weather cache
+and grid are warm, then sends a mix of current, forecast, by_location and
+history requests from many concurrent clients and reports throughput and
+latency percentiles per endpoint.
+
+Requests are handled in-process by default. With --url they go to a running
+server instead, which should have TOMORROW_API_BASE_URL pointed at a
+weather_stub_server. With --poll-interval the poller keeps refreshing from
+the stand-in during the run, as it would in production.
+"""
+
+import random
+import threading
+import time
+import numpy as np
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from weather.poller import poll_locations
+from weather.stub_server import FIXTURES_DIR, StubTomorrowServer, load_fixtures
+
+User = get_user_model()
+
+BENCH_USER_EMAIL = "weather-bench@hurrinet.local"
+
+
+def random_point(rng):
+    bounds = settings.WEATHER_GRID_BOUNDS
+    return {
+        "lat": round(rng.uniform(bounds["south"], bounds["north"]), 5),
+        "lng": round(rng.uniform(bounds["west"], bounds["east"]), 5),
+    }
+
+
+# (name, path, share of requests, query parameters)
+ENDPOINTS = [
+    ("current", "/api/weather/current/", 0.3, lambda rng: {}),
+    ("forecast", "/api/weather/forecast/", 0.2, lambda rng: {}),
+    ("by_location", "/api/weather/by_location/", 0.4, random_point),
+    (
+        "history",
+        "/api/weather/history/",
+        0.1,
+        lambda rng: {"location": rng.choice(settings.WEATHER_LOCATIONS)["name"]},
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = "Benchmarks the weather endpoints against a Tomorrow.io stand-in"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument(
+            "--url", help="Base URL of a running server, e.g. http://localhost:8000"
+        )
+        parser.add_argument(
+            "--fixtures",
+            default=FIXTURES_DIR,
+            help=(
+                "Directory of responses recorded with record_weather_fixtures, "
+                "defaults to the bundled recordings; pass '' for canned responses"
+            ),
+        )
+        parser.add_argument(
+            "--upstream-latency",
+            type=float,
+            default=0.2,
+            help="Seconds the stand-in adds to every response",
+        )
+        parser.add_argument("--upstream-jitter", type=float, default=0.1)
+        parser.add_argument(
+            "--upstream-error-rate",
+            type=float,
+            default=0,
+            help="Fraction of upstream requests that fail with a 503",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=0,
+            help="Seconds between polls during the run (default: no polling)",
+        )
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        user, _ = User.objects.get_or_create(
+            email=BENCH_USER_EMAIL, defaults={"role": "CITIZEN"}
+        )
+        token = str(RefreshToken.for_user(user).access_token)
+
+        stub = StubTomorrowServer(
+            fixtures=(
+                load_fixtures(options["fixtures"]) if options["fixtures"] else None
+            ),
+            latency=options["upstream_latency"],
+            jitter=options["upstream_jitter"],
+            error_rate=options["upstream_error_rate"],
+            seed=options["seed"],
+            keep_requests=False,
+        )
+        with stub, override_settings(TOMORROW_API_BASE_URL=stub.base_url):
+            self.stdout.write("Warming the weather cache from the stand-in...")
+            poll_locations()
+
+            stop = threading.Event()
+            poller = None
+            if options["poll_interval"]:
+                poller = threading.Thread(
+                    target=self.poll, args=(options["poll_interval"], stop)
+                )
+                poller.start()
+
+            names = [name for name, _, _, _ in ENDPOINTS]
+            weights = [share for _, _, share, _ in ENDPOINTS]
+            plan = rng.choices(range(len(ENDPOINTS)), weights, k=options["requests"])
+            plan = [(index, ENDPOINTS[index][3](rng)) for index in plan]
+
+            upstream_before = stub.request_count
+            started = time.monotonic()
+            results = self.run(plan, options["concurrency"], options["url"], token)
+            elapsed = time.monotonic() - started
+
+            stop.set()
+            if poller:
+                poller.join()
+
+        self.report(names, results, elapsed, stub.request_count - upstream_before)
+
+    def poll(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                poll_locations()
+            except Exception as e:
+                self.stderr.write(f"Error polling weather data: {str(e)}")
+
+    def get_sender(self, url, token):
+        """Build a function sending one request, for use by a single thread."""
+        if url:
+            session = requests.Session()
+            session.headers["Authorization"] = f"Bearer {token}"
+
+            def send(path, params):
+                return session.get(
+                    f"{url.rstrip('/')}{path}", params=params
+                ).status_code
+
+            return send
+
+        host = next(
+            (host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"),
+            "localhost",
+        )
+        client = Client(
+            HTTP_HOST=host,
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+            raise_request_exception=False,
+        )
+        return lambda path, params: client.get(path, params).status_code
+
+    def run(self, plan, concurrency, url, token):
+        """
+        Send the planned requests from ``concurrency`` threads.
+
+        Returns:
+            list: (endpoint index, status code, seconds) per request
+        """
+        results = []
+        lock = threading.Lock()
+        requests_left = iter(plan)
+
+        def worker():
+            send = self.get_sender(url, token)
+            timings = []
+            try:
+                while True:
+                    with lock:
+                        item = next(requests_left, None)
+                    if item is None:
+                        break
+                    index, params = item
+                    started = time.perf_counter()
+                    try:
+                        status = send(ENDPOINTS[index][1], params)
+                    except requests.RequestException:
+                        status = 0
+                    timings.append((index, status, time.perf_counter() - started))
+            finally:
+                connection.close()
+                with lock:
+                    results.extend(timings)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def report(self, names, results, elapsed, upstream_requests):
+        self.stdout.write(
+            f"{'endpoint':<12} {'requests':>8} {'errors':>6} "
+            f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        )
+        for index, name in enumerate(names):
+            timings = np.array(
+                [seconds for i, _, seconds in results if i == index], dtype=float
+            )
+            if not len(timings):
+                continue
+            errors = sum(
+                1
+                for i, status, _ in results
+                if i == index and (status == 0 or status >= 400)
+            )
+            p50, p95, p99 = np.percentile(timings, [50, 95, 99]) * 1000
+            self.stdout.write(
+                f"{name:<12} {len(timings):>8} {errors:>6} "
+                f"{p50:>8.1f} {p95:>8.1f} {p99:>8.1f}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(results)} requests in {elapsed:.1f}s "
+                f"({len(results) / elapsed:.0f} req/s), "
+                f"{upstream_requests} upstream requests"
+            )
+        )
@@ -1,49 +1,69 @@
+"""
+Django management command to poll Tomorrow.io for weather data.
+
+Fetches the current weather and forecast for every location in
+WEATHER_LOCATIONS concurrently, stores them and warms the weather cache.
+With --loop it keeps polling, so the API endpoints never call Tomorrow.io
+on the request path.
+"""
+
+import time
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from weather.models import WeatherData, WeatherForecast
+from weather.poller import poll_locations
 
 
 class Command(BaseCommand):
     help = "Fetches current weather and forecast data from Tomorrow.io API"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.WEATHER_POLL_INTERVAL,
+            help="Seconds between polls (default: WEATHER_POLL_INTERVAL)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=settings.WEATHER_POLL_WORKERS,
+            help="Locations fetched concurrently (default: WEATHER_POLL_WORKERS)",
+        )
+
     def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            self.poll(options["workers"])
+            if not options["loop"]:
+                return
+            time.sleep(max(options["interval"] - (time.monotonic() - started), 0))
+
+    def poll(self, workers):
         self.stdout.write(
             self.style.SUCCESS("Fetching weather data from Tomorrow.io API...")
         )
-
-        # Fetch current weather data
-        self.stdout.write("Fetching current weather data...")
+        started = time.monotonic()
         try:
-            weather = WeatherData.fetch_from_tomorrow()
-            if weather:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully fetched current weather data: {weather}"
-                    )
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING("Failed to fetch current weather data")
-                )
+            results = poll_locations(workers=workers)
         except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"Error fetching current weather data: {str(e)}")
-            )
+            self.stdout.write(self.style.ERROR(f"Error polling weather data: {str(e)}"))
+            return
 
-        # Fetch weather forecast data
-        self.stdout.write("\nFetching weather forecast data...")
-        try:
-            forecasts = WeatherForecast.fetch_from_tomorrow()
-            if forecasts:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"Successfully fetched {len(forecasts)} days of forecast data"
+        for name, result in results.items():
+            for kind, refreshed in result.items():
+                if refreshed:
+                    self.stdout.write(f"Fetched {kind} weather for {name}")
+                else:
+                    self.stdout.write(
+                        self.style.WARNING(f"Failed to fetch {kind} weather for {name}")
                     )
-                )
-            else:
-                self.stdout.write(
-                    self.style.WARNING("Failed to fetch weather forecast data")
-                )
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f"Error fetching weather forecast data: {str(e)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Polled {len(results)} locations in {time.monotonic() - started:.1f}s"
             )
+        )
@@ -0,0 +1,21 @@
+"""
+Django management command to apply the weather data retention policy.
+
+Deletes raw readings older than WEATHER_RAW_RETENTION_DAYS and hourly
+rollups older than WEATHER_HOURLY_RETENTION_DAYS. Daily rollups are kept.
+"""
+
+from django.core.management.base import BaseCommand
+from weather.rollups import prune
+
+
+class Command(BaseCommand):
+    help = "Prune raw weather readings and hourly rollups past retention"
+
+    def handle(self, *args, **options):
+        readings, hourly = prune()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {readings} raw readings and {hourly} hourly rollups"
+            )
+        )
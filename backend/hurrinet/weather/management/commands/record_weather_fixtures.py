@@ -0,0 +1,44 @@
+"""
+Django management command to record Tomorrow.io responses as fixtures.
+
+Fetches the realtime weather and forecast for every location in
+WEATHER_LOCATIONS and writes the raw responses to a directory that the
+weather_stub_server and bench_weather commands can replay.
+"""
+
+import json
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.text import slugify
+from weather import client
+
+
+class Command(BaseCommand):
+    help = "Records Tomorrow.io responses for the stand-in server to replay"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the fixtures to")
+
+    def handle(self, *args, **options):
+        os.makedirs(options["output"], exist_ok=True)
+        for location in settings.WEATHER_LOCATIONS:
+            for kind, fetch in (
+                ("realtime", client.get_realtime),
+                ("forecast", client.get_forecast),
+            ):
+                try:
+                    body = fetch(location["lat"], location["lng"])
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f"Error fetching {kind} for {location['name']}: {str(e)}"
+                        )
+                    )
+                    continue
+                path = os.path.join(
+                    options["output"], f"{kind}_{slugify(location['name'])}.json"
+                )
+                with open(path, "w") as f:
+                    json.dump(body, f, indent=2)
+                self.stdout.write(f"Recorded {path}")
@@ -0,0 +1,68 @@
+"""
+Django management command to run the Tomorrow.io stand-in server.
+
+Replays the recorded realtime and forecast responses, or canned ones, with
+optional latency and error injection. Point TOMORROW_API_BASE_URL of the
+server under test at the printed URL to load-test it without calling
+Tomorrow.io.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from weather.stub_server import FIXTURES_DIR, StubTomorrowServer, load_fixtures
+
+
+class Command(BaseCommand):
+    help = "Runs a local stand-in for the Tomorrow.io API"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--fixtures",
+            default=FIXTURES_DIR,
+            help=(
+                "Directory of responses recorded with record_weather_fixtures, "
+                "defaults to the bundled recordings; pass '' for canned responses"
+            ),
+        )
+        parser.add_argument(
+            "--latency", type=float, default=0, help="Seconds added to every response"
+        )
+        parser.add_argument(
+            "--jitter", type=float, default=0, help="Up to this many extra seconds"
+        )
+        parser.add_argument(
+            "--error-rate",
+            type=float,
+            default=0,
+            help="Fraction of requests answered with --error-status",
+        )
+        parser.add_argument("--error-status", type=int, default=503)
+
+    def handle(self, *args, **options):
+        server = StubTomorrowServer(
+            host=options["host"],
+            port=options["port"],
+            fixtures=(
+                load_fixtures(options["fixtures"]) if options["fixtures"] else None
+            ),
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            error_status=options["error_status"],
+            keep_requests=False,
+        )
+        with server:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Serving Tomorrow.io stand-in at {server.base_url} "
+                    "(set TOMORROW_API_BASE_URL to this URL)"
+                )
+            )
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+        self.stdout.write(f"Answered {server.request_count} requests")
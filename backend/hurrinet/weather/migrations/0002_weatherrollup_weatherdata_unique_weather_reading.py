@@ -0,0 +1,76 @@
+# Generated by Django 5.1.6 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+# Existing readings are snapped to 10 minute intervals (the default
+# WEATHER_READING_INTERVAL), keeping the latest reading in each
+DEDUPLICATE_READINGS_SQL = """
+    DELETE FROM weather_weatherdata a
+    USING weather_weatherdata b
+    WHERE a.location = b.location
+      AND floor(extract(epoch FROM a.timestamp) / 600)
+        = floor(extract(epoch FROM b.timestamp) / 600)
+      AND a.id < b.id;
+    UPDATE weather_weatherdata
+    SET timestamp = to_timestamp(floor(extract(epoch FROM timestamp) / 600) * 600);
+"""
+
+BACKFILL_ROLLUP_SQL = """
+    INSERT INTO weather_weatherrollup (
+        location, period, start, count,
+        temperature_min, temperature_max, temperature_sum,
+        wind_speed_min, wind_speed_max, wind_speed_sum,
+        pressure_min, pressure_max, pressure_sum
+    )
+    SELECT
+        location, '{period}', date_trunc('{unit}', timestamp AT TIME ZONE 'UTC') AT TIME ZONE 'UTC', count(*),
+        min(temperature), max(temperature), sum(temperature),
+        min(wind_speed), max(wind_speed), sum(wind_speed),
+        min(pressure), max(pressure), sum(pressure)
+    FROM weather_weatherdata
+    GROUP BY 1, 3;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('weather', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(DEDUPLICATE_READINGS_SQL, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='weatherdata',
+            constraint=models.UniqueConstraint(fields=('location', 'timestamp'), name='unique_weather_reading'),
+        ),
+        migrations.CreateModel(
+            name='WeatherRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(max_length=255)),
+                ('period', models.CharField(choices=[('HOUR', 'Hourly'), ('DAY', 'Daily')], max_length=4)),
+                ('start', models.DateTimeField()),
+                ('count', models.IntegerField(default=0)),
+                ('temperature_min', models.FloatField()),
+                ('temperature_max', models.FloatField()),
+                ('temperature_sum', models.FloatField()),
+                ('wind_speed_min', models.FloatField()),
+                ('wind_speed_max', models.FloatField()),
+                ('wind_speed_sum', models.FloatField()),
+                ('pressure_min', models.FloatField()),
+                ('pressure_max', models.FloatField()),
+                ('pressure_sum', models.FloatField()),
+            ],
+            options={
+                'ordering': ['start'],
+                'constraints': [models.UniqueConstraint(fields=('location', 'period', 'start'), name='unique_weather_rollup')],
+            },
+        ),
+        migrations.RunSQL(
+            BACKFILL_ROLLUP_SQL.format(period='HOUR', unit='hour'), migrations.RunSQL.noop
+        ),
+        migrations.RunSQL(
+            BACKFILL_ROLLUP_SQL.format(period='DAY', unit='day'), migrations.RunSQL.noop
+        ),
+    ]
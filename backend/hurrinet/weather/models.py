@@ -7,9 +7,11 @@ current conditions and forecasts.
 
 from django.db import models
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import requests
 from django.conf import settings
-from datetime import datetime, timedelta
+from . import client
+from datetime import datetime, timedelta, timezone as dt_timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -43,25 +45,29 @@ class WeatherData(models.Model):
     class Meta:
         ordering = ["-timestamp"]
         get_latest_by = "timestamp"
+        constraints = [
+            # One reading per location per WEATHER_READING_INTERVAL
+            models.UniqueConstraint(
+                fields=["location", "timestamp"], name="unique_weather_reading"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.conditions} at {self.location} ({self.timestamp})"
 
+    @staticmethod
+    def get_interval_start(moment):
+        """Floor a time to the start of its reading interval."""
+        interval = settings.WEATHER_READING_INTERVAL
+        epoch = int(moment.timestamp())
+        return datetime.fromtimestamp(epoch - epoch % interval, tz=dt_timezone.utc)
+
     @classmethod
     def fetch_from_tomorrow(cls, lat=13.9094, lng=-60.9789, location="Saint Lucia"):
         """Fetch weather data from Tomorrow.io API."""
-        api_key = settings.TOMORROW_API_KEY
-        logger.info(f"Using Tomorrow.io API key: {api_key[:5]}...")
-
-        # Construct URL with parameters directly
-        url = f"https://api.tomorrow.io/v4/weather/realtime?location={lat},{lng}&apikey={api_key}&fields=temperature,temperatureApparent,humidity,windSpeed,windDirection,cloudCover,visibility,pressureSurfaceLevel,precipitationProbability"
-
         try:
             logger.info(f"Making request to Tomorrow.io API for {location}")
-            logger.info(f"Request URL: {url}")
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
+            data = client.get_realtime(lat, lng)
             logger.info("Successfully received response from Tomorrow.io API")
 
             # Map Tomorrow.io conditions to our choices
@@ -97,8 +103,18 @@ class WeatherData(models.Model):
                 "longitude": lng,
             }
 
-            weather = cls.objects.create(**weather_data)
-            logger.info(f"Successfully created weather data for {location}")
+            # Readings within the same interval are near-duplicates; keep the
+            # first and only roll up new ones
+            observed_at = parse_datetime(data["data"].get("time") or "")
+            timestamp = cls.get_interval_start(observed_at or timezone.now())
+            weather, created = cls.objects.get_or_create(
+                location=location, timestamp=timestamp, defaults=weather_data
+            )
+            if created:
+                from .rollups import record_reading
+
+                record_reading(weather)
+                logger.info(f"Successfully created weather data for {location}")
             return weather
         except requests.exceptions.RequestException as e:
             logger.error(f"Error making request to Tomorrow.io API: {str(e)}")
@@ -129,74 +145,87 @@ class WeatherForecast(models.Model):
     def __str__(self):
         return f"Forecast for {self.location} on {self.date}"
 
+    # Columns refreshed when a forecast for the same date and location exists
+    UPSERT_FIELDS = [
+        "high_temp",
+        "low_temp",
+        "conditions",
+        "precipitation_chance",
+        "wind_speed",
+        "humidity",
+        "updated_at",
+    ]
+
     @classmethod
-    def fetch_from_tomorrow(cls, lat=13.9094, lng=-60.9789, location="Saint Lucia"):
-        """Fetch weather forecast from Tomorrow.io API."""
-        api_key = settings.TOMORROW_API_KEY
-        logger.info(
-            f"Using Tomorrow.io API key: {api_key[:5]}..."
-        )  # Only log first 5 chars for security
+    def parse_timeline(cls, data, location, days=7):
+        """Parse a Tomorrow.io daily timeline into unsaved forecasts."""
+        # Map Tomorrow.io conditions to our choices
+        condition_mapping = {
+            "clear": "SUNNY",
+            "partlyCloudy": "PARTLY_CLOUDY",
+            "cloudy": "CLOUDY",
+            "rain": "RAIN",
+            "storm": "STORM",
+            "hurricane": "HURRICANE",
+        }
+
+        forecasts = []
+        for daily in data["timelines"]["daily"][:days]:
+            values = daily["values"]
+            forecasts.append(
+                cls(
+                    date=datetime.strptime(daily["time"], "%Y-%m-%dT%H:%M:%SZ").date(),
+                    # Fall back to temperature if max/min are not available
+                    high_temp=values.get("temperatureMax", values.get("temperature")),
+                    low_temp=values.get("temperatureMin", values.get("temperature")),
+                    conditions=condition_mapping.get(
+                        values.get("cloudCover", "clear"), "SUNNY"
+                    ),
+                    precipitation_chance=values.get(
+                        "precipitationProbability",
+                        values.get("precipitationProbabilityAvg", 0),
+                    ),
+                    wind_speed=values.get("windSpeedAvg", values.get("windSpeed", 0)),
+                    humidity=values.get("humidity", values.get("humidityAvg", 0)),
+                    location=location,
+                )
+            )
+        return forecasts
 
-        # Construct URL with parameters directly
-        url = f"https://api.tomorrow.io/v4/weather/forecast?location={lat},{lng}&apikey={api_key}&timesteps=1d&fields=temperature,humidity,windSpeed,precipitationProbability"
+    @classmethod
+    def upsert(cls, forecasts, batch_size=500):
+        """
+        Insert or update forecasts on (date, location).
+
+        Each batch is written with a single INSERT ... ON CONFLICT statement.
+        """
+        return cls.objects.bulk_create(
+            forecasts,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["date", "location"],
+            update_fields=cls.UPSERT_FIELDS,
+        )
 
+    @classmethod
+    def fetch_from_tomorrow(cls, lat=13.9094, lng=-60.9789, location="Saint Lucia"):
+        """Fetch weather forecast from Tomorrow.io API."""
         try:
             logger.info(f"Making request to Tomorrow.io API for forecast in {location}")
-            logger.info(f"Request URL: {url}")
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            logger.info("Successfully received forecast response from Tomorrow.io API")
-
-            # Log the response structure for debugging
-            logger.info(f"Response data structure: {data}")
-
-            forecasts = []
-            for daily in data["timelines"]["daily"][:7]:  # Get 7 days forecast
-                date = datetime.strptime(daily["time"], "%Y-%m-%dT%H:%M:%SZ").date()
-
-                # Map Tomorrow.io conditions to our choices
-                condition_mapping = {
-                    "clear": "SUNNY",
-                    "partlyCloudy": "PARTLY_CLOUDY",
-                    "cloudy": "CLOUDY",
-                    "rain": "RAIN",
-                    "storm": "STORM",
-                    "hurricane": "HURRICANE",
-                }
-
-                # Get the values from the response
-                values = daily["values"]
-                forecast_data = {
-                    "date": date,
-                    "high_temp": values.get(
-                        "temperatureMax", values.get("temperature")
-                    ),  # Fallback to temperature if max not available
-                    "low_temp": values.get(
-                        "temperatureMin", values.get("temperature")
-                    ),  # Fallback to temperature if min not available
-                    "conditions": condition_mapping.get(
-                        values.get("cloudCover", "clear"), "SUNNY"
-                    ),
-                    "precipitation_chance": values.get(
-                        "precipitationProbability", 0
-                    ),  # Default to 0 if not available
-                    "wind_speed": values.get(
-                        "windSpeedAvg", values.get("windSpeed", 0)
-                    ),  # Try windSpeedAvg first, then windSpeed, default to 0
-                    "humidity": values.get(
-                        "humidity", 0
-                    ),  # Default to 0 if not available
-                    "location": location,
-                }
-
-                forecast, created = cls.objects.update_or_create(
-                    date=date, location=location, defaults=forecast_data
+            data = client.get_forecast(lat, lng)
+            logger.debug(f"Forecast response for {location}: {data}")
+
+            forecasts = cls.parse_timeline(data, location)
+            cls.upsert(forecasts)
+            logger.info(f"Created/updated {len(forecasts)} forecasts in {location}")
+
+            # Re-read so updated rows carry their original created_at
+            return list(
+                cls.objects.filter(
+                    location=location,
+                    date__in=[forecast.date for forecast in forecasts],
                 )
-                forecasts.append(forecast)
-                logger.info(f"Created/updated forecast for {date} in {location}")
-
-            return forecasts
+            )
         except requests.exceptions.RequestException as e:
             logger.error(f"Error making request to Tomorrow.io API: {str(e)}")
             return []
@@ -205,6 +234,56 @@ class WeatherForecast(models.Model):
             return []
 
 
+class WeatherRollup(models.Model):
+    """
+    Hourly or daily summary of the weather readings at a location.
+
+    Updated incrementally as readings arrive, so long time ranges are served
+    without scanning raw readings, which are pruned after a retention period.
+    """
+
+    PERIOD_CHOICES = [
+        ("HOUR", "Hourly"),
+        ("DAY", "Daily"),
+    ]
+
+    location = models.CharField(max_length=255)
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    start = models.DateTimeField()
+    count = models.IntegerField(default=0)
+    temperature_min = models.FloatField()
+    temperature_max = models.FloatField()
+    temperature_sum = models.FloatField()
+    wind_speed_min = models.FloatField()
+    wind_speed_max = models.FloatField()
+    wind_speed_sum = models.FloatField()
+    pressure_min = models.FloatField()
+    pressure_max = models.FloatField()
+    pressure_sum = models.FloatField()
+
+    # Measurements summarized in each rollup
+    MEASUREMENTS = ["temperature", "wind_speed", "pressure"]
+
+    class Meta:
+        ordering = ["start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["location", "period", "start"], name="unique_weather_rollup"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_period_display()} weather at {self.location} ({self.start})"
+
+    def get_stats(self, measurement):
+        """Get the min, max and average of a measurement."""
+        return {
+            "min": getattr(self, f"{measurement}_min"),
+            "max": getattr(self, f"{measurement}_max"),
+            "avg": getattr(self, f"{measurement}_sum") / self.count,
+        }
+
+
 class WeatherAlert(models.Model):
     """Model for storing weather alerts and warnings."""
 
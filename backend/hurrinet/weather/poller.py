@@ -0,0 +1,80 @@
+"""
+Background polling of Tomorrow.io for HurriNet.
+
+The ``fetch_weather_data`` command polls every configured location
+concurrently, stores the readings and forecasts, warms the weather cache and
+rebuilds the interpolated weather grid, so ``WeatherViewSet`` normally never
+waits on the upstream API. The views read the same cache entries through
+``weather.cache.get_weather``, which only fetches (once, for all waiting
+requests) when the poller has fallen behind.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection
+from .cache import get_weather_cache_key, store
+from .grid import rebuild_grid
+from .models import WeatherData, WeatherForecast
+from .serializers import WeatherDataSerializer, WeatherForecastSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def get_default_location():
+    """Get the location served when a request doesn't ask for one."""
+    return settings.WEATHER_LOCATIONS[0]
+
+
+def fetch_current(lat, lng, location):
+    """Fetch current weather upstream, serialized for the cache."""
+    weather = WeatherData.fetch_from_tomorrow(lat=lat, lng=lng, location=location)
+    return WeatherDataSerializer(weather).data if weather else None
+
+
+def fetch_forecast(lat, lng, location):
+    """Fetch the forecast upstream, serialized for the cache."""
+    forecasts = WeatherForecast.fetch_from_tomorrow(lat=lat, lng=lng, location=location)
+    return WeatherForecastSerializer(forecasts, many=True).data if forecasts else None
+
+
+def poll_location(location):
+    """
+    Fetch, store and cache the current weather and forecast for a location.
+
+    Returns:
+        dict: Whether each kind of data was refreshed
+    """
+    lat, lng, name = location["lat"], location["lng"], location["name"]
+    results = {}
+    try:
+        for kind, fetch in (("current", fetch_current), ("forecast", fetch_forecast)):
+            data = fetch(lat, lng, name)
+            if data:
+                store(get_weather_cache_key(kind, lat, lng), data)
+            results[kind] = bool(data)
+    finally:
+        # Each worker thread has its own connection
+        connection.close()
+    return results
+
+
+def poll_locations(locations=None, workers=None):
+    """
+    Poll locations concurrently, then rebuild the weather grid.
+
+    Returns:
+        dict: Results of :func:`poll_location` keyed by location name
+    """
+    locations = locations or settings.WEATHER_LOCATIONS
+    workers = workers or settings.WEATHER_POLL_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(
+            zip(
+                (location["name"] for location in locations),
+                executor.map(poll_location, locations),
+            )
+        )
+    if any(result["current"] for result in results.values()):
+        rebuild_grid()
+    return results
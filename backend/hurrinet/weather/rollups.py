@@ -0,0 +1,107 @@
+"""
+Incrementally maintained weather rollups and retention.
+
+Each new reading is folded into the hourly and daily ``WeatherRollup`` rows
+for its location with a single upsert. Range queries pick raw readings,
+hourly or daily rollups depending on the length of the window, and raw
+readings and hourly rollups are pruned after their retention periods.
+"""
+
+from datetime import timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from .models import WeatherData, WeatherRollup
+
+TABLE = WeatherRollup._meta.db_table
+
+UPSERT_SQL = f"""
+    INSERT INTO {TABLE} (
+        location, period, start, count,
+        temperature_min, temperature_max, temperature_sum,
+        wind_speed_min, wind_speed_max, wind_speed_sum,
+        pressure_min, pressure_max, pressure_sum
+    )
+    VALUES (%s, %s, %s, 1, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (location, period, start) DO UPDATE SET
+        count = {TABLE}.count + 1,
+        temperature_min = LEAST({TABLE}.temperature_min, EXCLUDED.temperature_min),
+        temperature_max = GREATEST({TABLE}.temperature_max, EXCLUDED.temperature_max),
+        temperature_sum = {TABLE}.temperature_sum + EXCLUDED.temperature_sum,
+        wind_speed_min = LEAST({TABLE}.wind_speed_min, EXCLUDED.wind_speed_min),
+        wind_speed_max = GREATEST({TABLE}.wind_speed_max, EXCLUDED.wind_speed_max),
+        wind_speed_sum = {TABLE}.wind_speed_sum + EXCLUDED.wind_speed_sum,
+        pressure_min = LEAST({TABLE}.pressure_min, EXCLUDED.pressure_min),
+        pressure_max = GREATEST({TABLE}.pressure_max, EXCLUDED.pressure_max),
+        pressure_sum = {TABLE}.pressure_sum + EXCLUDED.pressure_sum
+"""
+
+# Longest windows served from raw readings and from hourly rollups
+RAW_MAX_WINDOW = timedelta(hours=6)
+HOURLY_MAX_WINDOW = timedelta(days=14)
+
+
+def get_period_starts(timestamp):
+    """Get the start of the hour and day a reading falls in, in UTC."""
+    hour = timestamp.astimezone(dt_timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    return {"HOUR": hour, "DAY": hour.replace(hour=0)}
+
+
+def record_reading(reading):
+    """Fold a new reading into its hourly and daily rollups."""
+    values = []
+    for measurement in WeatherRollup.MEASUREMENTS:
+        value = float(getattr(reading, measurement))
+        values += [value, value, value]
+
+    with connection.cursor() as cursor:
+        for period, start in get_period_starts(reading.timestamp).items():
+            cursor.execute(UPSERT_SQL, [reading.location, period, start, *values])
+
+
+def choose_resolution(start, end):
+    """Pick the coarsest data that still gives a useful series for a window."""
+    if end - start <= RAW_MAX_WINDOW:
+        return "RAW"
+    if end - start <= HOURLY_MAX_WINDOW:
+        return "HOUR"
+    return "DAY"
+
+
+def get_history(location, start, end, resolution=None):
+    """
+    Get weather for a location over a time range.
+
+    Returns:
+        tuple: (resolution, queryset of WeatherData or WeatherRollup rows)
+    """
+    resolution = resolution or choose_resolution(start, end)
+    if resolution == "RAW":
+        return resolution, WeatherData.objects.filter(
+            location=location, timestamp__gte=start, timestamp__lt=end
+        ).order_by("timestamp")
+    return resolution, WeatherRollup.objects.filter(
+        location=location, period=resolution, start__gte=start, start__lt=end
+    )
+
+
+def prune(now=None):
+    """
+    Delete raw readings and hourly rollups past their retention periods.
+
+    Daily rollups are kept indefinitely.
+
+    Returns:
+        tuple: (readings deleted, hourly rollups deleted)
+    """
+    now = now or timezone.now()
+    readings, _ = WeatherData.objects.filter(
+        timestamp__lt=now - timedelta(days=settings.WEATHER_RAW_RETENTION_DAYS)
+    ).delete()
+    hourly, _ = WeatherRollup.objects.filter(
+        period="HOUR",
+        start__lt=now - timedelta(days=settings.WEATHER_HOURLY_RETENTION_DAYS),
+    ).delete()
+    return readings, hourly
@@ -5,7 +5,7 @@ This module provides serializers for converting weather models to/from JSON.
 """
 
 from rest_framework import serializers
-from .models import WeatherData, WeatherForecast, WeatherAlert
+from .models import WeatherData, WeatherForecast, WeatherAlert, WeatherRollup
 
 
 class WeatherDataSerializer(serializers.ModelSerializer):
@@ -60,6 +60,35 @@ class WeatherForecastSerializer(serializers.ModelSerializer):
         )
 
 
+class WeatherRollupSerializer(serializers.ModelSerializer):
+    """Serializer for hourly and daily weather summaries."""
+
+    temperature = serializers.SerializerMethodField()
+    wind_speed = serializers.SerializerMethodField()
+    pressure = serializers.SerializerMethodField()
+
+    class Meta:
+        model = WeatherRollup
+        fields = (
+            "location",
+            "period",
+            "start",
+            "count",
+            "temperature",
+            "wind_speed",
+            "pressure",
+        )
+
+    def get_temperature(self, obj):
+        return obj.get_stats("temperature")
+
+    def get_wind_speed(self, obj):
+        return obj.get_stats("wind_speed")
+
+    def get_pressure(self, obj):
+        return obj.get_stats("pressure")
+
+
 class WeatherAlertSerializer(serializers.ModelSerializer):
     """Serializer for weather alerts."""
 
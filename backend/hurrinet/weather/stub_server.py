@@ -0,0 +1,265 @@
+"""
+Local stand-in for the Tomorrow.io API.
+
+Serves realtime and forecast responses over HTTP so the weather client,
+poller and views can be exercised without network access or an API key.
+Point ``TOMORROW_API_BASE_URL`` at :attr:`StubTomorrowServer.base_url`.
+
+Responses are canned by default, or replayed from fixtures recorded with the
+``record_weather_fixtures`` command; a recorded set for every location in
+``WEATHER_LOCATIONS`` is kept in ``fixtures/``. Latency and upstream errors can be
+injected for load and failure testing; ``weather_stub_server`` runs the stub
+on its own and ``bench_weather`` drives the weather endpoints against it.
+"""
+
+import copy
+import json
+import os
+import random
+import threading
+import time as clock
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# Responses recorded from Tomorrow.io for WEATHER_LOCATIONS
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def realtime_response(lat, lng):
+    """Build a realtime response shaped like Tomorrow.io's."""
+    return {
+        "data": {
+            "time": datetime.now(timezone.utc).strftime(TIME_FORMAT),
+            "values": {
+                "temperature": 29.5,
+                "temperatureApparent": 33.1,
+                "humidity": 78,
+                "windSpeed": 6.2,
+                "windDirection": 95,
+                "cloudCover": 40,
+                "visibility": 16,
+                "pressureSurfaceLevel": 1012.4,
+                "precipitationProbability": 10,
+                "precipitationIntensity": 0.5,
+            },
+        },
+        "location": {"lat": lat, "lon": lng},
+    }
+
+
+def forecast_response(lat, lng, days=7):
+    """Build a daily forecast response shaped like Tomorrow.io's."""
+    today = datetime.combine(datetime.now(timezone.utc).date(), time())
+    return {
+        "timelines": {
+            "daily": [
+                {
+                    "time": (today + timedelta(days=day)).strftime(TIME_FORMAT),
+                    "values": {
+                        "temperatureMax": 31.0 + day % 2,
+                        "temperatureMin": 25.0,
+                        "humidity": 75,
+                        "windSpeedAvg": 5.5,
+                        "precipitationProbability": 20,
+                    },
+                }
+                for day in range(days)
+            ]
+        },
+        "location": {"lat": lat, "lon": lng},
+    }
+
+
+def parse_time(value):
+    return datetime.strptime(value, TIME_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def shift_times(body, now=None):
+    """
+    Move the timestamps of a recorded body so it reads as fetched now.
+
+    Realtime observations are moved to ``now``. Forecast timelines are moved
+    by whole days so the first daily entry is today, keeping every interval
+    on the same time of day as recorded.
+    """
+    now = now or datetime.now(timezone.utc)
+    if "data" in body:
+        body["data"]["time"] = now.strftime(TIME_FORMAT)
+    timelines = body.get("timelines", {})
+    if timelines.get("daily"):
+        first = parse_time(timelines["daily"][0]["time"])
+        offset = timedelta(days=(now.date() - first.date()).days)
+        for intervals in timelines.values():
+            for interval in intervals:
+                interval["time"] = (parse_time(interval["time"]) + offset).strftime(
+                    TIME_FORMAT
+                )
+    return body
+
+
+def load_fixtures(directory=FIXTURES_DIR):
+    """
+    Load recorded responses from a directory.
+
+    Files are named after the kind of response they hold, e.g.
+    ``realtime_castries.json`` or ``forecast_castries.json``.
+
+    Returns:
+        dict: Mapping of kind ("realtime", "forecast") to a list of bodies
+    """
+    fixtures = defaultdict(list)
+    for name in sorted(os.listdir(directory)):
+        kind = name.split("_", 1)[0].split(".", 1)[0]
+        if name.endswith(".json") and kind in ("realtime", "forecast"):
+            with open(os.path.join(directory, name)) as f:
+                fixtures[kind].append(json.load(f))
+    return dict(fixtures)
+
+
+class StubTomorrowServer:
+    """
+    Threaded HTTP server answering Tomorrow.io realtime and forecast requests.
+
+    Usage::
+
+        with StubTomorrowServer() as server:
+            with override_settings(TOMORROW_API_BASE_URL=server.base_url):
+                ...
+
+    Args:
+        fixtures: Mapping of kind to recorded bodies, replayed in turn with
+            the requested location and current time, see
+            :func:`load_fixtures`
+        latency: Seconds added to every response
+        jitter: Up to this many extra seconds added at random
+        error_rate: Fraction of requests answered with ``error_status``
+        error_status: HTTP status of injected errors
+        seed: Seed for the jitter and error injection
+        keep_requests: Whether to keep every request in :attr:`requests`;
+            turn off for long runs, :attr:`request_count` is always kept
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        fixtures=None,
+        latency=0,
+        jitter=0,
+        error_rate=0,
+        error_status=503,
+        seed=None,
+        keep_requests=True,
+    ):
+        self.requests = []
+        self.request_count = 0
+        self.keep_requests = keep_requests
+        self.fixtures = fixtures or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._replayed = defaultdict(int)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, path, lat, lng):
+        """Get the status and body for a request, or None for unknown paths."""
+        for kind, build in (
+            ("realtime", realtime_response),
+            ("forecast", forecast_response),
+        ):
+            if path.endswith(f"/weather/{kind}"):
+                if self.fixtures.get(kind):
+                    return 200, self.replay(kind, lat, lng)
+                return 200, build(lat, lng)
+        return None
+
+    def replay(self, kind, lat, lng):
+        """Get the next recorded body of a kind, as if fetched now for the location."""
+        with self._lock:
+            bodies = self.fixtures[kind]
+            body = bodies[self._replayed[kind] % len(bodies)]
+            self._replayed[kind] += 1
+        body = copy.deepcopy(body)
+        body["location"] = {"lat": lat, "lon": lng}
+        return shift_times(body)
+
+    def inject_faults(self):
+        """
+        Apply the configured latency, and decide whether to fail the request.
+
+        Returns:
+            tuple: (status, body) of an injected error, or None
+        """
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        if delay:
+            clock.sleep(delay)
+        if fail:
+            return self.error_status, {
+                "code": self.error_status,
+                "message": "Injected error",
+            }
+        return None
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                with stub._lock:
+                    stub.request_count += 1
+                    if stub.keep_requests:
+                        stub.requests.append((url.path, params))
+                result = stub.inject_faults()
+                if result is None:
+                    try:
+                        lat, lng = (
+                            float(value) for value in params["location"][0].split(",")
+                        )
+                        result = stub.respond(url.path, lat, lng)
+                    except (KeyError, ValueError):
+                        result = 400, {"message": "Invalid location"}
+                status, body = result or (404, {"message": "Not found"})
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
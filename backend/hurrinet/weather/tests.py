@@ -1,3 +1,473 @@
-from django.test import TestCase
+"""
+Tests for weather information in HurriNet.
 
-# Create your tests here.
+This module contains tests for the weather cache, grid and weather endpoints.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+from utils.cache import set_cached_data
+from .cache import get_cached_weather, get_weather, get_weather_cache_key, store
+from .grid import build_grid, get_grid
+from .models import WeatherData, WeatherForecast, WeatherRollup
+from .rollups import prune, record_reading
+from .poller import poll_locations
+from requests import HTTPError
+from . import client
+from .stub_server import (
+    StubTomorrowServer,
+    forecast_response,
+    load_fixtures,
+    realtime_response,
+)
+
+User = get_user_model()
+
+TEST_LOCATIONS = [
+    {"name": "Saint Lucia", "lat": 13.9094, "lng": -60.9789},
+    {"name": "Castries", "lat": 14.0101, "lng": -60.9875},
+]
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WEATHER_CACHE_TTL=60,
+    WEATHER_CACHE_STALE_TTL=600,
+    WEATHER_CACHE_PRECISION=2,
+)
+class WeatherCacheTests(SimpleTestCase):
+    """Test cases for the weather response cache."""
+
+    def setUp(self):
+        """Clear cache."""
+        cache.clear()
+
+    def test_nearby_locations_share_entry(self):
+        """Test locations are rounded before keying the cache."""
+        self.assertEqual(
+            get_weather_cache_key("current", 13.90941, -60.97889),
+            get_weather_cache_key("current", 13.9094, -60.979),
+        )
+        self.assertNotEqual(
+            get_weather_cache_key("current", 13.9094, -60.9789),
+            get_weather_cache_key("forecast", 13.9094, -60.9789),
+        )
+
+    def test_fresh_entry_skips_fetch(self):
+        """Test repeated requests hit upstream once."""
+        fetch = mock.Mock(return_value={"temperature": "30.00"})
+        for _ in range(5):
+            data = get_weather("current", 13.9094, -60.9789, fetch)
+        self.assertEqual(data, {"temperature": "30.00"})
+        fetch.assert_called_once()
+
+    def test_concurrent_misses_are_coalesced(self):
+        """Test concurrent misses wait for a single in-flight fetch."""
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.3)
+            return {"temperature": "30.00"}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    get_weather("current", 13.9094, -60.9789, fetch)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"temperature": "30.00"}] * 5)
+
+    def test_stale_entry_served_while_refreshing(self):
+        """Test stale data is returned at once and refreshed in the background."""
+        key = get_weather_cache_key("current", 13.9094, -60.9789)
+        with mock.patch("weather.cache.time.time", return_value=time.time() - 120):
+            store(key, {"temperature": "28.00"})
+
+        fetch = mock.Mock(return_value={"temperature": "30.00"})
+        with mock.patch("weather.cache._refresh_in_background") as refresh:
+            data = get_weather("current", 13.9094, -60.9789, fetch)
+        self.assertEqual(data, {"temperature": "28.00"})
+        refresh.assert_called_once()
+        fetch.assert_not_called()
+
+    def test_expired_entry_is_not_served(self):
+        """Test entries past the stale TTL are refetched, not served."""
+        key = get_weather_cache_key("current", 13.9094, -60.9789)
+        # Still in the cache, e.g. on a backend that kept it past its timeout
+        expired = time.time() - settings.WEATHER_CACHE_STALE_TTL - 1
+        set_cached_data(key, {"data": {"temperature": "28.00"}, "fetched_at": expired})
+        self.assertIsNone(get_cached_weather("current", 13.9094, -60.9789))
+
+        fetch = mock.Mock(return_value={"temperature": "30.00"})
+        data = get_weather("current", 13.9094, -60.9789, fetch)
+        self.assertEqual(data, {"temperature": "30.00"})
+        fetch.assert_called_once()
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WEATHER_LOCATIONS=TEST_LOCATIONS,
+)
+class WeatherPollerTests(APITransactionTestCase):
+    """
+    Test cases for the weather poller against a local Tomorrow.io stub.
+
+    Polling runs in worker threads with their own connections, so these tests
+    need real transactions.
+    """
+
+    def setUp(self):
+        """Start the stub server and clear cache."""
+        cache.clear()
+        self.stub = StubTomorrowServer().start()
+        self.addCleanup(self.stub.stop)
+        api_settings = self.settings(TOMORROW_API_BASE_URL=self.stub.base_url)
+        api_settings.enable()
+        self.addCleanup(api_settings.disable)
+
+        self.user = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_poll_stores_and_warms_cache(self):
+        """Test polling persists readings and forecasts for every location."""
+        results = poll_locations(workers=2)
+        self.assertEqual(
+            results,
+            {
+                "Saint Lucia": {"current": True, "forecast": True},
+                "Castries": {"current": True, "forecast": True},
+            },
+        )
+        self.assertEqual(WeatherData.objects.count(), 2)
+        self.assertEqual(WeatherRollup.objects.filter(period="HOUR").count(), 2)
+        self.assertEqual(WeatherForecast.objects.filter(location="Castries").count(), 7)
+        self.assertEqual(
+            get_cached_weather("current", 14.0101, -60.9875)["location"], "Castries"
+        )
+
+    def test_views_serve_without_upstream_calls(self):
+        """Test current and forecast are served from the poller's data."""
+        poll_locations(workers=2)
+        upstream_calls = len(self.stub.requests)
+
+        response = self.client.get(reverse("weather-current"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["location"], "Saint Lucia")
+
+        response = self.client.get(reverse("weather-forecast"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 7)
+
+        self.assertEqual(len(self.stub.requests), upstream_calls)
+
+        # A cold cache is refilled with one upstream call
+        cache.clear()
+        for _ in range(3):
+            response = self.client.get(reverse("weather-current"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.stub.requests), upstream_calls + 1)
+
+    def test_repeated_polls_are_deduplicated(self):
+        """Test readings within one interval are stored once."""
+        poll_locations(workers=2)
+        poll_locations(workers=2)
+        self.assertEqual(WeatherData.objects.count(), 2)
+        self.assertEqual(
+            WeatherRollup.objects.get(location="Castries", period="DAY").count, 1
+        )
+
+
+class StubTomorrowServerTests(SimpleTestCase):
+    """Test cases for fixture replay and fault injection in the stand-in."""
+
+    def start(self, **kwargs):
+        stub = StubTomorrowServer(**kwargs).start()
+        self.addCleanup(stub.stop)
+        api_settings = self.settings(TOMORROW_API_BASE_URL=stub.base_url)
+        api_settings.enable()
+        self.addCleanup(api_settings.disable)
+        return stub
+
+    def test_replays_recorded_fixtures(self):
+        """Test recorded bodies are replayed in turn at the requested location."""
+        with tempfile.TemporaryDirectory() as directory:
+            for name, temperature in [("castries", 27.0), ("soufriere", 31.0)]:
+                body = realtime_response(0, 0)
+                body["data"]["values"]["temperature"] = temperature
+                with open(os.path.join(directory, f"realtime_{name}.json"), "w") as f:
+                    json.dump(body, f)
+            fixtures = load_fixtures(directory)
+        self.assertEqual(list(fixtures), ["realtime"])
+
+        self.start(fixtures=fixtures)
+        bodies = [client.get_realtime(14.0101, -60.9875) for _ in range(3)]
+        self.assertEqual(
+            [body["data"]["values"]["temperature"] for body in bodies],
+            [27.0, 31.0, 27.0],
+        )
+        self.assertEqual(bodies[0]["location"], {"lat": 14.0101, "lon": -60.9875})
+        # Kinds without fixtures are still canned
+        self.assertEqual(
+            len(client.get_forecast(14.0101, -60.9875)["timelines"]["daily"]), 7
+        )
+
+    def test_replayed_times_are_current(self):
+        """Test bundled recordings are replayed as if fetched now."""
+        fixtures = load_fixtures()
+        self.assertEqual(len(fixtures["realtime"]), len(settings.WEATHER_LOCATIONS))
+        self.start(fixtures=fixtures)
+        now = datetime.now(dt_timezone.utc)
+
+        observed = parse_datetime(
+            client.get_realtime(14.0101, -60.9875)["data"]["time"]
+        )
+        self.assertLess(abs(now - observed), timedelta(minutes=1))
+        daily = client.get_forecast(14.0101, -60.9875)["timelines"]["daily"]
+        self.assertEqual(parse_datetime(daily[0]["time"]).date(), now.date())
+        self.assertEqual(
+            parse_datetime(daily[1]["time"]) - parse_datetime(daily[0]["time"]),
+            timedelta(days=1),
+        )
+
+    def test_latency_and_errors(self):
+        """Test injected latency delays responses and errors are returned."""
+        self.start(latency=0.2)
+        started = time.monotonic()
+        client.get_realtime(14.0101, -60.9875)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+        stub = self.start(error_rate=1, error_status=401)
+        with self.assertRaises(HTTPError):
+            client.get_realtime(14.0101, -60.9875)
+        self.assertEqual(stub.request_count, 1)
+
+
+@override_settings(WEATHER_RAW_RETENTION_DAYS=30, WEATHER_HOURLY_RETENTION_DAYS=365)
+class WeatherRollupTests(APITestCase):
+    """Test cases for weather rollups, retention and history queries."""
+
+    def setUp(self):
+        """Set up readings over two hours."""
+        self.start = datetime(2026, 9, 1, 10, tzinfo=dt_timezone.utc)
+        for minutes, temperature, wind_speed in [(0, 28, 5), (20, 30, 9), (70, 26, 3)]:
+            self.add_reading(
+                self.start + timedelta(minutes=minutes), temperature, wind_speed
+            )
+
+        self.user = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def add_reading(self, timestamp, temperature, wind_speed):
+        record_reading(
+            WeatherData.objects.create(
+                temperature=temperature,
+                feels_like=temperature,
+                humidity=80,
+                wind_speed=wind_speed,
+                wind_direction=90,
+                conditions="SUNNY",
+                pressure=1012,
+                visibility=10,
+                timestamp=timestamp,
+                location="Castries",
+                latitude=14.0101,
+                longitude=-60.9875,
+            )
+        )
+
+    def test_rollups_are_incremental(self):
+        """Test hourly and daily rollups track min, max and average."""
+        hour = WeatherRollup.objects.get(period="HOUR", start=self.start)
+        self.assertEqual(hour.count, 2)
+        self.assertEqual(
+            hour.get_stats("temperature"), {"min": 28, "max": 30, "avg": 29}
+        )
+        day = WeatherRollup.objects.get(period="DAY")
+        self.assertEqual(day.count, 3)
+        self.assertEqual(day.get_stats("wind_speed")["max"], 9)
+
+    def test_history_resolution(self):
+        """Test long windows are served from rollups."""
+        url = reverse("weather-history")
+        params = {"location": "Castries", "start": self.start.isoformat()}
+
+        params["end"] = (self.start + timedelta(hours=3)).isoformat()
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["resolution"], "raw")
+        self.assertEqual(len(response.data["results"]), 3)
+
+        params["end"] = (self.start + timedelta(days=2)).isoformat()
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["resolution"], "hour")
+        self.assertEqual(len(response.data["results"]), 2)
+
+        params["end"] = (self.start + timedelta(days=60)).isoformat()
+        response = self.client.get(url, params)
+        self.assertEqual(response.data["resolution"], "day")
+        self.assertEqual(response.data["results"][0]["count"], 3)
+
+    def test_history_rejects_bad_timestamps(self):
+        """Test malformed and impossible timestamps are rejected."""
+        url = reverse("weather-history")
+        for value in ["yesterday", "2026-02-30T10:00:00"]:
+            response = self.client.get(url, {"location": "Castries", "start": value})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prune(self):
+        """Test raw readings go after retention while daily rollups stay."""
+        readings, hourly = prune(now=self.start + timedelta(days=31))
+        self.assertEqual((readings, hourly), (3, 0))
+        self.assertEqual(WeatherRollup.objects.filter(period="DAY").count(), 1)
+
+
+class WeatherForecastUpsertTests(TestCase):
+    """Test cases for bulk forecast ingestion."""
+
+    def test_upsert_is_one_statement(self):
+        """Test a timeline is inserted, then updated, with one query each."""
+        data = forecast_response(14.0101, -60.9875)
+        with self.assertNumQueries(1):
+            WeatherForecast.upsert(WeatherForecast.parse_timeline(data, "Castries"))
+        self.assertEqual(WeatherForecast.objects.count(), 7)
+
+        for daily in data["timelines"]["daily"]:
+            daily["values"]["temperatureMax"] = 35
+        with self.assertNumQueries(1):
+            WeatherForecast.upsert(WeatherForecast.parse_timeline(data, "Castries"))
+        self.assertEqual(WeatherForecast.objects.count(), 7)
+        self.assertFalse(WeatherForecast.objects.exclude(high_temp=35).exists())
+
+
+GRID_BOUNDS = {"south": 13.70, "north": 14.12, "west": -61.08, "east": -60.86}
+
+
+def make_reading(location, lat, lng, temperature, wind_direction, conditions):
+    return WeatherData(
+        temperature=temperature,
+        feels_like=temperature,
+        humidity=80,
+        wind_speed=5,
+        wind_direction=wind_direction,
+        conditions=conditions,
+        pressure=1012,
+        visibility=10,
+        timestamp=datetime.now(dt_timezone.utc) - timedelta(minutes=5),
+        location=location,
+        latitude=lat,
+        longitude=lng,
+    )
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    WEATHER_LOCATIONS=TEST_LOCATIONS
+    + [{"name": "Vieux Fort", "lat": 13.7246, "lng": -60.9490}],
+    WEATHER_GRID_BOUNDS=GRID_BOUNDS,
+    WEATHER_GRID_RESOLUTION=0.005,
+    WEATHER_GRID_POWER=2,
+)
+class WeatherGridTests(APITestCase):
+    """Test cases for the interpolated weather grid."""
+
+    def setUp(self):
+        """Set up readings in the north and south of the island."""
+        cache.clear()
+        self.readings = [
+            make_reading("Castries", 14.0101, -60.9875, 30, 350, "RAIN"),
+            make_reading("Vieux Fort", 13.7246, -60.9490, 26, 10, "SUNNY"),
+        ]
+        self.user = User.objects.create_user(
+            email="citizen@test.com", password="testpass123", role="CITIZEN"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_interpolation(self):
+        """Test points take their station's values and blend in between."""
+        grid = build_grid(self.readings, GRID_BOUNDS, 0.005, 2)
+        castries = grid.lookup(14.0101, -60.9875)
+        self.assertAlmostEqual(float(castries["temperature"]), 30, delta=0.1)
+        self.assertEqual(castries["conditions"], "RAIN")
+
+        middle = grid.lookup(13.86735, -60.96825)
+        self.assertAlmostEqual(float(middle["temperature"]), 28, delta=0.1)
+        # 350° and 10° blend through north, not south
+        self.assertIn(middle["wind_direction"], (359, 0, 1))
+
+        self.assertIsNone(grid.lookup(15.0, -61.0))
+
+    @override_settings(WEATHER_CACHE_STALE_TTL=600)
+    def test_stale_readings_are_left_out(self):
+        """Test one location that stopped reporting doesn't age the whole grid."""
+        stale = make_reading("Saint Lucia", 13.9094, -60.9789, 20, 90, "SUNNY")
+        stale.timestamp -= timedelta(hours=1)
+        grid = build_grid(self.readings + [stale], GRID_BOUNDS, 0.005, 2)
+        self.assertEqual(grid.stations, ["Castries", "Vieux Fort"])
+        self.assertEqual(
+            grid.timestamp, min(r.timestamp for r in self.readings).isoformat()
+        )
+        self.assertIsNone(build_grid([stale], GRID_BOUNDS, 0.005, 2))
+
+    def test_by_location_uses_grid(self):
+        """Test arbitrary points are answered from stored readings alone."""
+        for reading in self.readings:
+            reading.save()
+
+        with mock.patch("weather.models.client.get_realtime") as get_realtime:
+            response = self.client.get(
+                reverse("weather-by-location"), {"lat": 13.9, "lng": -60.97}
+            )
+        get_realtime.assert_not_called()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["interpolated"])
+        self.assertTrue(26 < float(response.data["temperature"]) < 30)
+
+        # Further requests reuse this process's decoded grid
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                reverse("weather-by-location"), {"lat": 14.0, "lng": -60.95}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            reverse("weather-by-location"), {"lat": 15.5, "lng": -61.0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_grid_is_shared_through_cache(self):
+        """Test a grid built by the poller is decoded from the cache."""
+        for reading in self.readings:
+            reading.save()
+        built = get_grid()
+
+        with mock.patch("weather.grid._local_grid", None):
+            with self.assertNumQueries(0):
+                loaded = get_grid()
+        self.assertEqual(loaded.version, built.version)
+        self.assertEqual(loaded.lookup(13.9, -60.97), built.lookup(13.9, -60.97))
@@ -17,6 +17,7 @@ router.register(r"", WeatherViewSet, basename="weather")
 # - GET /api/weather/forecast/ (weather forecast)
 # - GET /api/weather/alerts/ (weather alerts)
 # - GET /api/weather/by-location/?lat=&lng= (weather by location)
+# - GET /api/weather/history/?location=&start=&end= (readings or rollups)
 urlpatterns = [
     path("", include(router.urls)),
 ]
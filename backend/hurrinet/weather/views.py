@@ -5,23 +5,37 @@ This module provides views for accessing weather data, forecasts,
 and weather alerts.
 """
 
+from django.conf import settings
 from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from datetime import timedelta
 import logging
+from utils.dates import parse_time_param
 from .models import WeatherData, WeatherForecast, WeatherAlert
+from .cache import get_weather
+from .grid import get_grid
+from .poller import fetch_current, fetch_forecast, get_default_location
+from .rollups import get_history
 from .serializers import (
     WeatherDataSerializer,
     WeatherForecastSerializer,
     WeatherAlertSerializer,
+    WeatherRollupSerializer,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def get_oldest_servable():
+    """Get the oldest reading time that may still be served as current."""
+    return timezone.now() - timedelta(seconds=settings.WEATHER_CACHE_STALE_TTL)
+
+
 class WeatherViewSet(viewsets.ModelViewSet):
     """
     ViewSet for accessing weather information.
@@ -60,14 +74,23 @@ class WeatherViewSet(viewsets.ModelViewSet):
     def current(self, request):
         """Get current weather conditions."""
         try:
-            # Fetch fresh data from Tomorrow.io
-            weather = WeatherData.fetch_from_tomorrow()
-            if not weather:
-                # If fetch fails, get latest from database
-                weather = WeatherData.objects.latest()
-
-            serializer = self.get_serializer(weather)
-            return Response(serializer.data)
+            # Kept fresh by the fetch_weather_data poller; a cold or stale
+            # entry is refetched once, however many requests are waiting
+            location = get_default_location()
+            lat, lng, name = location["lat"], location["lng"], location["name"]
+            data = get_weather(
+                "current", lat, lng, lambda: fetch_current(lat, lng, name)
+            )
+            if data is None:
+                # If Tomorrow.io is unavailable, get latest from database,
+                # as long as it isn't older than a cached entry may be
+                data = self.get_serializer(
+                    WeatherData.objects.filter(
+                        location=name, timestamp__gte=get_oldest_servable()
+                    ).latest()
+                ).data
+
+            return Response(data)
         except WeatherData.DoesNotExist:
             return Response(
                 {"error": "No weather data available"}, status=status.HTTP_404_NOT_FOUND
@@ -77,25 +100,26 @@ class WeatherViewSet(viewsets.ModelViewSet):
     def forecast(self, request):
         """Get weather forecast for the next 7 days."""
         try:
-            # Fetch fresh forecast from Tomorrow.io
-            logger.info("Fetching forecast from Tomorrow.io")
-            forecasts = WeatherForecast.fetch_from_tomorrow()
-
-            if not forecasts:
-                logger.warning(
-                    "No forecasts returned from Tomorrow.io, falling back to database"
-                )
-                # If fetch fails, get from database
-                forecasts = self.get_queryset()
+            # Kept fresh by the fetch_weather_data poller; a cold or stale
+            # entry is refetched once, however many requests are waiting
+            location = get_default_location()
+            lat, lng, name = location["lat"], location["lng"], location["name"]
+            data = get_weather(
+                "forecast", lat, lng, lambda: fetch_forecast(lat, lng, name)
+            )
+
+            if not data:
+                logger.warning("No forecast available, falling back to database")
+                forecasts = self.get_queryset().filter(location=location["name"])
                 if not forecasts.exists():
                     logger.warning("No forecasts found in database")
                     return Response(
                         {"error": "No weather forecast available"},
                         status=status.HTTP_404_NOT_FOUND,
                     )
+                data = self.get_serializer(forecasts, many=True).data
 
-            serializer = self.get_serializer(forecasts, many=True)
-            return Response(serializer.data)
+            return Response(data)
         except Exception as e:
             logger.error(f"Error in forecast endpoint: {str(e)}", exc_info=True)
             return Response(
@@ -103,6 +127,46 @@ class WeatherViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @action(detail=False, methods=["get"])
+    def history(self, request):
+        """
+        Get weather for a location over a time range.
+
+        Accepts ``location``, ``start`` and ``end`` (ISO timestamps, default
+        the last 24 hours) and optionally ``resolution`` (raw, hour or day).
+        Without a resolution, short windows return raw readings and longer
+        ones hourly or daily rollups.
+        """
+        location = request.query_params.get("location", get_default_location()["name"])
+        try:
+            end = parse_time_param(request, "end") or timezone.now()
+            start = parse_time_param(request, "start") or end - timedelta(hours=24)
+        except ValueError:
+            return Response(
+                {"error": "start and end must be ISO timestamps"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        resolution = request.query_params.get("resolution", "").upper() or None
+        if resolution not in (None, "RAW", "HOUR", "DAY"):
+            return Response(
+                {"error": "resolution must be raw, hour or day"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        resolution, rows = get_history(location, start, end, resolution)
+        serializer_class = (
+            WeatherDataSerializer if resolution == "RAW" else WeatherRollupSerializer
+        )
+        return Response(
+            {
+                "location": location,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "resolution": resolution.lower(),
+                "results": serializer_class(rows, many=True).data,
+            }
+        )
+
     @action(detail=False, methods=["get", "post"])
     def alerts(self, request):
         """Get or create weather alerts."""
@@ -119,10 +183,14 @@ class WeatherViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def by_location(self, request):
-        """Get weather data for a specific location."""
+        """
+        Get weather data for a specific location.
+
+        Interpolated from the latest readings of the polled locations, so any
+        point on the island is answered without calling Tomorrow.io.
+        """
         lat = request.query_params.get("lat")
         lng = request.query_params.get("lng")
-        location = request.query_params.get("location", "Saint Lucia")
 
         if not lat or not lng:
             return Response(
@@ -131,20 +199,20 @@ class WeatherViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            # Fetch fresh data from Tomorrow.io for the location
-            weather = WeatherData.fetch_from_tomorrow(
-                lat=float(lat), lng=float(lng), location=location
+            lat, lng = float(lat), float(lng)
+        except ValueError:
+            return Response(
+                {"error": "Latitude and longitude must be numbers"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            if not weather:
-                # If fetch fails, get latest from database
-                weather = WeatherData.objects.filter(
-                    latitude=lat, longitude=lng
-                ).latest()
-
-            serializer = WeatherDataSerializer(weather)
-            return Response(serializer.data)
-        except WeatherData.DoesNotExist:
+
+        grid = get_grid()
+        data = None
+        if grid and parse_datetime(grid.timestamp) >= get_oldest_servable():
+            data = grid.lookup(lat, lng)
+        if data is None:
             return Response(
                 {"error": "No weather data available for this location"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        return Response(data)